@@ -0,0 +1,90 @@
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+from chunked_stats import ChunkedStats, DuplicateTracker, read_csv_chunks
+
+# chunked_stats 회귀 확인: 청크로 나눠 누적한 결과가 전체 DataFrame을 pandas로 한 번에 계산한 결과와 같은지
+# python check_chunked_stats.py (실패하면 AssertionError)
+
+rows = 20_000 # 확인용 데이터 행 수
+check_chunk_size = 997 # 청크 경계가 데이터 크기와 맞아떨어지지 않도록 소수로
+
+
+def make_data(seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'id': np.arange(rows),
+        'offset': 1e9 + rng.normal(0, 1, rows), # 평균이 크고 분산이 작은 값 (합/제곱합 방식이면 분산이 무너짐)
+        'value': rng.normal(50, 10, rows),
+        'count': rng.integers(0, 100, rows),
+        'grade': rng.choice(['A', 'B', 'C', 'D'], rows, p=[0.4, 0.3, 0.2, 0.1]),
+        'city': rng.choice([f'city_{i}' for i in range(30)], rows),
+    })
+    df.loc[rng.random(rows) < 0.05, 'value'] = np.nan
+    df.loc[rng.random(rows) < 0.03, 'grade'] = np.nan
+    # 청크를 넘나드는 중복 행 (id 제외 컬럼 기준)
+    copies = rng.choice(rows, 500, replace=False)
+    df.iloc[rng.choice(rows, 500, replace=False), 1:] = df.iloc[copies, 1:].to_numpy()
+    return df
+
+
+def check_moments(stats, df):
+    num_cols = ['id', 'offset', 'value', 'count']
+    assert stats.num_cols == num_cols and stats.rows == len(df)
+    np.testing.assert_allclose(stats.mean(), df[num_cols].mean(), rtol=1e-12)
+    np.testing.assert_allclose(stats.std(), df[num_cols].std(), rtol=1e-9)
+    np.testing.assert_allclose(stats.std(ddof=0), df[num_cols].std(ddof=0), rtol=1e-9)
+    assert (stats.min() == df[num_cols].min()).all() and (stats.max() == df[num_cols].max()).all()
+    assert (stats.missing == df.isnull().sum()).all()
+    print('[info] 평균/표준편차/최솟값/최댓값/결측 ok')
+
+
+def check_categories(stats, df):
+    for col in ('grade', 'city'):
+        assert stats.mode()[col] == df[col].mode().iloc[0], col
+        assert stats.categories(col) == sorted(df[col].dropna().unique()), col
+        counts = df[col].value_counts()
+        assert (stats.value_counts[col].sort_index() == counts.sort_index()).all(), col
+    print('[info] 최빈값/범주 목록 ok')
+
+
+def check_duplicates(stats, df, path):
+    expected = df.drop(columns='id').duplicated().to_numpy()
+    tracker = DuplicateTracker(subset=[c for c in df.columns if c != 'id'])
+    mask = np.concatenate([tracker.duplicated(chunk) for chunk in read_csv_chunks(path, check_chunk_size)])
+    assert (mask == expected).all()
+    assert tracker.size == (~expected).sum() # 고유 행의 해시만 보관
+    assert stats.duplicates == df.duplicated().sum() # 전체 컬럼 기준 (id가 달라서 0)
+    print(f'[info] 청크 간 중복 검사 ok ({expected.sum()}행)')
+
+
+def check_sample(path, df, sample_size=2_000, bins=10):
+    # reservoir 표본: 크기 고정, 원본 행 그대로, 중복 없음, 전체 구간에서 고르게 뽑힘
+    stats = ChunkedStats.from_csv(path, check_chunk_size, sample_size=sample_size, track_duplicates=False)
+    sample = stats.sample
+    assert len(sample) == sample_size and sample['id'].is_unique
+    original = df.set_index('id').loc[sample['id']]
+    assert np.allclose(original['value'].fillna(-1), sample['value'].fillna(-1).to_numpy())
+    # 행 번호 구간별 표본 수 ~ 이항분포 (평균 sample_size / bins), 6 표준편차 넘게 벗어나면 치우친 것
+    counts = np.bincount(sample['id'].to_numpy() * bins // len(df), minlength=bins)
+    expected = sample_size / bins
+    assert np.abs(counts - expected).max() < 6 * np.sqrt(expected), counts
+    q = stats.quantile([0.25, 0.5, 0.75])['value']
+    exact = df['value'].quantile([0.25, 0.5, 0.75])
+    assert np.abs(q.to_numpy() - exact.to_numpy()).max() < 1.0, (q, exact) # 표준편차 10인 값의 표본 분위수
+    print(f'[info] reservoir 표본 ok (구간별 {counts.min()}~{counts.max()}행, 기대 {expected:.0f})')
+
+
+if __name__ == '__main__':
+    df = make_data()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'data.csv')
+        df.to_csv(path, index=False)
+        df = pd.read_csv(path) # CSV 왕복 후 값 기준으로 비교
+        stats = ChunkedStats.from_csv(path, check_chunk_size)
+        check_moments(stats, df)
+        check_categories(stats, df)
+        check_duplicates(stats, df, path)
+        check_sample(path, df)
+    print('[info] chunked_stats 확인 완료')
@@ -0,0 +1,148 @@
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+import sales_aggregates
+from sales_aggregates import SalesAggregator
+
+# sales_aggregates 회귀 확인: 청크 / 파일 추가분으로 누적한 집계가 전체 DataFrame을 pandas groupby로 계산한 결과와 같은지
+# python check_sales_aggregates.py (실패하면 AssertionError)
+
+rows = 20_000 # 확인용 거래 행 수
+check_chunk_size = 997 # 청크 경계가 데이터 크기와 맞아떨어지지 않도록 소수로
+columns = dict(date_col='구매일자', amount_col='총매출', customer_col='고객', product_col='상품명',
+               quantity_col='수량', price_col='단가') # 파이썬 PBL6과 같은 설정 (총매출 컬럼 없음 -> 수량 x 단가)
+
+
+def make_sales(n, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        '고객': rng.choice([f'Customer_{i}' for i in range(1, 301)], n),
+        '구매일자': (pd.Timestamp('2024-01-01') + pd.to_timedelta(np.sort(rng.integers(0, 730, n)), unit='D')).strftime('%Y-%m-%d'),
+        '상품명': rng.choice([f'Product_{i}' for i in range(1, 51)], n),
+        '수량': rng.integers(1, 11, n),
+        '단가': rng.integers(1000, 10001, n),
+    })
+    df.loc[rng.random(n) < 0.01, '구매일자'] = np.nan # 날짜가 없는 거래는 집계에서 빠짐
+    df.loc[rng.random(n) < 0.01, '고객'] = np.nan # 고객이 없는 거래는 월별 / 상품별에만 들어감
+    return df
+
+
+def expected_of(df):
+    df = df.assign(총매출=df['수량'] * df['단가'], 구매일자=pd.to_datetime(df['구매일자']))
+    df = df.dropna(subset=['구매일자'])
+    monthly = df.groupby(df['구매일자'].dt.to_period('M'))['총매출'].sum()
+    return {
+        'rows': len(df),
+        'monthly': pd.DataFrame({'Month': monthly.index, '총매출': monthly.to_numpy()}),
+        'by_customer': df.groupby('고객')['총매출'].sum(),
+        'by_product': df.groupby('상품명')[['총매출', '수량']].sum(),
+    }
+
+
+def assert_same(aggregator, df, label):
+    expected = expected_of(df)
+    assert aggregator.rows == expected['rows'], (label, aggregator.rows, expected['rows'])
+    pd.testing.assert_frame_equal(aggregator.monthly(), expected['monthly'])
+    by_customer = aggregator.by_customer()
+    assert by_customer.is_monotonic_decreasing, label # 많은 순
+    pd.testing.assert_series_equal(by_customer.sort_index(), expected['by_customer'], check_index_type=False)
+    by_product = aggregator.by_product()
+    assert by_product['총매출'].is_monotonic_decreasing, label
+    pd.testing.assert_frame_equal(by_product.sort_index(), expected['by_product'], check_index_type=False)
+
+
+def check_update(df):
+    # 메모리의 DataFrame을 청크로 나눠 update (문자열 날짜 / datetime 모두)
+    aggregator = SalesAggregator(**columns)
+    for start in range(0, len(df), check_chunk_size):
+        aggregator.update(df.iloc[start:start + check_chunk_size])
+    assert_same(aggregator, df, 'update')
+    aggregator = SalesAggregator(**columns).update(df.assign(구매일자=pd.to_datetime(df['구매일자'])))
+    assert_same(aggregator, df, 'update datetime')
+    # 총매출 컬럼이 있고 실수인 경우 (파이썬 PBL4 Date / Sales)
+    sales = pd.DataFrame({'Date': pd.to_datetime(df['구매일자']), 'Sales': df['수량'] * df['단가'] / 7})
+    aggregator = SalesAggregator(date_col='Date', amount_col='Sales')
+    for start in range(0, len(sales), check_chunk_size):
+        aggregator.update(sales.iloc[start:start + check_chunk_size])
+    valid = sales.dropna()
+    expected = valid.groupby(valid['Date'].dt.to_period('M'))['Sales'].sum()
+    np.testing.assert_allclose(aggregator.monthly()['Sales'].to_numpy(), expected.to_numpy(), rtol=1e-12)
+    assert (aggregator.monthly()['Month'].to_numpy() == expected.index.to_numpy()).all()
+    print('[info] update 청크 누적 == groupby ok (정수 / 실수 매출)')
+
+
+def check_sync(df, path):
+    # 파일 뒤에 거래가 추가되는 경우: 쓰는 중인 마지막 줄은 다음 sync 때 읽음
+    data = df.to_csv(index=False).encode('utf-8')
+    cut = data.index(b'\n', len(data) * 3 // 5) + 5 # 줄 중간에서 자름
+    with open(path, 'wb') as f:
+        f.write(data[:cut])
+    complete = data.count(b'\n', 0, cut) - 1 # 헤더 제외
+    aggregator = SalesAggregator(**columns)
+    assert aggregator.sync(path, check_chunk_size) > 0
+    assert_same(aggregator, df.iloc[:complete], 'sync partial')
+    assert aggregator.sync(path, check_chunk_size) == 0 # 추가된 줄 없음
+    with open(path, 'ab') as f:
+        f.write(data[cut:])
+    aggregator.sync(path, check_chunk_size)
+    assert_same(aggregator, df, 'sync appended')
+    # 앞부분(head_check_size)은 그대로이고 이미 읽은 부분의 끝만 바뀐 파일 (같은 inode에 다시 씀)
+    changed = df.copy()
+    changed.loc[len(df) - 1, '단가'] += 1
+    changed.to_csv(path, index=False)
+    aggregator.sync(path, check_chunk_size)
+    assert_same(aggregator, changed, 'sync tail rewritten')
+    # 가운데만 바뀌었지만 다른 파일로 교체 (inode가 다름)
+    changed.loc[len(df) // 2, '단가'] += 1
+    changed.to_csv(f'{path}.new', index=False)
+    os.replace(f'{path}.new', path)
+    aggregator.sync(path, check_chunk_size)
+    assert_same(aggregator, changed, 'sync replaced')
+    # 다시 쓴 파일(앞부분이 바뀜 / 파일이 줄어듦) -> 처음부터 다시 집계
+    changed = df.copy()
+    changed.loc[0, '수량'] += 1
+    changed.to_csv(path, index=False)
+    aggregator.sync(path, check_chunk_size)
+    assert_same(aggregator, changed, 'sync rewritten')
+    df.head(1_000).to_csv(path, index=False)
+    aggregator.sync(path, check_chunk_size)
+    assert_same(aggregator, df.head(1_000), 'sync truncated')
+    print('[info] sync 추가분만 읽기 ok (쓰는 중인 줄 제외, 다시 쓴 파일은 처음부터)')
+
+
+def check_cache(df, path, tmp):
+    # for_file: 두 번째 실행부터는 캐시를 로드하고 추가된 거래만 update
+    sales_aggregates.cache_dir = os.path.join(tmp, 'cache') # 캐시를 작업 폴더에 남기지 않도록
+    first, rest = df.iloc[:15_000], df.iloc[15_000:]
+    first.to_csv(path, index=False)
+    SalesAggregator.for_file(path, check_chunk_size, **columns)
+    update = SalesAggregator.update
+    updated = []
+
+    def counting(self, chunk):
+        updated.append(len(chunk))
+        return update(self, chunk)
+
+    SalesAggregator.update = counting
+    try:
+        assert_same(SalesAggregator.for_file(path, check_chunk_size, **columns), first, 'cache')
+        assert not updated, updated # 바뀐 것이 없으면 파일을 읽지 않음
+        rest.to_csv(path, mode='a', header=False, index=False)
+        aggregator = SalesAggregator.for_file(path, check_chunk_size, **columns)
+    finally:
+        SalesAggregator.update = update
+    assert sum(updated) == len(rest), (sum(updated), len(rest))
+    assert_same(aggregator, df, 'cache appended')
+    assert_same(SalesAggregator.for_file(path, check_chunk_size, **columns), df, 'cache reload')
+    print('[info] for_file 캐시 재사용 / 추가된 거래만 읽기 ok')
+
+
+if __name__ == '__main__':
+    df = make_sales(rows)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'sales.csv')
+        check_update(df)
+        check_sync(df, path)
+        check_cache(df, path, tmp)
+    print('[info] sales_aggregates 확인 완료')
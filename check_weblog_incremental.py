@@ -0,0 +1,142 @@
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import f1_score
+import dataset_cache
+from weblog_incremental import IncrementalLogModel
+from weblog_scoring import add_features, raw_columns, num_cols, cat_cols
+
+# weblog_incremental 회귀 확인: 파일을 청크로 나눠 증분 학습한 상태가 메모리에 올린 DataFrame으로 계산한 값과 같은지
+# python check_weblog_incremental.py (실패하면 AssertionError)
+
+rows = 20_000 # 확인용 로그 행 수
+check_chunk_size = 3_001 # 청크 경계가 데이터 크기와 맞아떨어지지 않도록
+
+
+def make_logs(n, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'timestamp': (pd.Timestamp('2024-01-01') + pd.to_timedelta(np.sort(rng.integers(0, 4 * 86_400, n)), unit='s')).astype(str),
+        'method': rng.choice(['GET', 'POST', 'PUT', 'DELETE'], n, p=[0.6, 0.25, 0.1, 0.05]),
+        'status_code': rng.choice([200, 301, 404, 500], n, p=[0.7, 0.1, 0.15, 0.05]),
+        'size': rng.integers(0, 50_000, n),
+    })
+    df['label'] = ((df['status_code'] >= 400) & (rng.random(n) < 0.8) | (rng.random(n) < 0.02)).astype(int)
+    df.loc[rng.random(n) < 0.01, 'size'] = np.nan # 결측 행은 학습에서 빠짐
+    return df
+
+
+def chunks_of(df):
+    return [df.iloc[start:start + check_chunk_size] for start in range(0, len(df), check_chunk_size)]
+
+
+def check_state(model, df):
+    valid = add_features(df.dropna(subset=raw_columns + ['label']))
+    assert model.rows == len(valid)
+    # 표준화 통계는 지금까지 본 전체 행 기준
+    np.testing.assert_allclose(model.scaler.mean_, valid[num_cols].mean(), rtol=1e-9)
+    np.testing.assert_allclose(model.scaler.scale_, valid[num_cols].std(ddof=0), rtol=1e-9)
+    for col in cat_cols: # 범주 자리 번호 = 전체에서 처음 나온 순서
+        assert list(model.vocab[col]) == list(pd.unique(valid[col])), col
+    assert (model.class_counts == valid['label'].value_counts().sort_index().to_numpy()).all()
+    print('[info] 표준화 통계(누적) / 범주 순서 / 라벨 수 ok')
+
+
+def check_scorer(model, df):
+    # LogScorer 변환 == SGDClassifier.predict_proba, 원-핫 자리 수와 상관없이 같은 점수
+    valid = add_features(df.dropna(subset=raw_columns))
+    expected = model.clf.predict_proba(model._encode(valid))[:, 1]
+    np.testing.assert_allclose(model.to_scorer().predict_proba(valid), expected, rtol=0, atol=1e-12)
+    unseen = valid.head(100).assign(method='PATCH')
+    manual = unseen[num_cols].to_numpy(dtype=np.float64)
+    logit = (manual - model.scaler.mean_) / model.scaler.scale_ @ model.clf.coef_[0][:len(num_cols)] + model.clf.intercept_[0]
+    np.testing.assert_allclose(model.predict_proba(unseen), 1 / (1 + np.exp(-logit)), atol=1e-12)
+    print('[info] to_scorer == SGDClassifier.predict_proba ok (처음 보는 범주 포함)')
+
+
+def check_rescale(df):
+    # 표준화 통계가 바뀌어도 계수 보정으로 같은 입력의 점수는 그대로 (시간순 로그의 첫 청크는 hour 범위가 좁음)
+    chunks = chunks_of(df)
+    model = IncrementalLogModel().partial_fit(chunks[0])
+    before = model.predict_proba(df)
+    mean, scale = model.scaler.mean_.copy(), model.scaler.scale_.copy()
+    model.epochs = 0 # SGD 학습 없이 표준화 통계 / 라벨 비율만 갱신
+    model.partial_fit(pd.concat(chunks[1:]))
+    assert (np.abs(model.scaler.mean_ - mean) > 0.1 * scale).any() # 통계가 실제로 바뀜
+    np.testing.assert_allclose(model.predict_proba(df), before, rtol=0, atol=1e-12)
+    print('[info] 표준화 통계 갱신 후 계수 보정 ok (점수 그대로)')
+
+
+def check_quality(model, df):
+    # 같은 특성으로 전체 데이터를 한 번에 학습한 LogisticRegression과 비슷한 성능
+    valid = add_features(df.dropna(subset=raw_columns + ['label']))
+    y = valid['label'].to_numpy()
+    full = LogisticRegression(max_iter=1000, class_weight='balanced').fit(model._encode(valid), y)
+    inc_f1 = f1_score(y, model.to_scorer().predict(valid))
+    full_f1 = f1_score(y, full.predict(model._encode(valid)))
+    assert inc_f1 > full_f1 - 0.05, (inc_f1, full_f1)
+    print(f'[info] F1 증분 {inc_f1:.4f} / 전체 학습 {full_f1:.4f} ok')
+
+
+def check_resume(path, expected, tmp):
+    # 세 번째 청크에서 멈춘 뒤 저장된 상태로 다시 실행 -> 끊김 없이 학습한 것과 같은 계수
+    state = os.path.join(tmp, 'state.pkl')
+    partial_fit = IncrementalLogModel.partial_fit
+    calls = []
+
+    def interrupted(self, chunk):
+        calls.append(len(chunk))
+        if len(calls) == 3:
+            raise KeyboardInterrupt
+        return partial_fit(self, chunk)
+
+    IncrementalLogModel.partial_fit = interrupted
+    try:
+        IncrementalLogModel().fit_file(path, check_chunk_size, save_path=state)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        IncrementalLogModel.partial_fit = partial_fit
+    model = IncrementalLogModel.load(state)
+    assert list(model.file_progress.values()) == [2 * check_chunk_size]
+    model.fit_file(path, check_chunk_size)
+    assert model.rows == expected.rows and not model.file_progress
+    np.testing.assert_array_equal(model.clf.coef_, expected.clf.coef_)
+    # chunksize를 바꿔서 이어도 남은 행만 학습
+    model = IncrementalLogModel.load(state)
+    model.fit_file(path, 1_000)
+    assert model.rows == expected.rows
+    assert model.fit_file(path) == 0 # 이미 학습한 파일
+    print('[info] 중간에 멈춘 파일 이어서 학습 / 학습한 파일 건너뛰기 ok')
+
+
+def check_slots(df):
+    # 범주 자리가 모자라면 넘친 범주는 처음 보는 범주처럼 0
+    model = IncrementalLogModel(category_slots=2).partial_fit(df)
+    assert list(model.vocab['method']) == list(pd.unique(df.dropna(subset=raw_columns)['method']))[:2]
+    assert model._encode(add_features(df.dropna(subset=raw_columns))).shape[1] == len(num_cols) + 2 * len(cat_cols)
+    print('[info] 범주 자리 수 고정 ok')
+
+
+if __name__ == '__main__':
+    df = make_logs(rows)
+    with tempfile.TemporaryDirectory() as tmp:
+        dataset_cache.cache_dir = os.path.join(tmp, 'cache') # 내용 해시 목록을 작업 폴더에 남기지 않도록
+        path = os.path.join(tmp, 'logs.csv')
+        df.to_csv(path, index=False)
+        df = pd.read_csv(path) # CSV 왕복 후 값 기준으로 비교
+        model = IncrementalLogModel()
+        assert model.fit_file(path, check_chunk_size) == df.dropna().shape[0]
+        in_memory = IncrementalLogModel()
+        for chunk in chunks_of(df): # 같은 청크를 메모리에서 넘겨도 같은 계수
+            in_memory.partial_fit(chunk)
+        np.testing.assert_array_equal(model.clf.coef_, in_memory.clf.coef_)
+        check_state(model, df)
+        check_scorer(model, df)
+        check_rescale(df)
+        check_quality(model, df)
+        check_resume(path, model, tmp)
+        check_slots(df)
+    print('[info] weblog_incremental 확인 완료')
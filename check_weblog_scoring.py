@@ -0,0 +1,97 @@
+import io
+import os
+import time
+import tempfile
+import numpy as np
+import pandas as pd
+from sklearn.compose import ColumnTransformer
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+from weblog_scoring import LogScorer, StreamStats, add_features, score_stream, raw_columns, num_cols, cat_cols
+
+# weblog_scoring 회귀 확인: numpy 스코어러 / 스트리밍 배치 결과가 sklearn Pipeline으로 한 번에 계산한 결과와 같은지
+# python check_weblog_scoring.py (실패하면 AssertionError)
+
+rows = 20_000 # 확인용 로그 행 수
+stream_rows = 3_000 # 스트림 확인에 쓸 행 수 (작은 배치는 배치당 고정 비용이 커서)
+
+
+def make_logs(n, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'timestamp': pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 86_400, n), unit='s'),
+        'method': rng.choice(['GET', 'POST', 'PUT', 'DELETE'], n, p=[0.6, 0.25, 0.1, 0.05]),
+        'status_code': rng.choice([200, 301, 404, 500], n, p=[0.7, 0.1, 0.15, 0.05]),
+        'size': rng.integers(0, 50_000, n),
+    })
+    df['label'] = ((df['status_code'] >= 400) & (rng.random(n) < 0.8) | (rng.random(n) < 0.02)).astype(int)
+    return df
+
+
+def train_pipeline(df):
+    # 머신러닝&딥러닝 PBL4 노트북과 같은 구성
+    preprocess = ColumnTransformer([
+        ('num', StandardScaler(), num_cols),
+        ('cat', OneHotEncoder(handle_unknown='ignore'), cat_cols),
+    ])
+    model = Pipeline([('preprocess', preprocess), ('clf', LogisticRegression(max_iter=1000))])
+    return model.fit(add_features(df), df['label'])
+
+
+def check_scorer(model, scorer, df):
+    expected = model.predict_proba(add_features(df))[:, 1]
+    np.testing.assert_allclose(scorer.predict_proba(df), expected, rtol=0, atol=1e-12) # 원본 컬럼만 넘겨도 같음
+    np.testing.assert_allclose(scorer.predict_proba(add_features(df)), expected, rtol=0, atol=1e-12)
+    unseen = df.head(100).assign(method='PATCH') # 처음 보는 범주 -> 원-핫 0 (handle_unknown='ignore')
+    np.testing.assert_allclose(scorer.predict_proba(unseen), model.predict_proba(add_features(unseen))[:, 1], atol=1e-12)
+    with tempfile.TemporaryDirectory() as tmp:
+        scorer.save(os.path.join(tmp, 'scorer.pkl'))
+        restored = LogScorer.load(os.path.join(tmp, 'scorer.pkl'))
+    np.testing.assert_array_equal(restored.predict_proba(df), scorer.predict_proba(df))
+    print('[info] LogScorer == Pipeline.predict_proba ok (처음 보는 범주, 저장/로드 포함)')
+
+
+def check_stream(model, scorer, df):
+    # 잘못된 줄 / 빈 줄이 섞인 CSV 스트림 -> 배치 결과를 이어 붙이면 정상 줄을 한 번에 스코어링한 결과와 같음
+    df = df.head(stream_rows)
+    lines = df[raw_columns].to_csv(index=False).splitlines(keepends=True)
+    bad = {101: 'not,a,valid\n', 502: '\n', 1_003: '2024-01-01 10:00:00,GET,abc,12\n', 2_004: 'x,y,z,w,v,u\n'}
+    for i in sorted(bad, reverse=True):
+        lines.insert(i, bad[i])
+    for batch_size in (7, 100, 1000):
+        stats = StreamStats()
+        scored = pd.concat(score_stream(lines, scorer, stats, batch_size=batch_size, report_every=0), ignore_index=True)
+        expected = model.predict_proba(add_features(df))[:, 1]
+        assert len(scored) == len(df) and stats.rows == len(df), (batch_size, len(scored))
+        np.testing.assert_allclose(scored['score'].to_numpy(), expected, atol=1e-12)
+        assert (scored['pred'].to_numpy() == (expected >= scorer.threshold)).all()
+        assert stats.skipped == 3, stats.skipped # 빈 줄은 배치에 넣지 않음
+    print('[info] score_stream 배치 결과 == 전체 한 번에 스코어링 ok (batch_size 7/100/1000)')
+
+
+def check_max_delay(scorer, df):
+    # 입력이 멈춰도 max_delay가 지나면 덜 찬 배치를 처리
+    lines = df[raw_columns].head(5).to_csv(index=False).splitlines(keepends=True)
+
+    def stalled():
+        yield from lines
+        time.sleep(2.0) # tail -f에 새 줄이 안 들어오는 상태
+
+    started = time.perf_counter()
+    first = next(score_stream(stalled(), scorer, batch_size=1000, max_delay=0.2, report_every=0))
+    waited = time.perf_counter() - started
+    assert len(first) == 5 and waited < 1.0, (len(first), waited)
+    print(f'[info] 입력이 멈춘 뒤 {waited:.2f}초 만에 5줄 배치 처리 ok')
+
+
+if __name__ == '__main__':
+    df = make_logs(rows)
+    model = train_pipeline(df)
+    scorer = LogScorer.from_pipeline(model)
+    check_scorer(model, scorer, df)
+    # CSV 왕복(문자열 timestamp)으로 스트림 확인
+    df = pd.read_csv(io.StringIO(df.to_csv(index=False)))
+    check_stream(model, scorer, df)
+    check_max_delay(scorer, df)
+    print('[info] weblog_scoring 확인 완료')
@@ -0,0 +1,229 @@
+import numpy as np
+import pandas as pd
+
+# 메모리에 안 들어가는 큰 CSV를 청크 단위로 2번 읽어서 전처리
+# - 1차: ChunkedStats로 통계(평균/표준편차/최빈값/분위수/IQR/결측 비율/중복) 계산
+# - 2차: 통계값으로 청크를 변환해서 write_csv_chunks로 바로 저장
+# 메모리는 청크 크기 + 표본(sample_size행) + 범주 빈도표(max_categories개)로 제한됨
+# (중복 검사만 예외: 고유 행마다 8바이트 해시를 보관 -> 행 수에 비례해서 커짐, 10억 행이면 약 8GB
+#  큰 파일에서 메모리가 부족하면 track_duplicates=False)
+
+chunk_size = 100_000 # 한 번에 읽을 행 수
+sample_size = 100_000 # 분위수 계산용 표본 행 수 (reservoir sampling)
+max_categories = 10_000 # 범주형 컬럼별로 유지할 최대 값 종류 수 (넘으면 빈도 상위만 유지)
+
+
+def read_csv_chunks(path, chunksize=chunk_size, **kwargs):
+    return pd.read_csv(path, chunksize=chunksize, **kwargs)
+
+
+def write_csv_chunks(chunks, path):
+    # 청크를 하나씩 이어서 저장 (헤더는 첫 청크에만), 저장한 행 수 반환
+    rows = 0
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        for i, chunk in enumerate(chunks):
+            chunk.to_csv(f, index=False, header=(i == 0))
+            rows += len(chunk)
+    return rows
+
+
+class DuplicateTracker:
+    """
+    청크를 넘나드는 중복 행 검사 (drop_duplicates(keep='first')와 같은 결과)
+    - 행 전체를 보관하지 않고 64비트 해시만 정렬된 uint64 배열(run) 여러 개에 보관
+      고유 행 1개당 8바이트 (Python set이면 행당 60~70바이트), 행 수에 비례해서 커지고 병합하는 동안 잠시 2배
+    - 청크의 새 해시를 run으로 추가하고, 바로 앞 run이 담은 청크 수가 같거나 적으면 합침 (2진 카운터처럼)
+      -> run 개수는 log2(청크 수) 이하, 해시 하나가 병합되는 횟수도 같은 정도
+    - 이미 본 해시인지는 run마다 이진 탐색 (청크의 해시를 정렬해서 찾으면 캐시 적중이 높아서 훨씬 빠름)
+    """
+    def __init__(self, subset=None):
+        self.subset = subset # 중복 판단 기준 컬럼 (None이면 전체 컬럼)
+        self.runs = [] # (정렬된 고유 해시 배열, 담은 청크 수) -- 앞쪽일수록 큼
+
+    def duplicated(self, chunk):
+        data = chunk if self.subset is None else chunk[self.subset]
+        hashes = pd.util.hash_pandas_object(data, index=False).to_numpy()
+        # 청크 안의 중복 + 이전 청크에서 이미 본 해시
+        mask = pd.Series(hashes).duplicated().to_numpy(copy=True)
+        order = np.argsort(hashes)
+        sorted_hashes = hashes[order]
+        found = np.zeros(len(hashes), dtype=bool)
+        for run, _ in self.runs:
+            found |= contains(run, sorted_hashes)
+        mask[order[found]] = True
+        self.__add(np.sort(hashes[~mask]))
+        return mask
+
+    def __add(self, run):
+        runs = self.runs
+        chunks = 1
+        while runs and runs[-1][1] <= chunks:
+            # 정렬된 두 배열을 이어 붙이면 stable 정렬(timsort)이 선형 시간 병합으로 처리
+            previous, previous_chunks = runs.pop()
+            run = np.sort(np.concatenate([previous, run]), kind='stable')
+            chunks += previous_chunks
+        runs.append((run, chunks))
+
+    @property
+    def size(self):
+        # 보관 중인 고유 해시 수
+        return sum(len(run) for run, _ in self.runs)
+
+
+def contains(sorted_values, values):
+    # values의 각 값이 정렬된 배열 sorted_values에 있는지 (이진 탐색)
+    if not len(sorted_values):
+        return np.zeros(len(values), dtype=bool)
+    position = np.searchsorted(sorted_values, values)
+    return sorted_values[np.minimum(position, len(sorted_values) - 1)] == values
+
+
+class ChunkedStats:
+    """
+    청크를 하나씩 넣어서 컬럼 통계를 누적 (update 한 번에 청크 1개)
+    - 수치형: 개수/평균/분산(병렬 분산 공식), 최솟값/최댓값 -- 정확한 값
+    - 범주형: 값별 빈도 -- 종류가 max_categories 이하이면 정확한 최빈값
+    - 분위수/IQR: 전체 행에서 균등하게 뽑은 표본(sample_size행)으로 근사
+    - 결측 개수, 중복 행 개수
+    """
+    def __init__(self, sample_size=sample_size, max_categories=max_categories,
+                 track_duplicates=True, seed=42):
+        self.sample_size = sample_size
+        self.max_categories = max_categories
+        self.rng = np.random.default_rng(seed)
+        self.rows = 0
+        self.columns = None
+        self.num_cols = None
+        self.cat_cols = None
+        self.missing = None
+        self.count = None
+        self._mean = None
+        self._m2 = None
+        self._min = None
+        self._max = None
+        self.value_counts = {}
+        self.sample = None # 표본 (index = 표본 슬롯 번호)
+        self.duplicates = 0
+        self.dup_tracker = DuplicateTracker() if track_duplicates else None
+
+    @classmethod
+    def from_csv(cls, path, chunksize=chunk_size, read_kwargs=None, **kwargs):
+        stats = cls(**kwargs)
+        for chunk in read_csv_chunks(path, chunksize, **(read_kwargs or {})):
+            stats.update(chunk)
+        return stats
+
+    def update(self, chunk):
+        if self.columns is None:
+            # 컬럼 타입은 첫 청크 기준
+            self.columns = chunk.columns.tolist()
+            self.num_cols = chunk.select_dtypes(include=[np.number]).columns.tolist()
+            self.cat_cols = [c for c in self.columns if c not in self.num_cols]
+            self.missing = pd.Series(0, index=self.columns)
+            n = len(self.num_cols)
+            self.count = np.zeros(n)
+            self._mean = np.zeros(n)
+            self._m2 = np.zeros(n)
+            self._min = np.full(n, np.inf)
+            self._max = np.full(n, -np.inf)
+
+        self.missing += chunk.isnull().sum()
+        self._update_numeric(chunk[self.num_cols].to_numpy(dtype=np.float64))
+        for col in self.cat_cols:
+            self._update_counts(col, chunk[col].value_counts(dropna=True))
+        self._update_sample(chunk)
+        if self.dup_tracker is not None:
+            self.duplicates += int(self.dup_tracker.duplicated(chunk).sum())
+        self.rows += len(chunk)
+
+    def _update_numeric(self, values):
+        # 청크 평균/분산을 누적값과 합침 (Chan의 병렬 분산 공식 -- sum of squares보다 수치적으로 안정)
+        valid = ~np.isnan(values)
+        n_b = valid.sum(axis=0).astype(np.float64)
+        if not n_b.any():
+            return
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean_b = np.where(n_b > 0, np.nansum(values, axis=0) / n_b, 0.0)
+            m2_b = np.nansum((values - mean_b) ** 2, axis=0)
+            n = self.count + n_b
+            delta = mean_b - self._mean
+            ratio = np.where(n > 0, n_b / n, 0.0)
+            self._mean = self._mean + delta * ratio
+            self._m2 = self._m2 + m2_b + delta ** 2 * self.count * ratio
+        self.count = n
+        self._min = np.fmin(self._min, np.min(np.where(valid, values, np.inf), axis=0))
+        self._max = np.fmax(self._max, np.max(np.where(valid, values, -np.inf), axis=0))
+
+    def _update_counts(self, col, counts):
+        merged = self.value_counts[col].add(counts, fill_value=0) if col in self.value_counts else counts
+        if len(merged) > self.max_categories:
+            # 종류가 너무 많으면 빈도 상위만 유지 (최빈값은 근사)
+            merged = merged.nlargest(self.max_categories)
+        self.value_counts[col] = merged
+
+    def _update_sample(self, chunk):
+        # reservoir sampling: 지금까지 본 모든 행이 표본에 뽑힐 확률이 같도록 유지
+        k = self.sample_size
+        filled = 0 if self.sample is None else len(self.sample)
+        if filled < k:
+            head = chunk.iloc[:k - filled]
+            head = head.set_axis(np.arange(filled, filled + len(head)))
+            self.sample = head if self.sample is None else pd.concat([self.sample, head])
+            chunk = chunk.iloc[len(head):]
+            if chunk.empty:
+                return
+        start = self.rows + (len(self.sample) - filled) # chunk 첫 행의 전체 행 번호
+        slots = self.rng.integers(0, start + np.arange(1, len(chunk) + 1))
+        picked = np.flatnonzero(slots < k)
+        if len(picked) == 0:
+            return
+        # 같은 슬롯에 여러 행이 뽑히면 마지막 행만 남음
+        slots = slots[picked]
+        _, last = np.unique(slots[::-1], return_index=True)
+        picked = picked[len(picked) - 1 - last]
+        new_rows = chunk.iloc[picked].set_axis(slots[len(slots) - 1 - last])
+        self.sample = pd.concat([self.sample.drop(index=new_rows.index), new_rows])
+
+    # ---- 결과 ----
+    def missing_ratio(self):
+        return self.missing / self.rows if self.rows else self.missing.astype(float)
+
+    def mean(self):
+        with np.errstate(invalid='ignore'):
+            return pd.Series(np.where(self.count > 0, self._mean, np.nan), index=self.num_cols)
+
+    def std(self, ddof=1):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return pd.Series(np.sqrt(self._m2 / (self.count - ddof)), index=self.num_cols).where(self.count > ddof)
+
+    def min(self):
+        return pd.Series(self._min, index=self.num_cols).replace(np.inf, np.nan)
+
+    def max(self):
+        return pd.Series(self._max, index=self.num_cols).replace(-np.inf, np.nan)
+
+    def mode(self):
+        # 범주형 컬럼별 최빈값 (동률이면 pandas mode()처럼 정렬 순 첫 값, 값이 하나도 없으면 None)
+        return pd.Series({col: (min(counts.index[counts == counts.max()]) if len(counts) else None)
+                          for col, counts in self.value_counts.items()}, dtype=object)
+
+    def categories(self, col):
+        # 범주형 컬럼에서 본 값 목록 (정렬) -- 청크마다 같은 원-핫/라벨 인코딩을 하기 위해 사용
+        return sorted(self.value_counts.get(col, pd.Series(dtype=object)).index.tolist())
+
+    def quantile(self, q):
+        return self.sample[self.num_cols].quantile(q)
+
+    def iqr_bounds(self, col, k=1.5):
+        q1, q3 = self.sample[col].quantile([0.25, 0.75])
+        iqr = q3 - q1
+        return q1 - k * iqr, q3 + k * iqr
+
+    def summary(self):
+        summary = pd.DataFrame({'missing': self.missing, 'missing_ratio': self.missing_ratio()})
+        summary['mean'] = self.mean()
+        summary['std'] = self.std()
+        summary['min'] = self.min()
+        summary['max'] = self.max()
+        summary['mode'] = self.mode()
+        return summary
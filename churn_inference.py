@@ -0,0 +1,213 @@
+import time
+import pickle
+import numpy as np
+import pandas as pd
+
+try:
+    from ai_edge_litert.interpreter import Interpreter
+except ImportError:
+    Interpreter = None # 없으면 tensorflow의 tf.lite.Interpreter 사용
+
+# 이탈 예측 모델(머신러닝&딥러닝 PBL5) CPU 추론용 경량 실행
+# - NumpyChurnModel: 학습한 Keras Dense 가중치 + sklearn 전처리 값으로 numpy만 사용해서 예측
+#   표준화는 첫 Dense 층 가중치에 합치고 (W / scale, b - mean / scale @ W), 원-핫은 범주별 가중치 행 조회로 대체
+# - export_tflite / TFLiteModel: TFLite 변환 (representative를 주면 int8 post-training quantization)
+# - benchmark: 배치 크기별 호출 지연(p50/p99)과 처리량
+# Keras predict는 호출마다 고정 비용이 커서 작은 배치(온라인 요청)에서 느림
+
+batch_sizes = [1, 8, 64, 512, 4096] # 벤치마크 배치 크기
+min_bench_time = 0.5 # 배치 크기별 최소 측정 시간(초)
+representative_rows = 500 # int8 양자화 범위 계산에 쓸 행 수
+
+
+def column_matrix(df, cols):
+    # 수치형 컬럼 -> float32 행렬 (컬럼별로 채움, int/float가 섞인 df[cols].to_numpy()보다 빠름)
+    X = np.empty((len(df), len(cols)), dtype=np.float32)
+    for i, col in enumerate(cols):
+        X[:, i] = df[col].to_numpy()
+    return X
+
+
+class NumpyPreprocessor:
+    """
+    학습한 ColumnTransformer(OneHotEncoder / StandardScaler)와 같은 결과를 numpy로 계산 (float32)
+    - 처음 보는 범주는 모두 0 (handle_unknown="ignore"와 동일)
+    """
+    def __init__(self, steps, n_features):
+        self.steps = steps # (종류, 컬럼, 파라미터, 출력 시작 위치) 목록 -- ColumnTransformer 출력 순서
+        self.n_features = n_features
+
+    @classmethod
+    def from_sklearn(cls, preprocess):
+        steps = []
+        start = 0
+        for name, transformer, cols in preprocess.transformers_:
+            if transformer == 'drop' or len(cols) == 0:
+                continue
+            cols = list(cols)
+            if hasattr(transformer, 'categories_'):
+                cats = [pd.Index(c) for c in transformer.categories_]
+                steps.append(('onehot', cols, cats, start))
+                start += sum(len(c) for c in cats)
+            elif hasattr(transformer, 'mean_'):
+                steps.append(('scale', cols, (transformer.mean_.astype(np.float32), transformer.scale_.astype(np.float32)), start))
+                start += len(cols)
+            else:
+                raise ValueError(f'지원하지 않는 전처리: {name} ({type(transformer).__name__})')
+        return cls(steps, start)
+
+    def transform(self, df):
+        X = np.zeros((len(df), self.n_features), dtype=np.float32)
+        rows = np.arange(len(df))
+        for kind, cols, params, start in self.steps:
+            if kind == 'scale':
+                mean, scale = params
+                X[:, start:start + len(cols)] = (column_matrix(df, cols) - mean) / scale
+                continue
+            for col, cats in zip(cols, params):
+                codes = cats.get_indexer(df[col])
+                known = codes >= 0
+                X[rows[known], start + codes[known]] = 1.0
+                start += len(cats)
+        return X
+
+
+class NumpyChurnModel:
+    """
+    Keras Dense 모델 + 전처리를 numpy 연산 몇 번으로 실행 (Dropout은 추론 시 영향 없음)
+    - 첫 층: 수치형 원본 값 @ (표준화를 합친 가중치) + 범주별 가중치 행 + 편향 -> 원-핫 행렬을 만들지 않음
+    - 이후 층: x @ W + b -> activation
+    """
+    def __init__(self, num_cols, W_num, cat_tables, b_first, first_activation, layers):
+        self.num_cols = num_cols
+        self.W_num = W_num
+        self.cat_tables = cat_tables # 컬럼 -> (범주 Index, 가중치 행 (범주 수 + 1, units), 마지막 행은 처음 보는 범주용 0)
+        self.b_first = b_first
+        self.first_activation = first_activation
+        self.layers = layers # 두 번째 Dense 층부터 (W, b, activation) 목록
+
+    @classmethod
+    def from_keras(cls, model, preprocess):
+        weights = []
+        for layer in model.layers:
+            params = layer.get_weights() # Dropout / Input은 가중치 없음
+            if not params:
+                continue
+            activation = layer.activation.__name__
+            if activation not in ('relu', 'sigmoid', 'linear'):
+                raise ValueError(f'지원하지 않는 activation: {activation}')
+            weights.append((params[0].astype(np.float32), params[1].astype(np.float32), activation))
+
+        W, b, activation = weights[0]
+        b = b.copy()
+        num_cols, W_num, cat_tables = [], [], {}
+        for kind, cols, params, start in NumpyPreprocessor.from_sklearn(preprocess).steps:
+            if kind == 'scale':
+                mean, scale = params
+                rows = W[start:start + len(cols)]
+                num_cols += cols
+                W_num.append(rows / scale[:, None])
+                b -= (mean / scale) @ rows
+                continue
+            for col, cats in zip(cols, params):
+                table = np.vstack([W[start:start + len(cats)], np.zeros((1, W.shape[1]), dtype=np.float32)])
+                cat_tables[col] = (cats, table)
+                start += len(cats)
+        return cls(num_cols, np.vstack(W_num), cat_tables, b, activation, weights[1:])
+
+    def predict_proba(self, df):
+        # 이탈(1) 확률, shape (n,)
+        x = column_matrix(df, self.num_cols) @ self.W_num + self.b_first
+        for col, (cats, table) in self.cat_tables.items():
+            x += table[cats.get_indexer(df[col])] # 처음 보는 범주(-1) -> 마지막 0 행
+        x = activate(x, self.first_activation)
+        for W, b, activation in self.layers:
+            x = activate(x @ W + b, activation)
+        return x.ravel()
+
+    def save(self, path):
+        # 클래스가 아니라 파라미터(dict)만 저장 (TensorFlow / sklearn 없이 로드 가능)
+        with open(path, 'wb') as f:
+            pickle.dump(self.__dict__, f)
+
+    @classmethod
+    def load(cls, path):
+        model = cls.__new__(cls)
+        with open(path, 'rb') as f:
+            model.__dict__.update(pickle.load(f))
+        return model
+
+
+def activate(x, activation):
+    if activation == 'relu':
+        return np.maximum(x, 0, out=x)
+    if activation == 'sigmoid':
+        return 1.0 / (1.0 + np.exp(-x))
+    return x
+
+
+def export_tflite(model, path, representative=None):
+    """
+    Keras 모델 -> TFLite 파일, 파일 크기(byte) 반환
+    - representative(전처리한 입력 행렬)를 주면 int8 post-training quantization (입출력은 float32 유지)
+    """
+    import tensorflow as tf
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    if representative is not None:
+        rows = np.asarray(representative[:representative_rows], dtype=np.float32)
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.representative_dataset = lambda: ([row[None, :]] for row in rows)
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+    content = converter.convert()
+    with open(path, 'wb') as f:
+        f.write(content)
+    return len(content)
+
+
+class TFLiteModel:
+    # TFLite 모델 실행 (배치 크기가 바뀔 때만 입력 크기 변경)
+    def __init__(self, path, num_threads=1):
+        interpreter = Interpreter
+        if interpreter is None:
+            import tensorflow as tf
+            interpreter = tf.lite.Interpreter
+        self.interpreter = interpreter(model_path=path, num_threads=num_threads)
+        self.input = self.interpreter.get_input_details()[0]
+        self.output = self.interpreter.get_output_details()[0]
+        self.batch_size = None
+
+    def predict_proba(self, X):
+        X = np.asarray(X, dtype=np.float32)
+        if len(X) != self.batch_size:
+            self.interpreter.resize_tensor_input(self.input['index'], [len(X), X.shape[1]])
+            self.interpreter.allocate_tensors()
+            self.batch_size = len(X)
+        self.interpreter.set_tensor(self.input['index'], X)
+        self.interpreter.invoke()
+        return self.interpreter.get_tensor(self.output['index']).ravel()
+
+
+def benchmark(predict, df, batch_sizes=batch_sizes, min_time=min_bench_time):
+    """
+    predict(배치 DataFrame)를 배치 크기별로 반복 호출 -> 호출 지연 p50/p99(ms), 처리량(rows/sec)
+    - df는 가장 큰 배치 크기 이상의 행이 있어야 함
+    """
+    results = []
+    for size in batch_sizes:
+        batch = df.iloc[:size]
+        predict(batch) # 첫 호출(초기화) 제외
+        latencies = []
+        started = time.perf_counter()
+        while time.perf_counter() - started < min_time or len(latencies) < 5:
+            t0 = time.perf_counter()
+            predict(batch)
+            latencies.append(time.perf_counter() - t0)
+        latencies = np.array(latencies)
+        results.append({
+            'batch_size': size,
+            'calls': len(latencies),
+            'p50_ms': np.percentile(latencies, 50) * 1000,
+            'p99_ms': np.percentile(latencies, 99) * 1000,
+            'rows_per_sec': size / latencies.mean(),
+        })
+    return pd.DataFrame(results)
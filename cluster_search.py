@@ -0,0 +1,119 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from scipy.stats import norm
+from sklearn.cluster import KMeans, MiniBatchKMeans
+from sklearn.metrics import silhouette_samples
+from threadpoolctl import threadpool_limits
+
+# KMeans 클러스터 수(K) 선택: K별 inertia / 실루엣 점수 표
+# - K값들을 프로세스 여러 개에서 동시에 학습 (워커마다 데이터는 한 번만 전달)
+# - 행이 많으면 MiniBatchKMeans 사용 (minibatch='auto')
+# - 실루엣 점수는 O(n²)이라 클러스터별 층화 표본(sample_size행)으로 계산하고 신뢰구간을 함께 보고
+#   (데이터가 sample_size행 이하이면 전체 데이터로 계산한 정확한 값)
+
+sample_size = 10_000 # 실루엣 계산용 표본 행 수
+min_per_cluster = 50 # 층화 표본에서 클러스터별 최소 행 수 (작은 클러스터도 포함되도록)
+confidence = 0.95 # 실루엣 신뢰구간 수준
+minibatch_rows = 200_000 # minibatch='auto'일 때 이 행 수 이상이면 MiniBatchKMeans
+batch_size = 4096 # MiniBatchKMeans 배치 크기
+
+_X = None # 워커 프로세스가 들고 있는 데이터
+
+
+def stratified_sample(labels, size, rng):
+    # 클러스터 비율대로 표본 행 번호 추출 (클러스터마다 최소 min_per_cluster행)
+    clusters, counts = np.unique(labels, return_counts=True)
+    quota = np.maximum(np.round(counts / counts.sum() * size), min_per_cluster)
+    quota = np.minimum(quota, counts).astype(int)
+    idx = [rng.choice(np.flatnonzero(labels == c), q, replace=False) for c, q in zip(clusters, quota)]
+    return np.concatenate(idx)
+
+
+def sampled_silhouette(X, labels, size=sample_size, seed=42):
+    """
+    층화 표본으로 실루엣 점수 추정 -> (점수, 신뢰구간 하한, 상한, 표본 행 수)
+    - 표본 안에서 각 점의 실루엣 값을 구하고 클러스터 비율로 가중 평균
+    - 신뢰구간: 층화 평균의 분산(클러스터별 분산 / 표본 수 x 비율²)으로 정규 근사
+    """
+    n = len(labels)
+    if n <= size:
+        score = silhouette_samples(X, labels).mean()
+        return score, score, score, n
+
+    rng = np.random.default_rng(seed)
+    idx = stratified_sample(labels, size, rng)
+    values = silhouette_samples(X[idx], labels[idx])
+    sample_labels = labels[idx]
+
+    clusters, counts = np.unique(labels, return_counts=True)
+    weights = counts / n
+    score = 0.0
+    variance = 0.0
+    for c, w in zip(clusters, weights):
+        v = values[sample_labels == c]
+        score += w * v.mean()
+        if len(v) > 1:
+            variance += w ** 2 * v.var(ddof=1) / len(v) * (1 - len(v) / counts[clusters == c][0])
+    margin = norm.ppf(0.5 + confidence / 2) * np.sqrt(variance)
+    return score, score - margin, score + margin, len(idx)
+
+
+def _init_worker(X):
+    # 워커마다 데이터 한 번만 받고, KMeans 내부 스레드는 1개로 (프로세스 수 x 스레드 수 과다 방지)
+    global _X
+    _X = X
+    threadpool_limits(1)
+
+
+def fit_k(k, minibatch=False, size=sample_size, seed=42, X=None):
+    X = _X if X is None else X
+    started = time.perf_counter()
+    if minibatch:
+        model = MiniBatchKMeans(n_clusters=k, batch_size=batch_size, random_state=seed, n_init='auto')
+    else:
+        model = KMeans(n_clusters=k, random_state=seed)
+    labels = model.fit_predict(X)
+    fit_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    score, low, high, n = sampled_silhouette(X, labels, size, seed)
+    return {
+        'k': k,
+        'inertia': model.inertia_,
+        'silhouette': score,
+        'silhouette_low': low,
+        'silhouette_high': high,
+        'silhouette_rows': n,
+        'fit_time': fit_time,
+        'silhouette_time': time.perf_counter() - started,
+    }
+
+
+def select_k(X, k_range=range(2, 11), minibatch='auto', size=sample_size, workers=None, seed=42):
+    """
+    K별 inertia / 실루엣 점수(신뢰구간 포함) 표 반환 (index = k)
+    - minibatch: True / False / 'auto' (minibatch_rows행 이상이면 MiniBatchKMeans)
+    - workers: 동시에 학습할 프로세스 수 (기본: CPU 수와 K 개수 중 작은 값, 1이면 현재 프로세스에서 실행)
+    """
+    X = np.ascontiguousarray(X, dtype=np.float64)
+    if minibatch == 'auto':
+        minibatch = len(X) >= minibatch_rows
+    k_range = list(k_range)
+    workers = workers or min(os.cpu_count() or 1, len(k_range))
+
+    started = time.perf_counter()
+    if workers == 1:
+        rows = [fit_k(k, minibatch, size, seed, X=X) for k in k_range]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(X,)) as executor:
+            rows = list(executor.map(fit_k, k_range, [minibatch] * len(k_range),
+                                     [size] * len(k_range), [seed] * len(k_range)))
+    wall_time = time.perf_counter() - started
+
+    table = pd.DataFrame(rows).set_index('k')
+    print(f"[info] {len(X)}행, K {k_range[0]}~{k_range[-1]} ({'MiniBatchKMeans' if minibatch else 'KMeans'}, "
+          f"워커 {workers}개): {wall_time:.2f}초 (직렬 합계 {table[['fit_time', 'silhouette_time']].sum().sum():.2f}초)")
+    return table
@@ -0,0 +1,94 @@
+import os
+import json
+import hashlib
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:
+    pa = None
+
+# CSV를 처음 읽을 때 타입이 정해진 컬럼형 파일(Arrow IPC / feather, 비압축)로 변환해서 저장하고
+# 다음부터는 텍스트 파싱 없이 memory map으로 필요한 컬럼만 읽음
+# - 캐시 키: 경로, 크기, 수정 시각, 내용 해시 + read_csv 옵션
+# - 크기/수정 시각이 그대로면 내용 해시는 저장해 둔 값을 재사용 (매번 전체 해시 X)
+# - pyarrow가 없으면 그냥 pd.read_csv(usecols=...)로 읽음
+
+cache_dir = './.dataset_cache' # 변환한 파일 저장 폴더
+hash_block_size = 8 * 1024 * 1024 # 내용 해시 계산 시 읽는 단위
+
+
+def file_hash(path):
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        while block := f.read(hash_block_size):
+            h.update(block)
+    return h.hexdigest()
+
+
+def load_index():
+    index_path = os.path.join(cache_dir, 'index.json')
+    if not os.path.exists(index_path):
+        return {}
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_index(index):
+    os.makedirs(cache_dir, exist_ok=True) # load_csv 없이 fingerprint만 쓰는 경우 (weblog_incremental)
+    index_path = os.path.join(cache_dir, 'index.json')
+    tmp_path = f'{index_path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, index_path)
+
+
+def fingerprint(path):
+    # (경로, 크기, 수정 시각, 내용 해시) -- 크기/수정 시각이 같으면 저장된 해시 재사용
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    index = load_index()
+    entry = index.get(path)
+    if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+        return entry
+    entry = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'hash': file_hash(path)}
+    index[path] = entry
+    save_index(index)
+    return entry
+
+
+def cache_path_for(path, read_kwargs):
+    # 내용 해시 + read_csv 옵션이 같으면 같은 캐시 파일 (파일을 옮기거나 touch해도 재사용)
+    entry = fingerprint(path)
+    options = json.dumps(read_kwargs, sort_keys=True, default=str)
+    key = hashlib.blake2b(f"{entry['hash']}|{options}".encode('utf-8'), digest_size=8).hexdigest()
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(cache_dir, f'{stem}-{key}.arrow')
+
+
+def load_csv(path, columns=None, as_arrow=False, **read_kwargs):
+    """
+    pd.read_csv 대신 사용 (같은 read_kwargs를 그대로 받음)
+    - columns: 읽을 컬럼 목록 (나머지 컬럼은 디스크에서 읽지도 않음)
+    - as_arrow: True면 pandas 변환 없이 pyarrow.Table 반환 (복사 없음)
+    """
+    if pa is None:
+        df = pd.read_csv(path, usecols=columns, **read_kwargs)
+        return df if columns is None else df[columns]
+
+    os.makedirs(cache_dir, exist_ok=True)
+    arrow_path = cache_path_for(path, read_kwargs)
+    if not os.path.exists(arrow_path):
+        df = pd.read_csv(path, **read_kwargs)
+        tmp_path = f'{arrow_path}.{os.getpid()}.tmp'
+        # 비압축으로 저장해야 memory map으로 바로 읽을 수 있음
+        feather.write_feather(df.reset_index(drop=True), tmp_path, compression='uncompressed')
+        os.replace(tmp_path, arrow_path)
+        print(f'[info] 컬럼형 캐시 생성: {path} -> {arrow_path}')
+
+    table = feather.read_table(arrow_path, columns=columns, memory_map=True)
+    return table if as_arrow else table.to_pandas()
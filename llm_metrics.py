@@ -0,0 +1,181 @@
+import os
+import sys
+import json
+import time
+import threading
+from bisect import bisect_left
+
+# LLM 호출 지표 수집 (my_chatbot.py 스트리밍 / OpenAIAgent.call_openai 공용)
+# - 호출 1건마다 이벤트를 JSONL로 남기고 (metrics_path)
+# - 프로세스 안에서는 히스토그램으로 누적해서 p50/p95/p99를 바로 계산
+# - python llm_metrics.py [metrics_path] : 저장된 이벤트로 히스토그램 요약 출력
+
+metrics_path = './llm_metrics.jsonl' # 호출 이벤트 저장 경로 (None이면 저장 안 함)
+
+# 지표별 히스토그램 구간 (상한값)
+seconds_buckets = [0.05, 0.1, 0.25, 0.5, 1, 2, 4, 8, 16, 32, 64]
+histogram_buckets = {
+    'ttft': seconds_buckets, # 첫 토큰까지 걸린 시간(초)
+    'latency': seconds_buckets, # 전체 응답 시간(초)
+    'tokens_per_sec': [1, 5, 10, 20, 40, 80, 160, 320, 640], # 생성 속도
+    'prompt_tokens': [16, 64, 256, 1024, 4096, 16384, 65536],
+    'completion_tokens': [16, 64, 256, 1024, 4096, 16384],
+    'tool_rounds': [0, 1, 2, 3, 4, 5], # 대화 1번에 tool 호출 왕복 수
+}
+
+
+class Histogram:
+    def __init__(self, bounds):
+        self.bounds = list(bounds)
+        self.counts = [0] * (len(self.bounds) + 1) # 마지막 칸은 상한 초과
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def observe(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def percentile(self, q):
+        # 구간 상한으로 근사 (상한 초과 구간은 관측 최댓값)
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        for i, c in enumerate(self.counts):
+            cumulative += c
+            if cumulative >= rank and c:
+                return min(self.bounds[i], self.max) if i < len(self.bounds) else self.max
+        return self.max
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else None,
+            'min': self.min,
+            'max': self.max,
+            'p50': self.percentile(0.5),
+            'p95': self.percentile(0.95),
+            'p99': self.percentile(0.99),
+            'buckets': dict(zip([str(b) for b in self.bounds] + ['inf'], self.counts)),
+        }
+
+
+class LLMMetrics:
+    def __init__(self, path=metrics_path):
+        self.path = path
+        self.lock = threading.Lock() # 스레드(Streamlit 세션, 배치 워커)가 함께 기록
+        self.histograms = {name: Histogram(bounds) for name, bounds in histogram_buckets.items()}
+        # kind별 건수: call(API 호출), cache_hit(캐시 응답), error(실패), chat(대화 1번 완료)
+        self.counters = {'call': 0, 'cache_hit': 0, 'error': 0, 'chat': 0}
+
+    def record(self, source, kind='call', **values):
+        # 이벤트 1건 기록: kind 건수 + 히스토그램 누적 + JSONL 1줄
+        values = {k: v for k, v in values.items() if v is not None}
+        with self.lock:
+            self.counters[kind] = self.counters.get(kind, 0) + 1
+            for name, value in values.items():
+                if name in self.histograms:
+                    self.histograms[name].observe(value)
+            if self.path:
+                event = {'ts': round(time.time(), 3), 'source': source, 'kind': kind, **values}
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(event, ensure_ascii=False) + '\n')
+
+    def record_error(self, source, error):
+        self.record(source, kind='error', error=f'{type(error).__name__}: {error}')
+
+    def record_response(self, source, resp, started, finished=None):
+        # 스트리밍이 아닌 응답: ttft = latency
+        # finished: 응답을 받은 시각 (다른 스레드에서 나중에 기록할 때, None이면 지금)
+        latency = (time.perf_counter() if finished is None else finished) - started
+        usage = getattr(resp, 'usage', None)
+        completion_tokens = getattr(usage, 'completion_tokens', None)
+        self.record(
+            source,
+            ttft=latency,
+            latency=latency,
+            prompt_tokens=getattr(usage, 'prompt_tokens', None),
+            completion_tokens=completion_tokens,
+            tokens_per_sec=completion_tokens / latency if completion_tokens and latency > 0 else None,
+        )
+
+    def track_stream(self, stream, source='stream'):
+        # chat.completions 스트림을 그대로 흘려보내면서 ttft / 속도 / 토큰 수 측정
+        # (usage는 stream_options={"include_usage": True}일 때 마지막 청크에 들어옴)
+        started = time.perf_counter()
+        first_token = None
+        chunks = 0
+        usage = None
+        try:
+            for chunk in stream:
+                if getattr(chunk, 'usage', None) is not None:
+                    usage = chunk.usage
+                choices = getattr(chunk, 'choices', None)
+                if choices and getattr(choices[0].delta, 'content', None):
+                    if first_token is None:
+                        first_token = time.perf_counter() - started
+                    chunks += 1
+                yield chunk
+        except Exception as e:
+            self.record_error(source, e)
+            raise
+
+        latency = time.perf_counter() - started
+        # usage가 없으면 내용 청크 수를 토큰 수 근사치로 사용
+        completion_tokens = getattr(usage, 'completion_tokens', None) or chunks
+        generation_time = latency - (first_token or 0)
+        self.record(
+            source,
+            ttft=first_token,
+            latency=latency,
+            prompt_tokens=getattr(usage, 'prompt_tokens', None),
+            completion_tokens=completion_tokens,
+            tokens_per_sec=completion_tokens / generation_time if completion_tokens and generation_time > 0 else None,
+        )
+
+    def summary(self):
+        with self.lock:
+            return {
+                'counters': dict(self.counters),
+                'histograms': {name: h.to_dict() for name, h in self.histograms.items() if h.count},
+            }
+
+    def export(self, path):
+        # 현재 히스토그램 스냅샷을 JSON으로 저장 (임시 파일 후 교체)
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.summary(), f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+
+
+def load_metrics(path=metrics_path):
+    # 저장된 JSONL 이벤트로 히스토그램 다시 만들기 (여러 프로세스 기록 합산)
+    metrics = LLMMetrics(path=None)
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            event = json.loads(line)
+            event.pop('ts', None)
+            metrics.record(**event)
+    return metrics
+
+
+def print_summary(summary):
+    print('[info] counters:', ', '.join(f'{k}={v}' for k, v in summary['counters'].items()))
+    print(f"{'metric':<18}{'count':>7}{'mean':>10}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}")
+    for name, h in summary['histograms'].items():
+        print(f"{name:<18}{h['count']:>7}{h['mean']:>10.3f}{h['p50']:>10.3f}{h['p95']:>10.3f}{h['p99']:>10.3f}{h['max']:>10.3f}")
+
+
+if __name__ == '__main__':
+    path = sys.argv[1] if len(sys.argv) > 1 else metrics_path
+    if not os.path.exists(path):
+        print(f'[error] 지표 파일 없음: {path}')
+        sys.exit(1)
+    print_summary(load_metrics(path).summary())
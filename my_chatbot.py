@@ -1,11 +1,192 @@
 from openai import OpenAI
 import streamlit as st
 from dotenv import load_dotenv
+from llm_metrics import LLMMetrics, metrics_path
+from functools import lru_cache
 import os
+import time
+import uuid
+import sqlite3
+import threading
+
+try:
+    import tiktoken # 정확한 토큰 수 계산 (없으면 근사치 사용)
+except ImportError:
+    tiktoken = None
+
+# 컨텍스트(요청에 담는 대화) 설정
+context_token_budget = 6000 # 요청 1번에 담을 대화 토큰 상한
+context_keep_ratio = 0.6 # 상한을 넘으면 최근 대화를 이 비율만큼만 남기고 나머지는 요약
+summarize_old_turns = True # False면 오래된 대화를 요약 없이 버림
+summary_max_tokens = 500 # 요약문 최대 토큰 수
+message_overhead_tokens = 4 # 메시지 1개당 role 등 부가 토큰
+
+# 대화 저장 / 화면 설정
+chat_db_path = './chat_history.db' # 대화 저장 SQLite (재시작/여러 워커 프로세스에서 공유)
+history_render_limit = 50 # 화면에 한 번에 그릴 최근 메시지 수 (나머지는 '더 보기')
+
+
+@st.cache_resource
+def get_client():
+    # rerun마다 .env 로드 / 클라이언트(커넥션 풀) 생성을 반복하지 않도록 프로세스당 1번만 생성
+    load_dotenv()
+    return OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+
+
+class ConversationStore:
+    """
+    세션별 대화를 SQLite에 저장
+    - WAL 모드: 여러 워커 프로세스가 동시에 읽고, 쓰기는 짧게 직렬화
+    - 메시지는 추가될 때마다 1행씩 INSERT (전체를 다시 쓰지 않음)
+    """
+    def __init__(self, path):
+        self.lock = threading.Lock() # Streamlit 세션(스레드)들이 연결 1개를 공유
+        self.conn = sqlite3.connect(path, timeout=10, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS conversations ('
+            'session_id TEXT PRIMARY KEY, summary TEXT, summary_upto INTEGER, updated_at REAL)'
+        )
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS messages ('
+            'id INTEGER PRIMARY KEY AUTOINCREMENT, session_id TEXT, role TEXT, content TEXT, tokens INTEGER, created_at REAL)'
+        )
+        self.conn.execute('CREATE INDEX IF NOT EXISTS idx_messages_session ON messages (session_id, id)')
+        self.conn.commit()
+
+    def load(self, session_id):
+        # (messages, summary, summary_upto)
+        with self.lock:
+            rows = self.conn.execute(
+                'SELECT role, content, tokens FROM messages WHERE session_id = ? ORDER BY id', (session_id,)
+            ).fetchall()
+            conv = self.conn.execute(
+                'SELECT summary, summary_upto FROM conversations WHERE session_id = ?', (session_id,)
+            ).fetchone()
+        messages = [{"role": role, "content": content, "tokens": tokens} for role, content, tokens in rows]
+        summary, summary_upto = conv if conv else ('', 0)
+        return messages, summary or '', summary_upto or 0
+
+    def add_message(self, session_id, message):
+        now = time.time()
+        with self.lock:
+            self.conn.execute(
+                'INSERT INTO messages (session_id, role, content, tokens, created_at) VALUES (?, ?, ?, ?, ?)',
+                (session_id, message['role'], message['content'], message['tokens'], now),
+            )
+            self.conn.execute(
+                'INSERT INTO conversations (session_id, summary, summary_upto, updated_at) VALUES (?, \'\', 0, ?) '
+                'ON CONFLICT(session_id) DO UPDATE SET updated_at = excluded.updated_at',
+                (session_id, now),
+            )
+            self.conn.commit()
+
+    def save_summary(self, session_id, summary, summary_upto):
+        with self.lock:
+            self.conn.execute(
+                'UPDATE conversations SET summary = ?, summary_upto = ?, updated_at = ? WHERE session_id = ?',
+                (summary, summary_upto, time.time(), session_id),
+            )
+            self.conn.commit()
+
+
+@st.cache_resource
+def get_store():
+    return ConversationStore(chat_db_path)
+
+
+@st.cache_resource
+def get_metrics():
+    # 프로세스 전체(모든 세션) 지표를 한 곳에 누적, 이벤트는 metrics_path JSONL에도 기록
+    return LLMMetrics(metrics_path)
+
+
+client = get_client()
+store = get_store()
+metrics = get_metrics()
+
+
+@lru_cache(maxsize=None)
+def get_encoding(model):
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding('o200k_base')
+
+def count_tokens(text, model):
+    # 메시지 1개의 토큰 수 (메시지를 추가할 때 한 번만 계산해서 저장)
+    if tiktoken is not None:
+        return len(get_encoding(model).encode(text)) + message_overhead_tokens
+    # 근사치: 영문/숫자는 4글자당 1토큰, 한글 등은 1글자당 1토큰 정도
+    ascii_count = sum(1 for c in text if c.isascii())
+    return ascii_count // 4 + (len(text) - ascii_count) + message_overhead_tokens
+
+def add_message(role, content):
+    # 메시지를 추가하면서 토큰 수와 컨텍스트 토큰 합계를 같이 갱신
+    tokens = count_tokens(content, st.session_state.openai_model)
+    message = {
+        "role" : role,
+        "content" : content,
+        "tokens" : tokens
+    }
+    st.session_state.messages.append(message)
+    st.session_state.context_tokens += tokens
+    store.add_message(st.session_state.session_id, message)
+
+def summarize(summary, old_messages):
+    # 이전 요약 + 잘라낼 대화 -> 새 요약 (잘라낼 때만 호출되고 결과는 session_state에 보관)
+    conversation = '\n'.join(f"{m['role']}: {m['content']}" for m in old_messages)
+    if summary:
+        conversation = f"[이전 요약]\n{summary}\n\n[이어진 대화]\n{conversation}"
+    started = time.perf_counter()
+    resp = client.chat.completions.create(
+        model=st.session_state.openai_model,
+        messages=[
+            {"role": "system", "content": "다음 대화의 핵심 정보(사용자 요청, 결정 사항, 중요한 사실)를 한국어로 간결하게 요약해라."},
+            {"role": "user", "content": conversation},
+        ],
+        max_completion_tokens=summary_max_tokens,
+    )
+    metrics.record_response('chatbot_summary', resp, started)
+    return (resp.choices[0].message.content or '').strip()
+
+def summary_content():
+    return f"이전 대화 요약:\n{st.session_state.summary}"
+
+def build_context():
+    # 요청에 담을 메시지 목록: [요약(system)] + 최근 대화 (토큰 상한 이내)
+    messages = st.session_state.messages
+    start = st.session_state.summary_upto
+
+    if st.session_state.context_tokens > context_token_budget:
+        # 최근 메시지부터 거꾸로 채워서 target 이내만 남김 (마지막 메시지는 항상 유지)
+        target = context_token_budget * context_keep_ratio
+        cut = len(messages) - 1
+        kept = messages[cut]['tokens']
+        while cut - 1 >= start and kept + messages[cut - 1]['tokens'] <= target:
+            cut -= 1
+            kept += messages[cut]['tokens']
+
+        if cut > start:
+            old_messages = messages[start:cut]
+            if summarize_old_turns:
+                try:
+                    st.session_state.summary = summarize(st.session_state.summary, old_messages)
+                except Exception as e:
+                    print(f'[warning] 대화 요약 실패, 오래된 대화는 버림: {e}')
+            st.session_state.summary_tokens = count_tokens(summary_content(), st.session_state.openai_model) if st.session_state.summary else 0
+            st.session_state.summary_upto = cut
+            st.session_state.context_tokens = kept + st.session_state.summary_tokens
+            store.save_summary(st.session_state.session_id, st.session_state.summary, cut)
+            start = cut
+
+    context = []
+    if st.session_state.summary:
+        context.append({"role": "system", "content": summary_content()})
+    context.extend({"role": m['role'], "content": m['content']} for m in messages[start:])
+    return context
 
-load_dotenv()
-OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
-client = OpenAI(api_key=OPENAI_API_KEY)
 
 st.title('ChatGPT Chatbot')
 
@@ -15,12 +196,34 @@ if 'openai_model' not in st.session_state:
     st.session_state.openai_model = 'gpt-5.2' # openai_model이라는 변수를 만들고 해당 변수에 gpt-5.2 문자열을 저장
 
 # 대화 내용 저장
-# messages => []
-# message 초기 세팅
+# session_id => URL 쿼리 파라미터(?sid=...)로 유지 -> 새로고침/재시작/다른 워커에서도 같은 대화
+# messages => 저장소에서 불러온 대화 (세션 시작 시 1번만)
+# 컨텍스트 관리 상태
+# summary => 잘라낸 오래된 대화의 요약 (rerun마다 다시 만들지 않도록 저장)
+# summary_upto => messages[:summary_upto]까지 요약에 반영됨
+# context_tokens => 요약 + messages[summary_upto:]의 토큰 합계 (메시지 추가 시 증분 갱신)
 if 'messages' not in st.session_state:
-    st.session_state.messages = []
+    session_id = st.query_params.get('sid')
+    if not session_id:
+        session_id = uuid.uuid4().hex
+        st.query_params['sid'] = session_id
+    st.session_state.session_id = session_id
+
+    messages, summary, summary_upto = store.load(session_id)
+    st.session_state.messages = messages
+    st.session_state.summary = summary
+    st.session_state.summary_upto = summary_upto
+    st.session_state.summary_tokens = count_tokens(summary_content(), st.session_state.openai_model) if summary else 0
+    st.session_state.context_tokens = st.session_state.summary_tokens + sum(m['tokens'] for m in messages[summary_upto:])
+    st.session_state.render_limit = history_render_limit
+
+# 최근 render_limit개만 그림 -> 대화가 길어져도 rerun 시간이 일정
+render_start = max(0, len(st.session_state.messages) - st.session_state.render_limit)
+if render_start > 0 and st.button(f'이전 메시지 {render_start}개 더 보기'):
+    st.session_state.render_limit += history_render_limit
+    st.rerun()
 
-for msg in st.session_state.messages:
+for msg in st.session_state.messages[render_start:]:
     with st.chat_message(msg['role']): # chat_message : 역할에 따라 메시지 구분
         st.markdown(msg['content'])
 
@@ -29,13 +232,8 @@ for msg in st.session_state.messages:
 # := 할당 표현식 -- 변수에 값을 할당하면서 동시에 그 값을 평가
 if prompt := st.chat_input('메시지를 입력하세요'):
     # messages 내용 추가
-    # "role", "content"
-    st.session_state.messages.append(
-        {
-            "role" : "user",
-            "content" : prompt
-        }
-    )
+    # "role", "content", "tokens"
+    add_message("user", prompt)
 
     with st.chat_message('user'):
         st.markdown(prompt)
@@ -54,19 +252,33 @@ if prompt := st.chat_input('메시지를 입력하세요'):
     #     response = st.write_stream(stream)
     
     with st.chat_message('assistant'):
-        stream = client.chat.completions.create(
-            model=st.session_state.openai_model,
-            messages=[
-                {"role": m['role'], "content": m['content']}
-                for m in st.session_state.messages
-            ],
-            stream=True
-        )
-        response = st.write_stream(stream)
-
-        st.session_state.messages.append(
-            {
-                "role" : "assistant",
-                "content" : response
-            }
-        )
\ No newline at end of file
+        try:
+            stream = client.chat.completions.create(
+                model=st.session_state.openai_model,
+                messages=build_context(), # 전체 대화 대신 토큰 상한 이내의 컨텍스트만 전송
+                stream=True,
+                stream_options={"include_usage": True} # 마지막 청크에 토큰 사용량 포함
+            )
+        except Exception as e:
+            metrics.record_error('chatbot', e)
+            raise
+        # track_stream: 청크를 그대로 넘기면서 첫 토큰 시간/속도/토큰 수 기록
+        response = st.write_stream(metrics.track_stream(stream, source='chatbot'))
+
+        add_message("assistant", response)
+
+st.sidebar.caption(f'컨텍스트 토큰: {st.session_state.context_tokens} / {context_token_budget}')
+
+# 지표 패널 (이 프로세스의 누적값, 전체 기록은 python llm_metrics.py로 확인)
+with st.sidebar.expander('응답 지표'):
+    summary = metrics.summary()
+    st.caption(', '.join(f'{k}: {v}' for k, v in summary['counters'].items()))
+    st.dataframe(
+        [
+            {'지표': name, '건수': h['count'], 'p50': h['p50'], 'p95': h['p95'], 'p99': h['p99'], '최대': h['max']}
+            for name, h in summary['histograms'].items()
+        ],
+        hide_index=True,
+    )
+    if 'latency' in summary['histograms']:
+        st.bar_chart(summary['histograms']['latency']['buckets'])
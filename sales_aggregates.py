@@ -0,0 +1,256 @@
+import os
+import pickle
+import hashlib
+import numpy as np
+import pandas as pd
+from chunked_stats import chunk_size
+from dataset_cache import cache_dir
+
+# 거래 데이터 집계 (파이썬 PBL4 SalesAnalysis / PBL6 CustomerSalesAnalysis 공용)
+# - 청크를 한 번 읽으면서 월별 / 고객별 / 상품별 매출 합계를 함께 누적 (groupby를 매번 다시 하지 않음)
+# - 고객 / 상품은 정수 코드로 관리: 청크 안의 고유값만 해시해서 전체 코드로 변환 -> np.bincount로 합계
+# - 거래 파일(CSV)은 어디까지 읽었는지(byte 위치) 기록 -> 파일 뒤에 거래가 추가되면 추가된 부분만 읽어서 갱신
+#   inode / 이미 읽은 부분의 앞부분과 끝부분 해시가 달라지면 다시 쓴 파일로 보고 처음부터 다시 집계
+#   (앞뒤 head_check_size byte는 같고 그 사이만 바뀐 파일은 구분하지 못함)
+# - 집계 결과는 cache_dir에 저장 -> 다음 실행에서는 파일을 다시 읽지 않음
+
+head_check_size = 64 * 1024 # 파일이 바뀌었는지 확인할 때 비교하는 (이미 읽은 부분의) 앞부분 / 끝부분 크기
+
+
+class LimitedReader:
+    # 파일의 [현재 위치, 현재 위치 + size) 구간만 읽게 하는 래퍼 (마지막 줄이 아직 쓰는 중일 때 제외용)
+    def __init__(self, f, size):
+        self.f = f
+        self.remaining = size
+
+    def read(self, size=-1):
+        if size is None or size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.f.read(size)
+        self.remaining -= len(data)
+        return data
+
+
+class SalesAggregator:
+    """
+    거래 데이터 롤업 (월 / 고객 / 상품별 매출 합계)
+    - update(df): 거래 DataFrame(청크)을 누적 -- 이미 누적한 거래는 다시 계산하지 않음
+    - sync(path): CSV 파일에서 아직 읽지 않은 부분만 청크로 읽어서 update
+    - for_file(path, ...): 캐시된 집계 로드 -> sync -> 캐시 저장
+    - amount_col이 없으면 quantity_col x price_col을 매출로 사용
+    """
+    def __init__(self, date_col, amount_col, customer_col=None, product_col=None,
+                 quantity_col=None, price_col=None, date_format=None):
+        self.date_col = date_col
+        self.amount_col = amount_col
+        self.customer_col = customer_col
+        self.product_col = product_col
+        self.quantity_col = quantity_col
+        self.price_col = price_col
+        self.date_format = date_format # 파일의 날짜 형식 (None이면 청크마다 추정)
+        self.reset()
+
+    def reset(self):
+        self.rows = 0
+        self.integer_amounts = True # 매출이 정수이면 결과도 정수로
+        self.month_sales = pd.Series(dtype=np.float64) # index: 1970-01부터의 월 번호 (Period 'M' ordinal)
+        self.customers = pd.Index([], dtype=object) # 고객 코드 -> 이름
+        self.customer_sales = np.zeros(0)
+        self.products = pd.Index([], dtype=object) # 상품 코드 -> 이름
+        self.product_sales = np.zeros(0)
+        self.product_quantity = np.zeros(0)
+        # 파일 동기화 상태
+        self.source = None
+        self.header = None
+        self.offset = 0 # 다음에 읽을 byte 위치
+        self.inode = None
+        self.head_hash = None
+        self.tail_hash = None # offset 바로 앞부분 해시
+
+    # ---- 누적 ----
+    def update(self, df):
+        if df.empty:
+            return self
+        amount = self._amount(df)
+        dates = df[self.date_col]
+        if not pd.api.types.is_datetime64_any_dtype(dates):
+            dates = pd.to_datetime(dates, format=self.date_format, errors='coerce')
+        valid = dates.notna().to_numpy() & ~np.isnan(amount)
+        months = dates.to_numpy()[valid].astype('datetime64[M]').astype(np.int64)
+        amount = amount[valid]
+
+        if len(months):
+            first = months.min()
+            sums = np.bincount(months - first, weights=amount)
+            seen = np.bincount(months - first) > 0 # 거래가 없는 월은 제외 (groupby와 동일)
+            month_sales = pd.Series(sums[seen], index=np.arange(first, first + len(sums))[seen])
+            self.month_sales = self.month_sales.add(month_sales, fill_value=0)
+        if self.customer_col:
+            self.customers, codes = encode(self.customers, df[self.customer_col][valid])
+            self.customer_sales = add_bincount(self.customer_sales, codes, amount, len(self.customers))
+        if self.product_col:
+            self.products, codes = encode(self.products, df[self.product_col][valid])
+            self.product_sales = add_bincount(self.product_sales, codes, amount, len(self.products))
+            if self.quantity_col:
+                quantity = df[self.quantity_col].to_numpy(dtype=np.float64)[valid]
+                self.product_quantity = add_bincount(self.product_quantity, codes, quantity, len(self.products))
+        self.rows += int(valid.sum())
+        return self
+
+    def _amount(self, df):
+        if self.amount_col in df:
+            values = df[self.amount_col]
+        else:
+            values = df[self.quantity_col] * df[self.price_col]
+        self.integer_amounts &= pd.api.types.is_integer_dtype(values)
+        return values.to_numpy(dtype=np.float64)
+
+    # ---- 파일 동기화 ----
+    def sync(self, path, chunksize=chunk_size):
+        """
+        CSV 파일에서 지난번 이후에 추가된 줄만 읽어서 누적, 새로 누적한 행 수 반환
+        - inode / 이미 읽은 부분의 앞부분, 끝부분이 바뀌었거나 파일이 줄었으면(다시 쓴 파일) 처음부터 다시 집계
+        - 마지막 줄이 줄바꿈으로 끝나지 않으면(쓰는 중) 다음 sync 때 읽음
+        """
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        size = stat.st_size
+        if (self.source != path or stat.st_ino != self.inode or size < self.offset
+                or self.head_hash != head_hash(path, self.offset) or self.tail_hash != tail_hash(path, self.offset)):
+            if self.rows:
+                print(f'[info] 파일이 바뀌어서 처음부터 다시 집계: {path}')
+            self.reset()
+            self.source = path
+            self.inode = stat.st_ino
+
+        rows = self.rows
+        with open(path, 'rb') as f:
+            if self.offset == 0:
+                self.header = pd.read_csv(f, nrows=0).columns.tolist()
+                f.seek(0)
+                f.readline()
+                self.offset = f.tell()
+            end = last_line_end(f, size)
+            if end <= self.offset:
+                return 0
+            f.seek(self.offset)
+            category_cols = [c for c in (self.customer_col, self.product_col) if c]
+            reader = pd.read_csv(LimitedReader(f, end - self.offset), header=None, names=self.header,
+                                 usecols=self._usecols(), dtype={c: 'category' for c in category_cols},
+                                 chunksize=chunksize)
+            for chunk in reader:
+                self.update(chunk)
+        self.offset = end
+        self.head_hash = head_hash(path, end)
+        self.tail_hash = tail_hash(path, end)
+        return self.rows - rows
+
+    def _usecols(self):
+        cols = [self.date_col, self.customer_col, self.product_col, self.quantity_col, self.price_col]
+        if self.amount_col in self.header:
+            cols.append(self.amount_col)
+        return [c for c in dict.fromkeys(cols) if c and c in self.header]
+
+    @classmethod
+    def for_file(cls, path, chunksize=chunk_size, **columns):
+        # 캐시된 집계가 있으면 로드 후 추가된 부분만 읽음 (설정이 다르면 새로 집계)
+        key = hashlib.blake2b(f'{os.path.abspath(path)}|{sorted(columns.items())}'.encode('utf-8'),
+                              digest_size=8).hexdigest()
+        stem = os.path.splitext(os.path.basename(path))[0]
+        state_path = os.path.join(cache_dir, f'{stem}-{key}.sales.pkl')
+        aggregator = cls.load(state_path) if os.path.exists(state_path) else cls(**columns)
+        added = aggregator.sync(path, chunksize)
+        if added:
+            os.makedirs(cache_dir, exist_ok=True)
+            aggregator.save(state_path)
+            print(f'[info] {added}행 집계 추가 (누적 {aggregator.rows}행): {state_path}')
+        return aggregator
+
+    def save(self, path):
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(self.__dict__, f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        aggregator = cls.__new__(cls)
+        with open(path, 'rb') as f:
+            aggregator.__dict__.update(pickle.load(f))
+        # inode / tail_hash가 없던 때 저장한 캐시 -> 다음 sync에서 처음부터 다시 집계
+        aggregator.__dict__.setdefault('inode', None)
+        aggregator.__dict__.setdefault('tail_hash', None)
+        return aggregator
+
+    # ---- 결과 ----
+    def _values(self, values):
+        return values.round().astype(np.int64) if self.integer_amounts else values
+
+    def monthly(self):
+        # 월별 매출 합계 (Month: Period[M])
+        months = self.month_sales.sort_index()
+        return pd.DataFrame({
+            'Month': pd.PeriodIndex.from_ordinals(months.index.to_numpy(dtype=np.int64), freq='M'),
+            self.amount_col: self._values(months.to_numpy()),
+        })
+
+    def by_customer(self):
+        # 고객별 매출 합계 (많은 순)
+        return pd.Series(self._values(self.customer_sales), index=self.customers,
+                         name=self.amount_col).rename_axis(self.customer_col).sort_values(ascending=False)
+
+    def by_product(self):
+        # 상품별 매출 합계 / 판매 수량 (매출 많은 순)
+        result = pd.DataFrame({self.amount_col: self._values(self.product_sales)}, index=self.products)
+        if self.quantity_col:
+            result[self.quantity_col] = self.product_quantity.round().astype(np.int64)
+        return result.rename_axis(self.product_col).sort_values(self.amount_col, ascending=False)
+
+
+def encode(categories, values):
+    # 값 -> 전체 코드 (청크 안의 고유값만 해시, 처음 보는 값은 categories 뒤에 추가), 결측은 -1
+    local_codes, uniques = pd.factorize(values)
+    uniques = pd.Index(np.asarray(uniques, dtype=object))
+    mapping = categories.get_indexer(uniques)
+    new = mapping < 0
+    if new.any():
+        mapping[new] = np.arange(len(categories), len(categories) + new.sum())
+        categories = categories.append(uniques[new])
+    codes = np.where(local_codes >= 0, mapping[local_codes], -1) if len(mapping) else local_codes
+    return categories, codes
+
+
+def add_bincount(totals, codes, weights, size):
+    # 코드별 합계를 누적 배열에 더함 (결측 코드 -1 제외)
+    known = codes >= 0
+    sums = np.bincount(codes[known], weights=weights[known], minlength=size)
+    totals = np.pad(totals, (0, size - len(totals)))
+    return totals + sums
+
+
+def head_hash(path, size):
+    # 파일 앞부분(최대 head_check_size byte) 해시 -- 이미 읽은 부분이 바뀌었는지 확인
+    with open(path, 'rb') as f:
+        return hashlib.blake2b(f.read(min(size, head_check_size)), digest_size=16).hexdigest()
+
+
+def tail_hash(path, end):
+    # 이미 읽은 부분의 끝(end 바로 앞 최대 head_check_size byte) 해시 -- 앞부분은 같게 다시 쓴 파일 확인
+    start = max(0, end - head_check_size)
+    with open(path, 'rb') as f:
+        f.seek(start)
+        return hashlib.blake2b(f.read(end - start), digest_size=16).hexdigest()
+
+
+def last_line_end(f, size):
+    # 마지막 줄바꿈 바로 뒤 위치 (완성된 줄까지만 읽기 위해)
+    position = size
+    while position > 0:
+        start = max(0, position - 65536)
+        f.seek(start)
+        block = f.read(position - start)
+        newline = block.rfind(b'\n')
+        if newline >= 0:
+            return start + newline + 1
+        position = start
+    return 0
@@ -0,0 +1,188 @@
+import os
+import time
+import pickle
+import argparse
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.linear_model import SGDClassifier
+from sklearn.preprocessing import StandardScaler
+from chunked_stats import read_csv_chunks
+from dataset_cache import fingerprint
+from weblog_scoring import LogScorer, add_features, raw_columns, num_cols, cat_cols, model_path
+
+# 웹 로그 이상 탐지 모델 증분 학습 (매일 쌓이는 로그를 전체 재학습 없이 새 데이터만으로 갱신)
+# - 표준화: StandardScaler.partial_fit으로 평균/분산을 새 데이터로 누적 갱신
+#   통계가 바뀐 만큼 이미 학습한 계수/절편을 보정 -> 같은 입력의 점수는 그대로 (계수가 다르게 표준화된 입력에 적용되지 않음)
+# - 범주형: 범주 목록을 처음 본 순서대로 뒤에 추가 (기존 범주의 위치/계수는 그대로)
+#   모델 입력 크기가 바뀌지 않도록 컬럼마다 category_slots개 자리를 미리 잡아둠 (넘치는 범주는 처음 보는 범주처럼 0)
+# - 모델: SGDClassifier(log_loss) -- 로지스틱 회귀를 partial_fit으로 학습
+#   class_weight='balanced'는 partial_fit에서 쓸 수 없어서 지금까지 본 라벨 비율로 sample_weight 계산
+# - 학습한 파일은 내용 해시로 기록 -> 같은 날 로그를 다시 넣으면 건너뜀
+#   파일 안에서는 청크마다 몇 행까지 학습했는지 기록 -> 중간에 멈췄다가 다시 실행하면 남은 행부터 이어서 학습
+# - python weblog_incremental.py day1.csv day2.csv ... : 상태(state_path) 불러와서 새 파일만 학습 후 LogScorer로 저장
+
+state_path = 'weblog_incremental.pkl' # 증분 학습 상태 저장 경로
+category_slots = 32 # 범주형 컬럼별로 잡아둘 범주 자리 수
+epochs = 3 # 청크 1개를 몇 번 반복해서 학습할지
+chunk_size = 500_000 # 파일을 나눠 읽을 행 수
+
+
+class IncrementalLogModel:
+    def __init__(self, alpha=1e-4, category_slots=category_slots, epochs=epochs, seed=42):
+        self.category_slots = category_slots
+        self.epochs = epochs
+        self.rng = np.random.default_rng(seed)
+        self.scaler = StandardScaler()
+        self.vocab = {col: {} for col in cat_cols} # 범주값 -> 자리 번호 (추가만 함, 추가된 순서 = 자리 번호)
+        self.class_counts = np.zeros(2)
+        # average=True: 가중치 평균(ASGD) -- 청크마다 계수가 크게 흔들리지 않도록
+        self.clf = SGDClassifier(loss='log_loss', alpha=alpha, learning_rate='optimal', average=True, random_state=seed)
+        self.trained_files = {} # 내용 해시 -> 파일 경로
+        self.file_progress = {} # 학습 중인 파일의 내용 해시 -> 학습을 마친 행 수 (청크 단위)
+        self.rows = 0
+
+    def _encode(self, df):
+        # 수치형 표준화 + 범주형 원-핫(희소 행렬, 범주 자리 수 고정)
+        X_num = self.scaler.transform(df[num_cols].to_numpy(dtype=np.float64))
+        blocks = [sparse.csr_matrix(X_num)]
+        for col in cat_cols:
+            codes = pd.Index(list(self.vocab[col])).get_indexer(df[col]) # 범주 자리 번호 = 추가된 순서
+            known = codes >= 0
+            blocks.append(sparse.csr_matrix((np.ones(known.sum()), (np.flatnonzero(known), codes[known])),
+                                            shape=(len(df), self.category_slots)))
+        return sparse.hstack(blocks, format='csr')
+
+    def _grow_vocab(self, df):
+        for col in cat_cols:
+            vocab = self.vocab[col]
+            for value in df[col].unique():
+                if value in vocab:
+                    continue
+                if len(vocab) >= self.category_slots:
+                    print(f'[warning] {col} 범주 자리 부족 ({self.category_slots}개): {value!r}는 처음 보는 범주로 처리')
+                    continue
+                vocab[value] = len(vocab)
+
+    def partial_fit(self, df):
+        """
+        새 로그 청크(원본 컬럼 + label)로 모델 갱신 -- 비용은 청크 크기에만 비례
+        1) 표준화 통계 / 범주 목록 / 라벨 비율 누적 (표준화 통계가 바뀐 만큼 기존 계수 보정)
+        2) 청크를 섞어서 epochs번 SGD 학습
+        """
+        df = add_features(df.dropna(subset=raw_columns + ['label']))
+        if df.empty:
+            return self
+        y = df['label'].to_numpy(dtype=np.int64)
+        if hasattr(self.scaler, 'mean_'):
+            mean, scale = self.scaler.mean_.copy(), self.scaler.scale_.copy()
+            self.scaler.partial_fit(df[num_cols].to_numpy(dtype=np.float64))
+            self._rescale(mean, scale)
+        else:
+            self.scaler.partial_fit(df[num_cols].to_numpy(dtype=np.float64))
+        self._grow_vocab(df)
+        self.class_counts += np.bincount(y, minlength=2)
+        # balanced: n / (클래스 수 x 클래스별 개수)
+        weights = self.class_counts.sum() / (2 * np.maximum(self.class_counts, 1))
+
+        X = self._encode(df)
+        for _ in range(self.epochs):
+            order = self.rng.permutation(len(y))
+            self.clf.partial_fit(X[order], y[order], classes=np.array([0, 1]), sample_weight=weights[y[order]])
+        self.rows += len(y)
+        return self
+
+    def _rescale(self, mean, scale):
+        # 표준화 통계가 (mean, scale) -> (mean_, scale_)로 바뀌었을 때 수치형 계수/절편 보정
+        # w (x - m) / s + b == (w s' / s) (x - m') / s' + b + w (m' - m) / s
+        # partial_fit이 이어서 쓰는 계수(_standard_*)와 평균 계수(_average_*, coef_/intercept_가 가리킴)를 모두 옮김
+        if not hasattr(self.clf, 'coef_'):
+            return
+        n = len(num_cols)
+        shift = (self.scaler.mean_ - mean) / scale
+        ratio = self.scaler.scale_ / scale
+        params = [(self.clf._standard_coef, self.clf._standard_intercept)]
+        if self.clf.average:
+            params.append((self.clf._average_coef, self.clf._average_intercept))
+        for coef, intercept in params:
+            coef = coef.reshape(-1) # 같은 메모리를 보는 1차원 배열
+            intercept += coef[:n] @ shift
+            coef[:n] *= ratio
+
+    def fit_file(self, path, chunksize=chunk_size, save_path=None):
+        # 로그 파일 하나를 청크로 나눠서 학습 (이미 학습한 파일이면 건너뜀), 학습한 행 수 반환
+        # 중간에 멈춘 파일이면 기록된 행 수만큼 건너뛰고 이어서 학습 (save_path를 주면 청크마다 상태 저장)
+        key = fingerprint(path)['hash']
+        if key in self.trained_files:
+            print(f'[info] 이미 학습한 파일: {path}')
+            return 0
+        done = self.file_progress.get(key, 0)
+        if done:
+            print(f'[info] {path}: {done}행까지 학습한 상태에서 이어서 학습')
+        rows = self.rows
+        position = 0
+        for chunk in read_csv_chunks(path, chunksize, usecols=raw_columns + ['label']):
+            start, position = position, position + len(chunk)
+            if position <= done:
+                continue
+            self.partial_fit(chunk.iloc[max(done - start, 0):]) # chunksize가 바뀌었어도 남은 행부터
+            self.file_progress[key] = position
+            if save_path:
+                self.save(save_path)
+        self.file_progress.pop(key, None)
+        self.trained_files[key] = path
+        return self.rows - rows
+
+    def to_scorer(self, threshold=0.5):
+        # weblog_scoring.LogScorer로 변환 (스트리밍 스코어링에 그대로 사용)
+        coef = self.clf.coef_[0]
+        categories = {}
+        cat_coef = {}
+        start = len(num_cols)
+        for col in cat_cols:
+            values = list(self.vocab[col])
+            categories[col] = values
+            cat_coef[col] = coef[start:start + len(values)]
+            start += self.category_slots
+        return LogScorer(self.scaler.mean_, self.scaler.scale_, coef[:len(num_cols)],
+                         categories, cat_coef, self.clf.intercept_[0], threshold)
+
+    def predict_proba(self, df):
+        return self.to_scorer().predict_proba(df)
+
+    def save(self, path=state_path):
+        # 다음 날 이어서 학습할 수 있게 상태 전체 저장 (임시 파일 후 교체)
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(self.__dict__, f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path=state_path):
+        model = cls.__new__(cls)
+        with open(path, 'rb') as f:
+            model.__dict__.update(pickle.load(f))
+        model.__dict__.setdefault('file_progress', {}) # file_progress가 없던 때 저장한 상태
+        return model
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='웹 로그 이상 탐지 모델 증분 학습')
+    parser.add_argument('paths', nargs='+', help='새로 추가된 로그 CSV (날짜 순서대로)')
+    parser.add_argument('--state', default=state_path, help='증분 학습 상태 파일 (없으면 새로 시작)')
+    parser.add_argument('--model', default=model_path, help='스코어링용 모델 저장 경로 (weblog_scoring.py에서 사용)')
+    parser.add_argument('--chunksize', type=int, default=chunk_size)
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    model = IncrementalLogModel.load(args.state) if os.path.exists(args.state) else IncrementalLogModel()
+    for path in args.paths:
+        started = time.perf_counter()
+        rows = model.fit_file(path, args.chunksize, save_path=args.state)
+        if rows:
+            print(f'[info] {path}: {rows}행 학습, {time.perf_counter() - started:.2f}초 (누적 {model.rows}행)')
+    model.save(args.state)
+    model.to_scorer().save(args.model)
+    print(f'[info] 상태 저장: {args.state}, 스코어링 모델 저장: {args.model}')
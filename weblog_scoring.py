@@ -0,0 +1,293 @@
+import io
+import csv
+import sys
+import time
+import pickle
+import argparse
+import threading
+from collections import deque
+import numpy as np
+import pandas as pd
+from pandas.tseries.api import guess_datetime_format
+
+# 웹 로그 이상 탐지 모델 실시간 스코어링 (머신러닝&딥러닝 PBL4 노트북에서 학습한 Pipeline 사용)
+# - LogScorer.from_pipeline(model).save(model_path): 학습한 Pipeline에서 필요한 값만 뽑아서 저장
+#   (StandardScaler 평균/표준편차, OneHotEncoder 범주 목록, LogisticRegression 계수)
+# - 스코어링은 sklearn 없이 numpy 연산만 사용: 수치형 (x - mean) / scale @ 계수 + 범주별 계수 조회
+# - 로그 줄을 스트림으로 읽어서 batch_size줄씩(또는 max_delay초마다) 묶어서 한 번에 처리
+# - tail -n +1 -f access_log.csv | python weblog_scoring.py : 실시간 로그 스코어링 (첫 줄은 CSV 헤더)
+
+model_path = 'weblog_scorer.pkl' # 스코어링용 모델 파일
+batch_size = 1000 # 한 번에 처리할 로그 줄 수
+max_delay = 1.0 # 배치 첫 줄이 들어온 뒤 이 시간(초)이 지나면 줄이 덜 모여도 처리 (새 줄이 안 들어와도)
+report_every = 100 # 이 배치 수마다 처리 속도 출력
+
+raw_columns = ['timestamp', 'method', 'status_code', 'size'] # 로그에서 읽는 컬럼
+num_cols = ['hour', 'status_code', 'log_size', 'is_error'] # 학습 시 수치형 컬럼 (순서 유지)
+cat_cols = ['method'] # 학습 시 범주형 컬럼
+
+
+def feature_columns(df):
+    # 파생변수 계산 (컬럼명 -> numpy 배열, 행 단위 apply 없이 컬럼 단위 연산)
+    timestamp = pd.to_datetime(df['timestamp'])
+    status_code = df['status_code'].to_numpy()
+    return {
+        'timestamp': timestamp,
+        'hour': timestamp.dt.hour.to_numpy(), # 다 같은 날이기 때문에 시간 정보만 추출
+        'is_error': (status_code >= 400).astype(np.int64), # status_code 400 이상이면 에러
+        'log_size': np.log1p(df['size'].to_numpy(dtype=np.float64)), # log(1 + size)
+    }
+
+
+def add_features(df):
+    # 학습용: 원본 DataFrame에 파생변수 컬럼 추가 (복사본 반환)
+    return df.assign(**feature_columns(df))
+
+
+def feature_matrix(df):
+    # 스코어링용: num_cols 순서의 수치형 행렬 (파생변수 컬럼이 없으면 원본 컬럼에서 바로 계산, DataFrame 복사 없음)
+    derived = feature_columns(df) if any(c not in df for c in num_cols) else {}
+    X = np.empty((len(df), len(num_cols)))
+    for i, col in enumerate(num_cols):
+        X[:, i] = derived[col] if col in derived else df[col].to_numpy(dtype=np.float64)
+    return X
+
+
+class LogScorer:
+    """
+    학습한 Pipeline(StandardScaler + OneHotEncoder -> LogisticRegression)과 같은 결과를 numpy로 계산
+    - 원-핫 행렬을 만들지 않고 범주값 -> 계수를 바로 조회 (처음 보는 범주는 0, handle_unknown='ignore'와 동일)
+    """
+    def __init__(self, mean, scale, num_coef, categories, cat_coef, intercept, threshold=0.5):
+        self.mean = np.asarray(mean, dtype=np.float64)
+        self.scale = np.asarray(scale, dtype=np.float64)
+        self.num_coef = np.asarray(num_coef, dtype=np.float64)
+        # 범주형 컬럼별 (범주 목록, 계수) -- 계수 끝에 0을 붙여서 code -1(처음 보는 범주)이 0을 가리키게
+        self.categories = {col: pd.Index(cats) for col, cats in categories.items()}
+        self.cat_coef = {col: np.append(np.asarray(coef, dtype=np.float64), 0.0) for col, coef in cat_coef.items()}
+        self.intercept = float(intercept)
+        self.threshold = threshold # 이상(label=1)으로 판단할 확률 기준
+
+    @classmethod
+    def from_pipeline(cls, model, threshold=0.5):
+        preprocess = model.named_steps['preprocess']
+        scaler = preprocess.named_transformers_['num']
+        encoder = preprocess.named_transformers_['cat']
+        clf = model.named_steps['clf']
+        columns = dict((name, list(cols)) for name, _, cols in preprocess.transformers_ if name in ('num', 'cat'))
+        if columns['num'] != num_cols or columns['cat'] != cat_cols:
+            raise ValueError(f'학습 컬럼이 다릅니다: {columns}')
+
+        coef = clf.coef_[0]
+        cat_coef = {}
+        start = len(num_cols)
+        for col, cats in zip(cat_cols, encoder.categories_):
+            cat_coef[col] = coef[start:start + len(cats)]
+            start += len(cats)
+        return cls(scaler.mean_, scaler.scale_, coef[:len(num_cols)],
+                   dict(zip(cat_cols, encoder.categories_)), cat_coef, clf.intercept_[0], threshold)
+
+    def decision_function(self, df):
+        # df: 원본 로그 컬럼(raw_columns) 또는 add_features를 거친 DataFrame
+        z = ((feature_matrix(df) - self.mean) / self.scale) @ self.num_coef + self.intercept
+        for col in cat_cols:
+            z += self.cat_coef[col][self.categories[col].get_indexer(df[col])]
+        return z
+
+    def predict_proba(self, df):
+        # label=1(이상) 확률
+        return 1.0 / (1.0 + np.exp(-self.decision_function(df)))
+
+    def predict(self, df):
+        return (self.predict_proba(df) >= self.threshold).astype(np.int64)
+
+    def save(self, path=model_path):
+        # 클래스가 아니라 파라미터(dict)만 저장 (sklearn 버전과 무관하게 로드 가능)
+        with open(path, 'wb') as f:
+            pickle.dump(self.__dict__, f)
+
+    @classmethod
+    def load(cls, path=model_path):
+        scorer = cls.__new__(cls)
+        with open(path, 'rb') as f:
+            scorer.__dict__.update(pickle.load(f))
+        return scorer
+
+
+class StreamStats:
+    # 배치별 처리 시간 누적 -> 처리량(rows/sec)과 배치 지연 p50/p99
+    def __init__(self):
+        self.rows = 0
+        self.skipped = 0 # 파싱 실패 / 필수값 결측으로 버린 줄
+        self.latencies = []
+        self.busy_time = 0.0
+
+    def add(self, rows, latency, skipped=0):
+        self.rows += rows
+        self.skipped += skipped
+        self.latencies.append(latency)
+        self.busy_time += latency
+
+    def summary(self):
+        latencies = np.array(self.latencies) if self.latencies else np.zeros(1)
+        return {
+            'rows': self.rows,
+            'skipped': self.skipped,
+            'batches': len(self.latencies),
+            'rows_per_sec': self.rows / self.busy_time if self.busy_time else 0.0, # 스코어링에 쓴 시간 기준
+            'p50_ms': np.percentile(latencies, 50) * 1000,
+            'p99_ms': np.percentile(latencies, 99) * 1000,
+            'max_ms': latencies.max() * 1000,
+        }
+
+    def report(self, file=sys.stdout):
+        s = self.summary()
+        print(f"[info] {s['rows']}행 / {s['batches']}배치 (버린 줄 {s['skipped']}): {s['rows_per_sec']:,.0f} rows/sec, "
+              f"배치 지연 p50 {s['p50_ms']:.2f}ms, p99 {s['p99_ms']:.2f}ms, max {s['max_ms']:.2f}ms", file=file)
+
+
+def score_lines(lines, header, scorer, timestamp_format=None):
+    # CSV 로그 줄 묶음 -> (원본 컬럼 + score / pred DataFrame, 버린 줄 수)
+    try:
+        df = pd.read_csv(io.StringIO(''.join(lines)), header=None, names=header, usecols=raw_columns,
+                         on_bad_lines='skip')
+    except pd.errors.ParserError:
+        # 배치 전체가 컬럼 수가 맞지 않는 줄
+        return pd.DataFrame(columns=raw_columns + ['score', 'pred']), len(lines)
+    # 형식이 맞지 않는 값 -> NaN/NaT -> 버림
+    df['timestamp'] = pd.to_datetime(df['timestamp'], format=timestamp_format, errors='coerce')
+    for col in ('status_code', 'size'):
+        if not pd.api.types.is_numeric_dtype(df[col]):
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+    if df.isna().to_numpy().any():
+        df = df.dropna()
+    score = scorer.predict_proba(df)
+    df = df.assign(score=score, pred=(score >= scorer.threshold).astype(np.int64))
+    return df, len(lines) - len(df)
+
+
+class LineFeed:
+    """
+    리더 스레드가 입력 줄을 읽어서 쌓아두는 버퍼 -- 스코어링 쪽은 새 줄을 기다리면서도 배치 마감 시각을 지킬 수 있음
+    - deque append/popleft는 락 없이 스레드 안전 (줄마다 Queue 락을 잡으면 처리량이 1/3 정도 줄어듦)
+    - 이벤트는 기다리는 쪽이 있을 때만 set
+    - 쌓인 줄이 max_pending개가 되면 리더가 대기 (메모리 제한)
+    """
+    def __init__(self, lines, max_pending):
+        self.lines = deque()
+        self.max_pending = max_pending
+        self.arrived = threading.Event() # 새 줄이 들어옴 / 입력 끝
+        self.drained = threading.Event() # 쌓인 줄을 가져감
+        self.done = False
+        self.error = None # 리더 스레드에서 난 예외 (스코어링 쪽에서 다시 발생)
+        threading.Thread(target=self._read, args=(lines,), daemon=True).start()
+
+    def _read(self, lines):
+        try:
+            for line in lines:
+                self.lines.append(line)
+                if not self.arrived.is_set():
+                    self.arrived.set()
+                if len(self.lines) >= self.max_pending:
+                    self.drained.clear()
+                    if len(self.lines) >= self.max_pending: # clear 전에 가져갔으면 대기하지 않음
+                        self.drained.wait()
+        except BaseException as e:
+            self.error = e
+        finally:
+            self.done = True
+            self.arrived.set()
+
+    def wait(self, timeout=None):
+        # 새 줄이 들어오거나 입력이 끝날 때까지 최대 timeout초 대기, 읽을 줄이 있으면 True
+        self.arrived.clear()
+        if not self.lines and not self.done: # clear 전에 들어온 줄이 있으면 대기하지 않음
+            self.arrived.wait(timeout)
+        return bool(self.lines)
+
+
+def score_stream(lines, scorer, stats=None, batch_size=batch_size, max_delay=max_delay, report_every=report_every):
+    """
+    로그 줄 스트림(파일 / sys.stdin)을 배치로 묶어서 스코어링, 배치마다 결과 DataFrame을 yield
+    - 첫 줄은 CSV 헤더
+    - 줄은 리더 스레드(LineFeed)가 읽음 -> 입력이 멈춰도 배치 첫 줄부터 max_delay초가 지나면 바로 처리
+    - timestamp 형식은 첫 줄에서 한 번만 추정 (배치마다 형식 추정하지 않음)
+    - stats(StreamStats)에 배치별 처리 시간 누적, report_every 배치마다 출력
+    """
+    stats = stats or StreamStats()
+    lines = iter(lines)
+    header = next(lines).strip().split(',')
+    feed = LineFeed(lines, batch_size * 4) # 스코어링이 밀리면 리더도 대기
+    pending = feed.lines
+    buffer = []
+    first_at = None
+    timestamp_format = None
+
+    def flush():
+        nonlocal timestamp_format
+        started = time.perf_counter()
+        if timestamp_format is None:
+            fields = next(csv.reader(buffer[:1]))
+            if len(fields) == len(header):
+                timestamp_format = guess_datetime_format(fields[header.index('timestamp')])
+        scored, skipped = score_lines(buffer, header, scorer, timestamp_format)
+        stats.add(len(scored), time.perf_counter() - started, skipped)
+        if report_every and len(stats.latencies) % report_every == 0:
+            stats.report(file=sys.stderr)
+        buffer.clear()
+        return scored
+
+    while True:
+        while pending:
+            line = pending.popleft()
+            if not line.strip():
+                continue
+            if not buffer:
+                first_at = time.monotonic()
+            buffer.append(line)
+            if len(buffer) >= batch_size or time.monotonic() - first_at >= max_delay:
+                feed.drained.set()
+                yield flush()
+        feed.drained.set()
+        if feed.done and not pending:
+            break
+        # 버퍼가 비어 있으면 다음 줄까지 계속 대기, 아니면 배치 마감 시각까지만 대기 -> 새 줄이 없으면 처리
+        if not feed.wait(max(0.0, first_at + max_delay - time.monotonic()) if buffer else None) and buffer:
+            yield flush()
+    if buffer:
+        yield flush()
+    if feed.error is not None:
+        raise feed.error
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='웹 로그 이상 탐지 스트리밍 스코어링')
+    parser.add_argument('--model', default=model_path, help='LogScorer.save로 저장한 모델 파일')
+    parser.add_argument('--input', default='-', help="로그 CSV 경로 ('-'면 표준 입력)")
+    parser.add_argument('--output', default=None, help='스코어 결과 CSV 경로 (없으면 이상으로 판단한 줄만 표준 출력)')
+    parser.add_argument('--batch-size', type=int, default=batch_size)
+    parser.add_argument('--max-delay', type=float, default=max_delay)
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    scorer = LogScorer.load(args.model)
+    stats = StreamStats()
+    source = sys.stdin if args.input == '-' else open(args.input, 'r', encoding='utf-8')
+    output = open(args.output, 'w', encoding='utf-8', newline='') if args.output else None
+    try:
+        for i, scored in enumerate(score_stream(source, scorer, stats, args.batch_size, args.max_delay)):
+            if output:
+                scored.to_csv(output, index=False, header=(i == 0))
+            else:
+                scored[scored['pred'] == 1].to_csv(sys.stdout, index=False, header=False)
+                sys.stdout.flush()
+    except (KeyboardInterrupt, BrokenPipeError):
+        pass
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if output:
+            output.close()
+        stats.report(file=sys.stderr)
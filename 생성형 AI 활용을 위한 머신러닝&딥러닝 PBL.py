@@ -1,73 +1,214 @@
+import pickle
+import argparse
+import numpy as np
 import pandas as pd
-from sklearn.preprocessing import MinMaxScaler
-pd.set_option('future.no_silent_downcasting', True) # 경고문 제거용
-
-df = pd.read_csv("diabetes.csv")
-
-print('------- Info -------')
-print(df.info(),'\n\n')
-print('------- Head -------')
-print(df.head(),'\n\n')
-print('------- Before change 0 to NaN -------')
-print(df.isnull().sum(),'\n\n')
-
-# 결측치 처리
-print('------- Missing Value Handling ------- \n')
-# 0을 결측치로 간주 0 -> Nan
-zero_to_nan = ['Glucose', 'BloodPressure', 'SkinThickness', 'Insulin', 'BMI'] # 0을 결측치로 바꿀 컬럼명 리스트
-df[zero_to_nan] = df[zero_to_nan].replace(0, pd.NA)
-
-# 결측치 확인
-print('------- Change 0 to NaN -------')
-print(df.isnull().sum(),'\n\n')
-
-# 결측치 -> 평균값 대체
-for nan in zero_to_nan:
-    df[nan] = df[nan].fillna(df[nan].mean())
-print('------- After fill NaN with mean -------')
-print(df.isnull().sum(),'\n\n')
-
-# 이상치 처리
-print('------- Outlier Handling -------')
-
-# 이상치 컬럼명 리스트
-over_data = ['SkinThickness', 'Insulin']
-
-over_scores = {}
-# 이상치(상위 1%) 갯수 확인
-for over in over_data:
-    over_score = df[over].quantile(0.99) # 상위 1% 기준값
-    over_scores[over] = over_score
-
-    over_mask = df[over] >= over_score
-    print(f'{over} 이상치 갯수: {over_mask.sum()}')
-
-# 이상치(상위 1%) -> 평균값 대체
-for over in over_data:
-    over_score = over_scores[over] # 상위 1% 기준값
-    df.loc[df[over] >= over_score, over] = pd.NA # 이상치를 결측치로 변경 -- 이상치를 포함해서 평균을 내면 이상치의 영향이 남아있을 수 있기 때문
-    df[over] = df[over].fillna(df[over].mean()) # 결측치(이상치) -> 평균값 대체
-
-# 이상치 갯수 재확인
-print('\n------- After Outlier Handling -------')
-for over in over_data:
-    over_score = over_scores[over] # 기존에 측정한 상위 1% 기준값
-    over_mask = df[over] >= over_score
-    print(f'{over} 이상치 갯수: {over_mask.sum()}')
-
-# 정규화
-print('\n------- Normalization -------')
-scaler = MinMaxScaler()
-df['Age'] = scaler.fit_transform(df[['Age']])
-print('------- Finish Normalization -------\n\n')
-
-# EDA
-print('------- EDA -------\n')
-print('------- Null Count After Preprocessing -------')
-print(df.isnull().sum(),'\n\n')
-# Outcome별 Glucose 평균
-print('------- Outcome별 Glucose 평균 -------')
-print(df.groupby('Outcome')['Glucose'].mean(),'\n\n')
-# 데이터프레임 상위 5개 행 출력
-print('------- DataFrame Head -------')
-print(df.head(),'\n\n')
\ No newline at end of file
+from chunked_stats import ChunkedStats, read_csv_chunks, write_csv_chunks
+from dataset_cache import load_csv
+
+data_path = "diabetes.csv"
+preprocessor_path = "diabetes_preprocessor.pkl" # fit한 전처리 파라미터 저장 경로 (새 데이터에 재사용)
+output_path = "diabetes_preprocessed.csv" # 청크 모드 결과 저장 경로
+
+
+class DiabetesPreprocessor:
+    """
+    당뇨 데이터 전처리 파이프라인 (fit -> transform)
+    1) zero_to_nan 컬럼의 0 -> NaN
+    2) 결측치 -> 평균값 대체
+    3) over_data 컬럼의 상위 1% 이상치 -> 이상치를 뺀 평균값 대체
+    4) scale_columns MinMax 정규화
+    - 통계값은 컬럼별 반복문 없이 numpy 배열 연산 한 번으로 계산, 모든 값은 float64 유지
+    - fit한 파라미터는 pickle로 저장해서 새 배치에 다시 fit 없이 적용
+    """
+    def __init__(self,
+                 zero_to_nan=('Glucose', 'BloodPressure', 'SkinThickness', 'Insulin', 'BMI'),
+                 over_data=('SkinThickness', 'Insulin'),
+                 over_quantile=0.99,
+                 scale_columns=('Age',)):
+        self.zero_to_nan = list(zero_to_nan) # 0을 결측치로 볼 컬럼
+        self.over_data = list(over_data) # 이상치 처리할 컬럼
+        self.over_quantile = over_quantile # 이상치 기준 분위수 (상위 1%)
+        self.scale_columns = list(scale_columns) # 정규화할 컬럼
+
+    def fit(self, df):
+        # 1) 0 -> NaN 후 평균 (NaN 제외)
+        values = df[self.zero_to_nan].to_numpy(dtype=np.float64)
+        values[values == 0] = np.nan
+        self.fill_values_ = pd.Series(np.nanmean(values, axis=0), index=self.zero_to_nan)
+        df = self.fill_missing(df)
+
+        # 2) 결측치를 채운 값 기준으로 이상치 기준값(분위수) 계산
+        over = df[self.over_data].to_numpy(dtype=np.float64)
+        self.over_scores_ = pd.Series(np.quantile(over, self.over_quantile, axis=0), index=self.over_data)
+
+        # 3) 이상치를 뺀 평균 -- 이상치를 포함해서 평균을 내면 이상치의 영향이 남아있을 수 있기 때문
+        over[over >= self.over_scores_.to_numpy()] = np.nan
+        self.over_fill_values_ = pd.Series(np.nanmean(over, axis=0), index=self.over_data)
+        self._replace_outliers(df)
+
+        # 4) MinMax 정규화 범위 (결측치/이상치 처리 후 값 기준)
+        scale = df[self.scale_columns].to_numpy(dtype=np.float64)
+        self.scale_min_ = pd.Series(np.nanmin(scale, axis=0), index=self.scale_columns)
+        self.scale_max_ = pd.Series(np.nanmax(scale, axis=0), index=self.scale_columns)
+        return self
+
+    def transform(self, df):
+        # 원본은 그대로 두고 복사본에 적용 (처리한 컬럼은 float64)
+        df = self.fill_missing(df)
+        self._replace_outliers(df)
+
+        scale = df[self.scale_columns].to_numpy(dtype=np.float64)
+        value_range = (self.scale_max_ - self.scale_min_).to_numpy()
+        value_range = np.where(value_range == 0, 1.0, value_range) # 값이 하나뿐인 컬럼은 0으로
+        df[self.scale_columns] = (scale - self.scale_min_.to_numpy()) / value_range
+        return df
+
+    def fit_chunks(self, chunks, **stats_kwargs):
+        """
+        메모리에 안 들어가는 데이터용 fit (청크를 한 번만 읽음), 사용한 ChunkedStats 반환
+        - 평균(결측치 대체값), 정규화 min/max: 전체 데이터 기준 정확한 값
+        - 이상치 기준값/대체값: 균등 표본(reservoir) 기준 근사 (데이터가 표본 크기 이하이면 fit과 동일)
+        """
+        stats = ChunkedStats(**stats_kwargs)
+        for chunk in chunks:
+            chunk = chunk.copy()
+            chunk[self.zero_to_nan] = chunk[self.zero_to_nan].astype(np.float64).replace(0, np.nan)
+            stats.update(chunk)
+
+        self.fill_values_ = stats.mean()[self.zero_to_nan]
+        sample = self.fill_missing(stats.sample)
+        over = sample[self.over_data].to_numpy(dtype=np.float64)
+        self.over_scores_ = pd.Series(np.quantile(over, self.over_quantile, axis=0), index=self.over_data)
+        over[over >= self.over_scores_.to_numpy()] = np.nan
+        self.over_fill_values_ = pd.Series(np.nanmean(over, axis=0), index=self.over_data)
+        self._replace_outliers(sample)
+
+        # 결측치/이상치 처리 대상이 아닌 컬럼은 전체 min/max, 처리 대상이면 처리한 표본 기준
+        processed = set(self.zero_to_nan) | set(self.over_data)
+        self.scale_min_ = pd.Series({c: sample[c].min() if c in processed else stats.min()[c] for c in self.scale_columns})
+        self.scale_max_ = pd.Series({c: sample[c].max() if c in processed else stats.max()[c] for c in self.scale_columns})
+        return stats
+
+    def fit_transform(self, df):
+        return self.fit(df).transform(df)
+
+    def fill_missing(self, df):
+        # 0 / NaN -> fit에서 구한 평균 (복사본 반환)
+        df = df.copy()
+        values = df[self.zero_to_nan].to_numpy(dtype=np.float64)
+        missing = np.isnan(values) | (values == 0)
+        df[self.zero_to_nan] = np.where(missing, self.fill_values_.to_numpy(), values)
+        return df
+
+    def _replace_outliers(self, df):
+        # 이상치(기준값 이상) -> 이상치를 뺀 평균 (df를 직접 수정)
+        over = df[self.over_data].to_numpy(dtype=np.float64)
+        df[self.over_data] = np.where(over >= self.over_scores_.to_numpy(), self.over_fill_values_.to_numpy(), over)
+
+    def save(self, path):
+        # 클래스가 아니라 파라미터(dict)만 저장 -> 스크립트로 실행(__main__)했을 때 저장한 것도 어디서든 로드 가능
+        with open(path, 'wb') as f:
+            pickle.dump(self.__dict__, f)
+
+    @classmethod
+    def load(cls, path):
+        preprocessor = cls.__new__(cls)
+        with open(path, 'rb') as f:
+            preprocessor.__dict__.update(pickle.load(f))
+        return preprocessor
+
+
+def run_chunked(chunksize):
+    # 1차: 통계 + fit, 2차: 변환하면서 청크 단위로 저장 -> 메모리는 청크 크기로 제한
+    preprocessor = DiabetesPreprocessor()
+    stats = preprocessor.fit_chunks(read_csv_chunks(data_path, chunksize))
+    print(f'------- Chunked Statistics ({stats.rows} rows, 중복 {stats.duplicates}행) -------')
+    print(stats.summary()[['missing', 'missing_ratio', 'mean', 'min', 'max']],'\n\n')
+    print('------- Outlier Threshold -------')
+    print(preprocessor.over_scores_,'\n\n')
+
+    # Outcome별 Glucose 평균도 청크별 합계/개수를 누적해서 계산
+    glucose_sum = pd.Series(dtype=np.float64)
+    glucose_count = pd.Series(dtype=np.float64)
+
+    def transformed_chunks():
+        nonlocal glucose_sum, glucose_count
+        for chunk in read_csv_chunks(data_path, chunksize):
+            chunk = preprocessor.transform(chunk)
+            grouped = chunk.groupby('Outcome')['Glucose']
+            glucose_sum = glucose_sum.add(grouped.sum(), fill_value=0)
+            glucose_count = glucose_count.add(grouped.count(), fill_value=0)
+            yield chunk
+
+    rows = write_csv_chunks(transformed_chunks(), output_path)
+    preprocessor.save(preprocessor_path)
+    print(f'[info] {rows}행 전처리 후 저장: {output_path}, 전처리 파라미터: {preprocessor_path}\n\n')
+
+    print('------- Outcome별 Glucose 평균 -------')
+    print(glucose_sum / glucose_count,'\n\n')
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='당뇨 데이터 전처리')
+    parser.add_argument('--chunksize', type=int, default=None, help='청크 모드: 한 번에 읽을 행 수 (큰 파일용)')
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.chunksize:
+        run_chunked(args.chunksize)
+        raise SystemExit(0)
+
+    df = load_csv(data_path) # 두 번째 실행부터는 컬럼형 캐시에서 로드
+
+    print('------- Info -------')
+    print(df.info(),'\n\n')
+    print('------- Head -------')
+    print(df.head(),'\n\n')
+    print('------- Before change 0 to NaN -------')
+    print(df.isnull().sum(),'\n\n')
+
+    preprocessor = DiabetesPreprocessor()
+    preprocessor.fit(df)
+
+    # 결측치 처리
+    print('------- Missing Value Handling ------- \n')
+    # 0을 결측치로 간주 0 -> Nan (결측치 확인)
+    print('------- Change 0 to NaN -------')
+    print(df[preprocessor.zero_to_nan].eq(0).sum() + df[preprocessor.zero_to_nan].isnull().sum(),'\n\n')
+    print('------- Fill NaN with mean -------')
+    print(preprocessor.fill_values_,'\n\n')
+
+    # 이상치 처리
+    print('------- Outlier Handling -------')
+    # 이상치(상위 1%) 갯수 확인 -- 결측치를 평균으로 채운 값 기준
+    filled = preprocessor.fill_missing(df)
+    for over, over_score in preprocessor.over_scores_.items():
+        print(f'{over} 이상치 갯수: {(filled[over] >= over_score).sum()}')
+
+    # 결측치/이상치 대체 + 정규화
+    df = preprocessor.transform(df)
+
+    # 이상치 갯수 재확인
+    print('\n------- After Outlier Handling -------')
+    for over, over_score in preprocessor.over_scores_.items():
+        print(f'{over} 이상치 갯수: {(df[over] >= over_score).sum()}')
+
+    print('\n------- Normalization -------')
+    print('------- Finish Normalization -------\n\n')
+
+    # 전처리 파라미터 저장 -> DiabetesPreprocessor.load(preprocessor_path).transform(new_df)
+    preprocessor.save(preprocessor_path)
+    print(f'[info] 전처리 파라미터 저장: {preprocessor_path}\n\n')
+
+    # EDA
+    print('------- EDA -------\n')
+    print('------- Null Count After Preprocessing -------')
+    print(df.isnull().sum(),'\n\n')
+    # Outcome별 Glucose 평균
+    print('------- Outcome별 Glucose 평균 -------')
+    print(df.groupby('Outcome')['Glucose'].mean(),'\n\n')
+    # 데이터프레임 상위 5개 행 출력
+    print('------- DataFrame Head -------')
+    print(df.head(),'\n\n')
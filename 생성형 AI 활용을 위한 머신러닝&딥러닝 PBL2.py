@@ -1,8 +1,22 @@
+import os
+import time
+import argparse
+import tracemalloc
 import pandas as pd
 import numpy as np
+from scipy import sparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from chunked_stats import ChunkedStats, read_csv_chunks, write_csv_chunks
+from dataset_cache import load_csv, fingerprint, cache_dir
 
-from sklearn.model_selection import train_test_split
+from sklearn.model_selection import train_test_split, KFold, ParameterGrid
 from sklearn.tree import DecisionTreeRegressor
+from sklearn.ensemble import RandomForestRegressor, ExtraTreesRegressor, GradientBoostingRegressor, HistGradientBoostingRegressor
+from sklearn.linear_model import Ridge
+from sklearn.compose import ColumnTransformer
+from sklearn.pipeline import Pipeline
+from sklearn.impute import SimpleImputer
+from sklearn.preprocessing import OneHotEncoder, OrdinalEncoder
 from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
 
 def print_data_info(df):
@@ -11,78 +25,376 @@ def print_data_info(df):
     print('------------- House Data Head ----------------')
     print(df.head(),"\n\n")
 
-house_data = pd.read_csv('20260112_153749_train.csv') # 주택 가격 데이터셋 로드
-
-print('------------- Before Preprocessing ----------------')
-print_data_info(house_data)
-
-# 결측치 확인 & 비율 출력
-print('------------- Missing Values & Missing Ratio ----------------')
-for i, j in enumerate(house_data.isnull().sum()):
-    if j > 0:
-        print(f'Column: {house_data.columns[i]}, Missing Values: {j}')
-print()
-missing_ratio = house_data.isna().mean().sort_values(ascending=False)
-print(missing_ratio.head(20), '\n\n')
-
-# 불필요한 열 제거 & 결측치 50% 이상인 열 제거
-house_data = house_data.drop(columns=['Id'], axis=1)
-
-threshold = 0.5  # 50% 이상이면 drop
-drop_cols = missing_ratio[missing_ratio >= threshold].index.tolist()
-drop_cols = [c for c in drop_cols]
-house_data = house_data.drop(columns=drop_cols)
-
-
-# 결측치 처리 (수치형: mean, 범주형: mode)
-# 1) 수치형 컬럼 찾기 (int/float)
-num_cols = house_data.select_dtypes(include=[np.number]).columns.tolist()
-
-# 2) 범주형 컬럼 찾기 (object, category 등)
-cat_cols = house_data.select_dtypes(exclude=[np.number]).columns.tolist()
-
-# 3) 수치형 결측치 mean으로 채우기 (타겟 SalePrice는 건드리지 않게)
-for col in num_cols:
-    if col == 'SalePrice':
-        continue
-    if house_data[col].isna().any():
-        house_data[col] = house_data[col].fillna(house_data[col].mean()) # LotFrontage 자동으로 처리됨
-
-# 4) 범주형 결측치 mode로 채우기
-for col in cat_cols:
-    if house_data[col].isna().any():
-        mode_val = house_data[col].mode(dropna=True)
-        # mode가 비어있을 가능성까지 방어
-        fill_val = mode_val.iloc[0] if len(mode_val) > 0 else "None"
-        house_data[col] = house_data[col].fillna(fill_val)
-
-# 5) 범주형 컬럼 get_dummies
-house_data = pd.get_dummies(house_data, columns=cat_cols, drop_first=False)
-
-print('------------- After Preprocessing ----------------')
-print_data_info(house_data)
-
-# 피처와 타겟 분리
-X = house_data.drop(columns=['SalePrice'], axis=1)
-y = house_data['SalePrice']
-
-# 학습용/검증용 데이터 분리 8:2
-X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-
-# 모델 학습
-model = DecisionTreeRegressor()
-model.fit(X_train, y_train)
-
-# 검증 데이터 예측
-y_pred = model.predict(X_test)
-
-# 성능 평가
-mae = mean_absolute_error(y_test, y_pred)
-mse = mean_squared_error(y_test, y_pred)
-rmse = np.sqrt(mse)
-r2 = r2_score(y_test, y_pred)
-
-print(f"MAE: {mae}") 
-print(f"MSE: {mse}")
-print(f"RMSE: {rmse}")
-print(f"R2 Score: {r2}")
+data_path = '20260112_153749_train.csv' # 주택 가격 데이터셋
+output_path = 'house_preprocessed.csv' # 청크 모드 결과 저장 경로
+threshold = 0.5  # 결측치 비율이 이 값 이상이면 drop
+
+def preprocess_in_chunks(path, output, chunksize):
+    """
+    큰 CSV용 전처리 (아래 메모리 버전과 같은 단계를 청크 단위로)
+    1차: 결측 비율 / 수치형 평균 / 범주형 최빈값 / 범주 목록 계산
+    2차: 컬럼 제거 -> 결측치 대체 -> 원-핫 인코딩 후 청크마다 바로 저장
+    - 범주 목록을 1차에서 고정해서 청크마다 get_dummies 결과 컬럼이 같도록 함
+    """
+    stats = ChunkedStats.from_csv(path, chunksize)
+    missing_ratio = stats.missing_ratio().sort_values(ascending=False)
+    print('------------- Missing Ratio (chunked) ----------------')
+    print(missing_ratio.head(20), '\n\n')
+
+    drop_cols = ['Id'] + [c for c in missing_ratio[missing_ratio >= threshold].index if c != 'Id']
+    num_cols = [c for c in stats.num_cols if c not in drop_cols and c != 'SalePrice']
+    cat_cols = [c for c in stats.cat_cols if c not in drop_cols]
+    fill_values = {**stats.mean()[num_cols].to_dict(), **stats.mode()[cat_cols].fillna("None").to_dict()}
+    categories = {c: sorted(set(stats.categories(c)) | {fill_values[c]}) for c in cat_cols}
+
+    def transformed_chunks():
+        for chunk in read_csv_chunks(path, chunksize):
+            chunk = chunk.drop(columns=drop_cols).fillna(fill_values)
+            for col in cat_cols:
+                chunk[col] = pd.Categorical(chunk[col], categories=categories[col])
+            yield pd.get_dummies(chunk, columns=cat_cols, drop_first=False)
+
+    rows = write_csv_chunks(transformed_chunks(), output)
+    print(f'[info] {stats.rows}행 중 {rows}행 전처리 후 저장: {output} (제거한 컬럼: {drop_cols})')
+
+# 튜닝/벤치마크 모드 설정
+tune_splits = 5 # 교차 검증 fold 수
+tune_seed = 42
+tune_results_path = 'tuning_results.csv'
+fold_cache_dir = os.path.join(cache_dir, 'house_folds') # fold별 전처리 결과 캐시
+
+# 범주형 인코딩 방식
+# dense: 원-핫 (밀집 행렬, 기존 get_dummies와 같은 결과)
+# sparse: 원-핫 (scipy 희소 행렬) -- 범주 종류가 많아도 0은 저장하지 않음
+# ordinal: 범주 -> 정수 코드 1개 컬럼 (트리 모델용, 처음 보는 범주는 -1)
+encodings = ('dense', 'sparse', 'ordinal')
+sparse_unsupported = {'HistGradientBoosting'} # 희소 행렬 입력을 받지 않는 모델
+
+# 모델별 (생성자, 탐색할 하이퍼파라미터) -- 트리 모델은 n_jobs=1 (병렬화는 후보 단위로 프로세스 풀에서)
+search_space = {
+    'DecisionTree': (DecisionTreeRegressor, {'max_depth': [None, 8, 12, 16], 'min_samples_leaf': [1, 5, 20]}),
+    'RandomForest': (RandomForestRegressor, {'n_estimators': [200], 'max_features': [0.3, 0.6, 1.0], 'min_samples_leaf': [1, 3]}),
+    'ExtraTrees': (ExtraTreesRegressor, {'n_estimators': [200], 'max_features': [0.3, 0.6, 1.0], 'min_samples_leaf': [1, 3]}),
+    'GradientBoosting': (GradientBoostingRegressor, {'n_estimators': [300], 'learning_rate': [0.05, 0.1], 'max_depth': [2, 3, 4]}),
+    'HistGradientBoosting': (HistGradientBoostingRegressor, {'learning_rate': [0.05, 0.1], 'max_leaf_nodes': [15, 31, 63]}),
+    'Ridge': (Ridge, {'alpha': [0.1, 1.0, 10.0, 100.0]}),
+}
+
+def make_model(name, params):
+    model_class, _ = search_space[name]
+    model = model_class(**params)
+    # 재현성 / 과도한 스레드 방지
+    extra = {k: v for k, v in {'random_state': tune_seed, 'n_jobs': 1}.items() if k in model.get_params()}
+    return model.set_params(**extra)
+
+def make_preprocessor(train_df, encoding='dense'):
+    """
+    run_baseline과 같은 전처리를 학습 데이터 기준으로 fit하는 변환기 (검증/새 데이터의 정보가 섞이지 않게)
+    Id / 결측 50% 이상 컬럼 제거 -> 수치형 mean, 범주형 mode 대체 -> 범주형 인코딩(encoding)
+    - fit한 인코더가 범주 목록을 기억해서 예측 시 처음 보는 범주도 처리 (원-핫: 전부 0, ordinal: -1)
+    """
+    features = train_df.drop(columns=['SalePrice'])
+    missing_ratio = features.isna().mean()
+    keep = [c for c in features.columns if c != 'Id' and missing_ratio[c] < threshold]
+    num_cols = [c for c in keep if pd.api.types.is_numeric_dtype(features[c])]
+    cat_cols = [c for c in keep if c not in num_cols]
+
+    if encoding == 'ordinal':
+        encoder = OrdinalEncoder(handle_unknown='use_encoded_value', unknown_value=-1)
+    else:
+        encoder = OneHotEncoder(handle_unknown='ignore', sparse_output=(encoding == 'sparse'))
+    return ColumnTransformer(
+        transformers=[
+            ('num', SimpleImputer(strategy='mean'), num_cols),
+            ('cat', Pipeline(steps=[
+                ('impute', SimpleImputer(strategy='most_frequent')),
+                ('encode', encoder),
+            ]), cat_cols),
+        ],
+        remainder='drop',
+        sparse_threshold=1.0 if encoding == 'sparse' else 0.0, # sparse면 결과 전체를 희소 행렬(CSR)로
+    )
+
+def matrix_nbytes(X):
+    # 행렬이 차지하는 메모리 (희소 행렬은 값 + 인덱스 배열)
+    if sparse.issparse(X):
+        X = X.tocsr()
+        return X.data.nbytes + X.indices.nbytes + X.indptr.nbytes
+    return X.nbytes
+
+def save_matrix(path, X):
+    if sparse.issparse(X):
+        sparse.save_npz(f'{path}.npz', X.tocsr())
+    else:
+        np.save(f'{path}.npy', np.asarray(X, dtype=np.float64))
+
+def load_matrix(path):
+    # 밀집 행렬은 memory map, 희소 행렬은 그대로 로드
+    if os.path.exists(f'{path}.npz'):
+        return sparse.load_npz(f'{path}.npz')
+    return np.load(f'{path}.npy', mmap_mode='r')
+
+def prepare_folds(df, n_splits=tune_splits, encoding='dense'):
+    """
+    fold마다 전처리를 한 번만 하고 .npy로 저장 -> 모든 모델/하이퍼파라미터 후보가 같은 결과를 재사용
+    - 캐시 키: 데이터 내용 해시 + fold 수 + seed + 인코딩 (다음 실행에서도 재사용)
+    - 워커 프로세스는 밀집 행렬을 memory map으로 읽어서 프로세스마다 복사본을 만들지 않음
+    """
+    key = f"{fingerprint(data_path)['hash'][:16]}-k{n_splits}-s{tune_seed}-t{threshold}-{encoding}"
+    folds_dir = os.path.join(fold_cache_dir, key)
+    fold_dirs = [os.path.join(folds_dir, f'fold{i}') for i in range(n_splits)]
+    if all(os.path.exists(os.path.join(d, 'y_val.npy')) for d in fold_dirs):
+        print(f'[info] fold 전처리 캐시 사용: {folds_dir}')
+        return fold_dirs
+
+    started = time.perf_counter()
+    kfold = KFold(n_splits=n_splits, shuffle=True, random_state=tune_seed)
+    for fold_dir, (train_idx, val_idx) in zip(fold_dirs, kfold.split(df)):
+        train_df, val_df = df.iloc[train_idx], df.iloc[val_idx]
+        preprocessor = make_preprocessor(train_df, encoding)
+        os.makedirs(fold_dir, exist_ok=True)
+        save_matrix(os.path.join(fold_dir, 'X_train'), preprocessor.fit_transform(train_df))
+        np.save(os.path.join(fold_dir, 'y_train.npy'), train_df['SalePrice'].to_numpy(dtype=np.float64))
+        save_matrix(os.path.join(fold_dir, 'X_val'), preprocessor.transform(val_df))
+        np.save(os.path.join(fold_dir, 'y_val.npy'), val_df['SalePrice'].to_numpy(dtype=np.float64)) # 마지막에 저장 = 완료 표시
+    print(f'[info] fold 전처리 {n_splits}개 완료: {time.perf_counter() - started:.2f}초 -> {folds_dir}')
+    return fold_dirs
+
+def load_fold(fold_dir):
+    # (X_train, y_train, X_val, y_val)
+    return tuple(load_matrix(os.path.join(fold_dir, name)) for name in ('X_train', 'y_train', 'X_val', 'y_val'))
+
+def evaluate_candidate(name, params, fold_dir):
+    # 워커 프로세스에서 실행: 후보 1개 x fold 1개 학습/예측/평가
+    X_train, y_train, X_val, y_val = load_fold(fold_dir)
+    model = make_model(name, params)
+
+    started = time.perf_counter()
+    model.fit(X_train, y_train)
+    fit_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    y_pred = model.predict(X_val)
+    predict_time = time.perf_counter() - started
+
+    return {
+        'model': name,
+        'params': str(params),
+        'fold': os.path.basename(fold_dir),
+        'mae': mean_absolute_error(y_val, y_pred),
+        'rmse': np.sqrt(mean_squared_error(y_val, y_pred)),
+        'r2': r2_score(y_val, y_pred),
+        'fit_time': fit_time,
+        'predict_time': predict_time,
+    }
+
+def run_tuning(workers=None, models=None, encoding='dense'):
+    """
+    여러 회귀 모델 x 하이퍼파라미터 후보를 교차 검증 (후보 x fold 작업을 프로세스 풀로 모든 코어에 분배)
+    결과: 후보별 평균 MAE/RMSE/R2 + fit/predict 시간, 전체 wall time
+    """
+    workers = workers or os.cpu_count()
+    house_data = load_csv(data_path)
+    fold_dirs = prepare_folds(house_data, encoding=encoding)
+
+    names = [name for name in search_space if not models or name in models]
+    if encoding == 'sparse' and sparse_unsupported & set(names):
+        print(f'[warning] 희소 행렬을 받지 않는 모델 제외: {sorted(sparse_unsupported & set(names))}')
+        names = [name for name in names if name not in sparse_unsupported]
+    tasks = [(name, params, fold_dir)
+             for name in names
+             for params in ParameterGrid(search_space[name][1])
+             for fold_dir in fold_dirs]
+    print(f'[info] 후보 {len(tasks) // len(fold_dirs)}개 x fold {len(fold_dirs)}개 = 작업 {len(tasks)}개, 워커 {workers}개')
+
+    rows = []
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(evaluate_candidate, *task) for task in tasks]
+        for i, future in enumerate(as_completed(futures), 1):
+            rows.append(future.result())
+            if i % 20 == 0 or i == len(futures):
+                print(f'[info] {i}/{len(futures)} 완료 ({time.perf_counter() - started:.1f}초)')
+    wall_time = time.perf_counter() - started
+
+    results = (
+        pd.DataFrame(rows)
+        .groupby(['model', 'params'], as_index=False)
+        .agg(mae=('mae', 'mean'), rmse=('rmse', 'mean'), rmse_std=('rmse', 'std'), r2=('r2', 'mean'),
+             fit_time=('fit_time', 'mean'), predict_time=('predict_time', 'mean'))
+        .sort_values('rmse')
+    )
+    results.to_csv(tune_results_path, index=False)
+
+    pd.set_option('display.width', 200)
+    pd.set_option('display.max_colwidth', 80)
+    print('\n------------- Best per Model (CV 평균, 시간은 fold당 초) ----------------')
+    print(results.groupby('model').head(1).to_string(index=False, float_format=lambda v: f'{v:,.4f}'))
+    serial_time = sum(r['fit_time'] + r['predict_time'] for r in rows)
+    print(f'\n[info] wall time: {wall_time:.2f}초 (직렬 합계 {serial_time:.2f}초, {serial_time / wall_time:.1f}배), 전체 결과: {tune_results_path}')
+    return results
+
+def compare_encodings():
+    """
+    인코딩 방식별 메모리 / 시간 비교 (run_baseline과 같은 8:2 분할, DecisionTreeRegressor)
+    - get_dummies: 기존 방식 (전체 데이터를 밀집 DataFrame으로)
+    - dense / sparse / ordinal: 학습 데이터로 fit한 인코더
+    - 메모리: 결과 행렬 크기 + 변환 중 최대 메모리(tracemalloc)
+    """
+    house_data = load_csv(data_path)
+    train_df, test_df = train_test_split(house_data, test_size=0.2, random_state=42)
+    rows = []
+
+    # 기존 방식: 결측치 대체 후 get_dummies (범주형 컬럼 수만큼 밀집 컬럼이 늘어남)
+    tracemalloc.start()
+    started = time.perf_counter()
+    features = house_data.drop(columns=['Id', 'SalePrice'])
+    features = features.loc[:, features.isna().mean() < threshold]
+    num_cols = features.select_dtypes(include=[np.number]).columns.tolist()
+    cat_cols = features.select_dtypes(exclude=[np.number]).columns.tolist()
+    # 결측치 대체는 run_baseline / preprocess_in_chunks와 같게 (수치형: mean, 범주형: mode)
+    fill_values = features[num_cols].mean().to_dict()
+    if cat_cols: # 범주형 컬럼이 없으면 mode()가 빈 DataFrame이라 iloc[0]에서 IndexError
+        fill_values.update(features[cat_cols].mode().iloc[0].fillna("None").to_dict())
+    dummies = pd.get_dummies(features.fillna(fill_values), columns=cat_cols, dtype=np.float64)
+    prep_time = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    X_train, X_test = dummies.loc[train_df.index].to_numpy(), dummies.loc[test_df.index].to_numpy()
+    rows.append(evaluate_encoding('get_dummies', X_train, X_test, train_df, test_df, prep_time, peak,
+                                  int(dummies.memory_usage(deep=True).sum())))
+
+    for encoding in encodings:
+        tracemalloc.start()
+        started = time.perf_counter()
+        preprocessor = make_preprocessor(train_df, encoding)
+        X_train = preprocessor.fit_transform(train_df)
+        X_test = preprocessor.transform(test_df)
+        prep_time = time.perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        rows.append(evaluate_encoding(encoding, X_train, X_test, train_df, test_df, prep_time, peak,
+                                      matrix_nbytes(X_train) + matrix_nbytes(X_test)))
+
+    results = pd.DataFrame(rows)
+    print('------------- Encoding Comparison (DecisionTreeRegressor) ----------------')
+    print(results.to_string(index=False, float_format=lambda v: f'{v:,.4f}'))
+    base = results.iloc[0]
+    for _, row in results.iloc[1:].iterrows():
+        print(f"[info] {row['encoding']}: 행렬 메모리 {base['matrix_mb'] / row['matrix_mb']:.1f}배 절약, "
+              f"모델 학습 {base['fit_time'] / row['fit_time']:.1f}배 빠름")
+    return results
+
+def evaluate_encoding(encoding, X_train, X_test, train_df, test_df, prep_time, peak, nbytes):
+    model = DecisionTreeRegressor(random_state=42)
+    started = time.perf_counter()
+    model.fit(X_train, train_df['SalePrice'])
+    fit_time = time.perf_counter() - started
+    y_pred = model.predict(X_test)
+    return {
+        'encoding': encoding,
+        'n_features': X_train.shape[1],
+        'matrix_mb': nbytes / 1024 ** 2,
+        'peak_mb': peak / 1024 ** 2,
+        'prep_time': prep_time,
+        'fit_time': fit_time,
+        'rmse': np.sqrt(mean_squared_error(test_df['SalePrice'], y_pred)),
+    }
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='주택 가격 예측')
+    parser.add_argument('--chunksize', type=int, default=None, help='청크 모드: 전처리 결과만 파일로 저장 (큰 파일용)')
+    parser.add_argument('--tune', action='store_true', help='여러 모델 하이퍼파라미터 교차 검증 + 시간 비교')
+    parser.add_argument('--workers', type=int, default=None, help='튜닝 프로세스 수 (기본: CPU 코어 수)')
+    parser.add_argument('--models', nargs='*', default=None, help=f'튜닝할 모델 ({", ".join(search_space)})')
+    parser.add_argument('--encoding', choices=encodings, default='dense', help='튜닝 시 범주형 인코딩 방식')
+    parser.add_argument('--compare-encodings', action='store_true', help='인코딩 방식별 메모리/학습 시간 비교')
+    return parser.parse_args()
+
+def run_baseline():
+    house_data = load_csv(data_path) # 주택 가격 데이터셋 로드 (두 번째 실행부터는 컬럼형 캐시에서 로드)
+
+    print('------------- Before Preprocessing ----------------')
+    print_data_info(house_data)
+
+    # 결측치 확인 & 비율 출력
+    print('------------- Missing Values & Missing Ratio ----------------')
+    for i, j in enumerate(house_data.isnull().sum()):
+        if j > 0:
+            print(f'Column: {house_data.columns[i]}, Missing Values: {j}')
+    print()
+    missing_ratio = house_data.isna().mean().sort_values(ascending=False)
+    print(missing_ratio.head(20), '\n\n')
+
+    # 불필요한 열 제거 & 결측치 50% 이상인 열 제거
+    house_data = house_data.drop(columns=['Id'], axis=1)
+
+    drop_cols = missing_ratio[missing_ratio >= threshold].index.tolist()
+    drop_cols = [c for c in drop_cols]
+    house_data = house_data.drop(columns=drop_cols)
+
+
+    # 결측치 처리 (수치형: mean, 범주형: mode)
+    # 1) 수치형 컬럼 찾기 (int/float)
+    num_cols = house_data.select_dtypes(include=[np.number]).columns.tolist()
+
+    # 2) 범주형 컬럼 찾기 (object, category 등)
+    cat_cols = house_data.select_dtypes(exclude=[np.number]).columns.tolist()
+
+    # 3) 수치형 결측치 mean으로 채우기 (타겟 SalePrice는 건드리지 않게)
+    for col in num_cols:
+        if col == 'SalePrice':
+            continue
+        if house_data[col].isna().any():
+            house_data[col] = house_data[col].fillna(house_data[col].mean()) # LotFrontage 자동으로 처리됨
+
+    # 4) 범주형 결측치 mode로 채우기
+    for col in cat_cols:
+        if house_data[col].isna().any():
+            mode_val = house_data[col].mode(dropna=True)
+            # mode가 비어있을 가능성까지 방어
+            fill_val = mode_val.iloc[0] if len(mode_val) > 0 else "None"
+            house_data[col] = house_data[col].fillna(fill_val)
+
+    # 5) 범주형 컬럼 get_dummies
+    house_data = pd.get_dummies(house_data, columns=cat_cols, drop_first=False)
+
+    print('------------- After Preprocessing ----------------')
+    print_data_info(house_data)
+
+    # 피처와 타겟 분리
+    X = house_data.drop(columns=['SalePrice'], axis=1)
+    y = house_data['SalePrice']
+
+    # 학습용/검증용 데이터 분리 8:2
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+
+    # 모델 학습
+    model = DecisionTreeRegressor()
+    model.fit(X_train, y_train)
+
+    # 검증 데이터 예측
+    y_pred = model.predict(X_test)
+
+    # 성능 평가
+    mae = mean_absolute_error(y_test, y_pred)
+    mse = mean_squared_error(y_test, y_pred)
+    rmse = np.sqrt(mse)
+    r2 = r2_score(y_test, y_pred)
+
+    print(f"MAE: {mae}") 
+    print(f"MSE: {mse}")
+    print(f"RMSE: {rmse}")
+    print(f"R2 Score: {r2}")
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.chunksize:
+        preprocess_in_chunks(data_path, output_path, args.chunksize)
+    elif args.compare_encodings:
+        compare_encodings()
+    elif args.tune:
+        run_tuning(args.workers, args.models, args.encoding)
+    else:
+        run_baseline()
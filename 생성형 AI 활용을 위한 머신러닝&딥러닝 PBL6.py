@@ -1,14 +1,35 @@
 import os
 import json
 import re
+import time
+import sqlite3
+import hashlib
+import argparse
+import random
+import asyncio
+import inspect
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from datetime import datetime
+from types import SimpleNamespace
 from typing import Any, Dict, Callable
 
-from openai import OpenAI
+import httpx
+from openai import OpenAI, AsyncOpenAI, RateLimitError
 from dotenv import load_dotenv
+from llm_metrics import LLMMetrics, print_summary
 load_dotenv()
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
 
+tool_workers = 8 # 한 턴의 tool_calls를 동시에 실행할 최대 스레드 수
+tool_timeout = 30.0 # tool 1개당 기본 제한 시간(초, tool이 실제로 시작한 시점부터)
+tool_timeouts: Dict[str, float] = {} # tool별 제한 시간 (예: {"get_weather": 5.0})
+
+batch_concurrency = 32 # 배치 모드에서 동시에 진행할 대화 수
+retry_max = 5 # RateLimit 재시도 횟수
+retry_base_delay = 1.0 # 재시도 대기 시간 (1, 2, 4, 8... 초 + 지터)
+
 # -----------------------------
 # 1) 사용자 정의 함수 2개
 # -----------------------------
@@ -71,13 +92,152 @@ def add_numbers(x: float, y: float) -> float:
 
 
 # -----------------------------
-# 2) OpenAIAgent 클래스
+# 2) 응답 캐시 / 오프라인 클라이언트
+# -----------------------------
+def make_cache_key(model: str, messages: list[dict], tools: list[dict]) -> str:
+    # model, messages, tools가 같으면 같은 키 (dict 순서와 무관하도록 sort_keys)
+    payload = json.dumps({"model": model, "messages": messages, "tools": tools},
+                         sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def response_to_dict(resp: Any) -> dict:
+    # openai 응답 객체(pydantic) -> JSON으로 저장 가능한 dict
+    if isinstance(resp, dict):
+        return resp
+    if isinstance(resp, SimpleNamespace):
+        return json.loads(json.dumps(resp, default=vars))
+    return resp.model_dump(mode="json")
+
+def to_namespace(data: Any) -> Any:
+    # 저장된 dict를 resp.choices[0].message.tool_calls 처럼 속성으로 접근할 수 있게 변환
+    if isinstance(data, dict):
+        return SimpleNamespace(**{k: to_namespace(v) for k, v in data.items()})
+    if isinstance(data, list):
+        return [to_namespace(v) for v in data]
+    return data
+
+
+class ResponseCache:
+    """
+    chat.completions 응답 캐시 (메모리 LRU + SQLite 디스크 2단계)
+    - 메모리: 최근 사용한 memory_size개를 OrderedDict로 유지 (마이크로초 단위 응답)
+    - 디스크: db_path의 SQLite에 저장해서 프로세스를 다시 시작해도 재사용
+    - ttl초가 지난 응답은 무효, 디스크 항목이 max_rows를 넘으면 가장 오래 안 쓴 것부터 삭제
+    """
+    def __init__(self, db_path: str | None = "openai_cache.db", memory_size: int = 256,
+                 ttl: float | None = 7 * 24 * 3600, max_rows: int = 10000):
+        self.memory_size = memory_size
+        self.ttl = ttl
+        self.max_rows = max_rows
+        self.hits = 0
+        self.misses = 0
+        self._memory: OrderedDict[str, tuple[float, dict]] = OrderedDict() # key -> (저장 시각, 응답)
+        self._lock = threading.Lock()
+        self._conn = None
+        if db_path:
+            self._conn = sqlite3.connect(db_path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, response TEXT, created_at REAL, last_access REAL)"
+            )
+            self._conn.commit()
+
+    def _expired(self, created_at: float) -> bool:
+        return self.ttl is not None and time.time() - created_at > self.ttl
+
+    def get(self, key: str) -> dict | None:
+        with self._lock:
+            item = self._memory.get(key)
+            if item is not None and not self._expired(item[0]):
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return item[1]
+            self._memory.pop(key, None)
+
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    if self._expired(row[1]):
+                        self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                        self._conn.commit()
+                    else:
+                        self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), key))
+                        self._conn.commit()
+                        data = json.loads(row[0])
+                        self._remember(key, row[1], data)
+                        self.hits += 1
+                        return data
+
+            self.misses += 1
+            return None
+
+    def put(self, key: str, data: dict) -> None:
+        now = time.time()
+        with self._lock:
+            self._remember(key, now, data)
+            if self._conn is None:
+                return
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response, created_at, last_access) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(data, ensure_ascii=False), now, now),
+            )
+            # 크기 제한: 가장 오래 안 쓴 항목부터 삭제
+            count = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            if count > self.max_rows:
+                self._conn.execute(
+                    "DELETE FROM responses WHERE key IN "
+                    "(SELECT key FROM responses ORDER BY last_access LIMIT ?)",
+                    (count - self.max_rows,),
+                )
+            self._conn.commit()
+
+    def _remember(self, key: str, created_at: float, data: dict) -> None:
+        self._memory[key] = (created_at, data)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+
+class FakeOpenAIClient:
+    """
+    녹화해 둔 응답(JSONL: {"key": ..., "response": ...})을 재생하는 오프라인 클라이언트
+    - OpenAI 클라이언트처럼 client.chat.completions.create(...)로 호출
+    - 같은 model/messages/tools 요청이면 녹화된 응답을 돌려주고, 없으면 KeyError
+    - 네트워크 없이 회귀 테스트를 돌릴 때 사용 (녹화는 OpenAIAgent(record_path=...))
+    """
+    def __init__(self, recordings_path: str):
+        self.recordings: Dict[str, dict] = {}
+        with open(recordings_path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    item = json.loads(line)
+                    self.recordings[item["key"]] = item["response"]
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, model: str, messages: list[dict], tools: list[dict] | None = None, **kwargs: Any) -> Any:
+        key = make_cache_key(model, messages, tools or [])
+        if key not in self.recordings:
+            raise KeyError(f"녹화된 응답 없음: key={key[:12]}...")
+        return to_namespace(self.recordings[key])
+
+
+# -----------------------------
+# 3) OpenAIAgent 클래스
 # -----------------------------
 class OpenAIAgent:
-    def __init__(self, model: str | None = None):
+    def __init__(self, model: str | None = None, client: Any = None,
+                 cache: ResponseCache | None = None, record_path: str | None = None,
+                 metrics: LLMMetrics | None = None):
         # API Key는 하드코딩 금지: 환경변수 OPENAI_API_KEY로 주입
-        self.client = OpenAI(api_key=OPENAI_API_KEY)
+        # client를 넘기면 그대로 사용 (예: FakeOpenAIClient로 오프라인 재생)
+        self.client = OpenAI(api_key=OPENAI_API_KEY) if client is None else client
         self.model = "gpt-5.2" if model is None else model
+        self.cache = cache
+        self.record_path = record_path # 새로 받은 응답을 FakeOpenAIClient용 JSONL로 녹화
+        self.record_lock = threading.Lock() # 여러 스레드에서 녹화할 때 줄이 섞이지 않게
+        self.metrics = metrics # 지연시간/토큰/tool 왕복/캐시 적중 기록 (None이면 기록 안 함)
 
         self.tools = [
             {
@@ -126,12 +286,52 @@ class OpenAIAgent:
 
 
     def call_openai(self, messages: list[dict]) -> Any:
-        return self.client.chat.completions.create(
-            model=self.model,
-            messages=messages,
-            tools=self.tools,
-            tool_choice="auto",
-        )
+        key, cached = self.lookup_cache(messages)
+        if cached is not None:
+            return cached
+
+        started = time.perf_counter()
+        try:
+            resp = self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                tools=self.tools,
+                tool_choice="auto",
+            )
+        except Exception as e:
+            if self.metrics is not None:
+                self.metrics.record_error("agent", e)
+            raise
+
+        if self.metrics is not None:
+            self.metrics.record_response("agent", resp, started)
+        self.store_response(key, resp)
+        return resp
+
+    def lookup_cache(self, messages: list[dict]) -> tuple[str | None, Any]:
+        # (캐시 키, 캐시된 응답 또는 None)
+        key = None
+        if self.cache is not None or self.record_path:
+            key = make_cache_key(self.model, messages, self.tools)
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                if self.metrics is not None:
+                    self.metrics.record("agent", kind="cache_hit")
+                return key, to_namespace(cached)
+        return key, None
+
+    def store_response(self, key: str | None, resp: Any) -> None:
+        # 새로 받은 응답을 캐시에 저장하고, record_path가 있으면 JSONL로 녹화
+        if key is None:
+            return
+        data = response_to_dict(resp)
+        if self.cache is not None:
+            self.cache.put(key, data)
+        if self.record_path:
+            line = json.dumps({"key": key, "response": data}, ensure_ascii=False) + "\n"
+            with self.record_lock, open(self.record_path, "a", encoding="utf-8") as f:
+                f.write(line)
 
     def handle_tool_calls(self, messages: list[dict], tool_calls: list[Any]) -> None:
         # assistant의 tool_calls 메시지 추가
@@ -155,34 +355,66 @@ class OpenAIAgent:
 
         messages.append(assistant_tool_msg)
 
-        # 각 tool_call 실행 후 role=tool 메시지로 결과 추가
-        for tc in tool_calls:
-            fn_name = tc.function.name
-            raw_args = tc.function.arguments
+        # 모든 tool_call을 스레드 풀에 먼저 제출 -> 턴 지연시간 = 가장 느린 tool 1개
+        # 스레드 풀은 턴마다 새로 만듦: 실행 중인 스레드는 강제 종료할 수 없어서 시간 초과된 tool은
+        # 끝날 때까지 자기 스레드를 계속 잡고 있음 -> 공유 풀이면 멈춘 tool이 쌓일수록 다음 턴의 tool이 대기만 하다 시간 초과
+        # (멈춘 스레드는 프로세스 종료 시에도 기다리므로, 정말 멈출 수 있는 tool은 별도 프로세스로 실행해야 함)
+        executor = ThreadPoolExecutor(max_workers=min(tool_workers, len(tool_calls)), thread_name_prefix="tool")
+        started = [threading.Event() for _ in tool_calls]
+        start_times = [0.0] * len(tool_calls)
 
+        def run(i, tc):
+            start_times[i] = time.perf_counter()
+            started[i].set()
+            return self.run_tool(tc.function.name, tc.function.arguments)
+
+        futures = [executor.submit(run, i, tc) for i, tc in enumerate(tool_calls)]
+        try:
+            # 결과는 원래 tool_calls 순서대로 role=tool 메시지로 추가
+            for i, (tc, future) in enumerate(zip(tool_calls, futures)):
+                fn_name = tc.function.name
+                limit = tool_timeouts.get(fn_name, tool_timeout)
+                # 워커를 기다리는 시간도 limit까지만 (아직 시작 안 했으면 취소)
+                if not started[i].wait(timeout=limit) and future.cancel():
+                    result = f"Function timeout in {fn_name}: {limit}초 동안 실행 대기"
+                else:
+                    started[i].wait() # cancel 직전에 시작한 경우 시작 시각 기록까지 대기
+                    try:
+                        # 제한 시간은 tool이 실제로 시작한 시점부터 계산 (워커를 기다린 시간 제외)
+                        result = future.result(timeout=max(0.0, start_times[i] + limit - time.perf_counter()))
+                    except FutureTimeoutError:
+                        result = f"Function timeout in {fn_name}: {limit}초 초과"
+
+                messages.append(
+                    {
+                        "role": "tool",
+                        "tool_call_id": tc.id,
+                        "content": result,
+                    }
+                )
+        finally:
+            # 끝나지 않은 tool은 기다리지 않고 버림 (대기 중인 tool은 취소, 실행 중인 스레드는 끝나면 종료)
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def run_tool(self, fn_name: str, raw_args: Any) -> str:
+        # tool 1개 실행 (스레드 풀에서 호출, 예외는 문자열 결과로 변환)
+        try:
+            args = json.loads(raw_args) if isinstance(raw_args, str) else dict(raw_args)
+        except Exception:
+            # 모델이 JSON을 약간 깨뜨렸을 때 최소 복구
             try:
-                args = json.loads(raw_args) if isinstance(raw_args, str) else dict(raw_args)
-            except Exception:
-                # 모델이 JSON을 약간 깨뜨렸을 때 최소 복구
                 args = json.loads(re.sub(r"(\w+):", r'"\1":', raw_args))
+            except Exception as e:
+                return f"Argument error in {fn_name}: {e}"
 
-            fn = self.tool_router.get(fn_name)
-            if fn is None:
-                result = f"Unknown function: {fn_name}"
-            else:
-                try:
-                    out = fn(**args)
-                    result = str(out)
-                except Exception as e:
-                    result = f"Function error in {fn_name}: {e}"
-
-            messages.append(
-                {
-                    "role": "tool",
-                    "tool_call_id": tc.id,
-                    "content": result,
-                }
-            )
+        fn = self.tool_router.get(fn_name)
+        if fn is None:
+            return f"Unknown function: {fn_name}"
+        try:
+            out = fn(**args)
+            return str(out)
+        except Exception as e:
+            return f"Function error in {fn_name}: {e}"
 
     def chat(self, user_text: str) -> str:
         messages = [
@@ -190,7 +422,7 @@ class OpenAIAgent:
         ]
 
         # tool_calls가 사라질 때까지 최대 N회 반복
-        for _ in range(5):
+        for tool_rounds in range(5):
             resp = self.call_openai(messages)
             msg = resp.choices[0].message
 
@@ -199,16 +431,204 @@ class OpenAIAgent:
                 self.handle_tool_calls(messages, tool_calls)
                 continue
 
+            self.record_chat(tool_rounds)
             return (msg.content or "").strip()
 
+        self.record_chat(5)
         return "요청 처리가 반복 한도를 초과했습니다."
 
+    def record_chat(self, tool_rounds: int) -> None:
+        # 대화 1번이 끝날 때 tool 호출 왕복 수 기록
+        if self.metrics is not None:
+            self.metrics.record("agent", kind="chat", tool_rounds=tool_rounds)
+
+
+class AsyncOpenAIAgent(OpenAIAgent):
+    """
+    OpenAIAgent의 비동기 버전 (tools / tool_router / 캐시는 그대로 상속)
+    - 하나의 AsyncOpenAI(httpx 커넥션 풀)를 모든 대화가 공유
+    - RateLimitError는 지수 백오프 + 지터로 재시도
+    - tool 실행은 부모의 handle_tool_calls(턴별 스레드 풀)를 그대로 사용
+    - 블로킹 작업(캐시 조회/저장, tool 왕복, 지표 기록)은 concurrency개짜리 전용 스레드 풀에서 실행
+      (asyncio.to_thread의 기본 executor는 min(32, CPU + 4)개라서 CPU가 적으면 concurrency만큼 동시에 진행되지 않음)
+    """
+    def __init__(self, model: str | None = None, client: Any = None,
+                 cache: ResponseCache | None = None, record_path: str | None = None,
+                 metrics: LLMMetrics | None = None, concurrency: int = batch_concurrency):
+        if client is None:
+            # SDK 자체 재시도는 끄고(max_retries=0) 아래 call_openai_async에서 직접 재시도
+            http_client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency),
+                timeout=httpx.Timeout(60.0),
+            )
+            client = AsyncOpenAI(api_key=OPENAI_API_KEY, http_client=http_client, max_retries=0)
+        super().__init__(model=model, client=client, cache=cache, record_path=record_path, metrics=metrics)
+        self.retries = 0
+        # 대화 1개는 블로킹 작업을 한 번에 하나씩만 하므로 concurrency개면 모든 대화가 기다리지 않음
+        self.executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="agent")
+
+    async def run_blocking(self, func: Callable[..., Any], *args: Any) -> Any:
+        # 블로킹 함수를 이벤트 루프 밖(전용 스레드 풀)에서 실행
+        return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+
+    async def call_openai_async(self, messages: list[dict]) -> Any:
+        # 캐시 조회/저장은 SQLite 디스크 I/O -> 이벤트 루프를 막지 않도록 스레드에서 실행 (tool과 동일)
+        key, cached = await self.run_blocking(self.lookup_cache, messages)
+        if cached is not None:
+            return cached
+
+        started = time.perf_counter()
+        for attempt in range(retry_max + 1):
+            try:
+                resp = self.client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    tools=self.tools,
+                    tool_choice="auto",
+                )
+                # FakeOpenAIClient처럼 동기 클라이언트도 그대로 사용 가능
+                if inspect.isawaitable(resp):
+                    resp = await resp
+                break
+            except RateLimitError as e:
+                if attempt == retry_max:
+                    if self.metrics is not None:
+                        await self.run_blocking(self.metrics.record_error, "agent_async", e)
+                    raise
+                self.retries += 1
+                delay = retry_base_delay * (2 ** attempt)
+                await asyncio.sleep(delay + random.uniform(0, delay))
+            except Exception as e:
+                if self.metrics is not None:
+                    await self.run_blocking(self.metrics.record_error, "agent_async", e)
+                raise
+
+        # 지연시간은 재시도 대기 포함 (사용자가 실제로 기다린 시간), 지표 JSONL 기록도 스레드에서
+        if self.metrics is not None:
+            await self.run_blocking(self.metrics.record_response, "agent_async", resp, started, time.perf_counter())
+        await self.run_blocking(self.store_response, key, resp)
+        return resp
+
+    async def chat_async(self, user_text: str) -> str:
+        messages = [
+            {"role": "user", "content": user_text}
+        ]
+
+        for tool_rounds in range(5):
+            resp = await self.call_openai_async(messages)
+            msg = resp.choices[0].message
+
+            tool_calls = getattr(msg, "tool_calls", None)
+            if tool_calls:
+                # tool은 블로킹 함수이므로 이벤트 루프 밖(스레드)에서 실행
+                await self.run_blocking(self.handle_tool_calls, messages, tool_calls)
+                continue
+
+            await self.run_blocking(self.record_chat, tool_rounds)
+            return (msg.content or "").strip()
+
+        await self.run_blocking(self.record_chat, 5)
+        return "요청 처리가 반복 한도를 초과했습니다."
+
+    async def aclose(self) -> None:
+        close = getattr(self.client, "close", None)
+        if close is not None:
+            result = close()
+            if inspect.isawaitable(result):
+                await result
+        self.executor.shutdown(wait=False) # 이미 넣은 작업은 끝까지 실행
+
+
+async def run_batch(agent: AsyncOpenAIAgent, input_path: str, output_path: str,
+                    concurrency: int = batch_concurrency) -> None:
+    """
+    JSONL 프롬프트 파일을 동시에 처리해서 결과를 JSONL로 바로바로 기록
+    - 입력 한 줄: {"id": ..., "prompt": "..."} (id가 없으면 줄 번호)
+    - 출력 한 줄: {"id", "prompt", "response" 또는 "error", "elapsed"} (끝난 순서대로)
+    - 워커 concurrency개가 크기 제한 큐에서 꺼내 처리 -> 파일 전체를 메모리에 올리지 않음
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 2)
+    done = 0
+    failed = 0
+    started = time.perf_counter()
+
+    with open(output_path, "w", encoding="utf-8") as out:
+        async def worker() -> None:
+            nonlocal done, failed
+            while True:
+                item = await queue.get()
+                if item is None:
+                    return
+                t0 = time.perf_counter()
+                result = {"id": item["id"], "prompt": item["prompt"]}
+                try:
+                    result["response"] = await agent.chat_async(item["prompt"])
+                except Exception as e:
+                    result["error"] = f"{type(e).__name__}: {e}"
+                    failed += 1
+                result["elapsed"] = round(time.perf_counter() - t0, 3)
+                out.write(json.dumps(result, ensure_ascii=False) + "\n")
+                out.flush()
+                done += 1
+                if done % 100 == 0:
+                    print(f"[info] {done}건 완료 ({done / (time.perf_counter() - started):.1f}건/s)")
+
+        workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+        with open(input_path, "r", encoding="utf-8") as f:
+            for line_no, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                item = json.loads(line)
+                await queue.put({"id": item.get("id", line_no), "prompt": item.get("prompt") or item.get("input", "")})
+        for _ in workers:
+            await queue.put(None)
+        await asyncio.gather(*workers)
+
+    elapsed = time.perf_counter() - started
+    print(f"[info] 배치 완료: {done}건 (실패 {failed}건, 재시도 {agent.retries}회), "
+          f"{elapsed:.2f}초, {done / elapsed if elapsed else 0:.1f}건/s -> {output_path}")
+
 
 # -----------------------------
-# 3) 간단 테스트
+# 4) 간단 테스트
 # -----------------------------
 if __name__ == "__main__":
-    agent = OpenAIAgent()
+    parser = argparse.ArgumentParser(description="OpenAIAgent 대화형 테스트")
+    parser.add_argument("--cache", default=None, help="응답 캐시 SQLite 경로 (예: openai_cache.db)")
+    parser.add_argument("--record", default=None, help="새로 받은 응답을 녹화할 JSONL 경로")
+    parser.add_argument("--replay", default=None, help="녹화된 JSONL 응답으로 오프라인 실행")
+    parser.add_argument("--batch", default=None, help="프롬프트 JSONL 파일 (비동기 배치 모드)")
+    parser.add_argument("--output", default="batch_results.jsonl", help="배치 결과 JSONL 경로")
+    parser.add_argument("--concurrency", type=int, default=batch_concurrency, help="배치 동시 처리 수")
+    parser.add_argument("--metrics", default=None, help="호출 지표를 기록할 JSONL 경로 (예: llm_metrics.jsonl)")
+    args = parser.parse_args()
+    metrics = LLMMetrics(args.metrics) if args.metrics else None
+
+    if args.batch:
+        async def main() -> None:
+            agent = AsyncOpenAIAgent(
+                client=FakeOpenAIClient(args.replay) if args.replay else None,
+                cache=ResponseCache(args.cache) if args.cache else None,
+                record_path=args.record,
+                metrics=metrics,
+                concurrency=args.concurrency,
+            )
+            try:
+                await run_batch(agent, args.batch, args.output, args.concurrency)
+            finally:
+                await agent.aclose()
+
+        asyncio.run(main())
+        if metrics is not None:
+            print_summary(metrics.summary())
+        raise SystemExit(0)
+
+    agent = OpenAIAgent(
+        client=FakeOpenAIClient(args.replay) if args.replay else None,
+        cache=ResponseCache(args.cache) if args.cache else None,
+        record_path=args.record,
+        metrics=metrics,
+    )
 
     # tests = [
     #     "2024-12-25을 2024년 12월 25일 형식으로 바꿔줘",
@@ -224,5 +644,7 @@ if __name__ == "__main__":
     while True:
         q = input("\nUser> ").strip()
         if q.lower() in ("exit", "quit"):
+            if metrics is not None:
+                print_summary(metrics.summary())
             break
         print("Agent>", agent.chat(q))
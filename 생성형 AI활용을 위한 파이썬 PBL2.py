@@ -1,7 +1,34 @@
 import re
 import os
 import csv
+import json
+import time
+import argparse
+import tracemalloc
+from itertools import repeat
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import numpy as np # 정수 IP 카운팅 엔진에서 사용 (없으면 정수 키 Counter로 대신 동작)
+except ImportError:
+    np = None
+
+# 대용량 로그 병렬 분석 설정
+ipv4_bytes_pattern = re.compile(rb'\b(?:[0-9]{1,3}\.){3}[0-9]{1,3}\b') # 디코딩 없이 바이트 단위로 검색하는 ipv4 정규식
+chunk_size = 64 * 1024 * 1024 # 프로세스 하나가 맡는 구간 크기 (64MB)
+read_block_size = 4 * 1024 * 1024 # 구간 안에서 한 번에 읽어 들이는 크기 (4MB)
+
+# 정수 IP 카운팅 엔진 설정
+# 각 옥텟을 0~255 범위로 검증한다 (999.999.999.999 같은 값 제외)
+octet_pattern = rb'(?:25[0-5]|2[0-4][0-9]|1[0-9]{2}|[1-9]?[0-9])'
+ipv4_valid_pattern = re.compile(rb'\b' + rb'\.'.join([octet_pattern] * 4) + rb'\b')
+merge_threshold = 4 * 1024 * 1024 # 이만큼 IP(정수)가 쌓이면 정렬된 고유값/횟수 배열에 합친다
+
+# 증분(follow) 분석 설정
+checkpoint_filename = "ip_analysis_checkpoint.json" # 오프셋/inode/누적 카운트를 저장할 체크포인트 파일
+follow_interval = 5 # follow 모드에서 새 로그를 확인하는 주기 (초)
+report_interval = 60 # follow 모드에서 리포트(CSV)/체크포인트를 다시 쓰는 최소 간격 (초)
 
 # 사용자로부터 파일의 경로를 입력 받는다
 def get_file_path():
@@ -33,6 +60,350 @@ def analyze_log_file_and_top3(file_path):
     print("Top 3 IPs:", top3_ips)
     return ip_count, top3_ips
 
+def int_to_ip(ip_int):
+    # 32비트 정수 -> 점 표기 문자열 (리포트 출력할 때만 사용)
+    ip_int = int(ip_int)
+    return f'{ip_int >> 24}.{(ip_int >> 16) & 255}.{(ip_int >> 8) & 255}.{ip_int & 255}'
+
+def ips_to_int(matches):
+    # 점 표기 IP 바이트 목록 -> 32비트 정수 배열 (검증된 IP만 받는다, 옥텟은 1~3자리)
+    # '.'으로 이어 붙인 바이트에서 각 옥텟 바로 뒤 '.' 위치를 찾고, 그 앞 1~3자리를 자릿값대로 더한다
+    data = np.frombuffer(b'000' + b'.'.join(matches) + b'.', dtype=np.uint8) # 앞의 '000': 첫 옥텟 앞자리 조회용
+    end = np.flatnonzero(data == ord('.'))
+    length = np.diff(end, prepend=2) - 1 # 옥텟 자릿수
+    o = data[end - 1].astype(np.uint32) - 48
+    o += np.where(length >= 2, data[end - 2].astype(np.uint32) * 10 - 480, 0)
+    o += np.where(length >= 3, data[end - 3].astype(np.uint32) * 100 - 4800, 0)
+    o = o.reshape(-1, 4)
+    return (o[:, 0] << 24) | (o[:, 1] << 16) | (o[:, 2] << 8) | o[:, 3]
+
+class IPv4IntCounter:
+    """
+    IPv4 주소를 32비트 정수 키로 세는 카운터
+    - 정렬된 고유 IP 배열(keys)과 등장 횟수 배열(counts)만 유지하고, 문자열은 리포트할 때만 만든다
+    - Counter와 같은 방식(update, items, most_common, len)으로 사용할 수 있다
+    - numpy가 없으면 정수 키 Counter로 대신 센다
+    """
+    def __init__(self):
+        if np is not None:
+            self.keys = np.empty(0, dtype=np.uint32)
+            self.counts = np.empty(0, dtype=np.int64)
+            self.__pending = [] # 아직 합치지 않은 정수 IP 배열들
+            self.__pending_size = 0
+        else:
+            self.__int_count = Counter()
+
+    def update_from_bytes(self, data):
+        # 바이트 데이터에서 IP를 찾아 정수로 변환 후 카운트
+        matches = ipv4_valid_pattern.findall(data) # [b'192.168.0.1', ...] (블록 하나 분량만 유지)
+        if not matches:
+            return
+        if np is None:
+            for ip in matches:
+                a, b, c, d = ip.split(b'.')
+                self.__int_count[(int(a) << 24) | (int(b) << 16) | (int(c) << 8) | int(d)] += 1
+            return
+        ips = ips_to_int(matches) # 매치들을 한 번에 정수 배열로 변환
+        self.__pending.append(ips)
+        self.__pending_size += len(ips)
+        if self.__pending_size >= merge_threshold:
+            self.__flush()
+
+    def update(self, other):
+        # 다른 IPv4IntCounter(예: 구간별 결과)를 합친다
+        if np is None:
+            self.__int_count.update(other.__int_count)
+            return
+        other.__flush()
+        self.__flush()
+        self.__merge(other.keys, other.counts)
+
+    def __flush(self):
+        # 쌓아둔 정수 IP들을 정렬/집계해서 keys, counts에 합친다
+        if not self.__pending:
+            return
+        keys, counts = np.unique(np.concatenate(self.__pending), return_counts=True)
+        self.__pending = []
+        self.__pending_size = 0
+        self.__merge(keys, counts)
+
+    def __merge(self, keys, counts):
+        if len(self.keys) == 0:
+            self.keys, self.counts = keys, counts.astype(np.int64)
+            return
+        merged_keys, inverse = np.unique(np.concatenate([self.keys, keys]), return_inverse=True)
+        merged_counts = np.zeros(len(merged_keys), dtype=np.int64)
+        np.add.at(merged_counts, inverse, np.concatenate([self.counts, counts]))
+        self.keys, self.counts = merged_keys, merged_counts
+
+    def most_common(self, n=None):
+        # 등장 횟수 상위 n개만 문자열로 변환해서 반환
+        if np is None:
+            return [(int_to_ip(ip), count) for ip, count in self.__int_count.most_common(n)]
+        self.__flush()
+        if n is None or n >= len(self.counts):
+            idx = np.argsort(-self.counts, kind='stable')
+        else:
+            idx = np.argpartition(-self.counts, n - 1)[:n] # 전체 정렬 없이 상위 n개 후보만 선택
+            idx = idx[np.argsort(-self.counts[idx], kind='stable')]
+        return [(int_to_ip(self.keys[i]), int(self.counts[i])) for i in idx]
+
+    def items(self):
+        if np is None:
+            for ip, count in self.__int_count.items():
+                yield int_to_ip(ip), count
+            return
+        self.__flush()
+        for ip, count in zip(self.keys, self.counts):
+            yield int_to_ip(ip), int(count)
+
+    def __len__(self):
+        if np is None:
+            return len(self.__int_count)
+        self.__flush()
+        return len(self.keys)
+
+def split_file_ranges(file_path, size=chunk_size):
+    # 파일을 size 단위의 바이트 구간으로 나누되, 구간 끝을 다음 줄바꿈까지 밀어서 줄이 잘리지 않게 한다
+    file_size = os.path.getsize(file_path)
+    ranges = []
+    with open(file_path, 'rb') as f:
+        start = 0
+        while start < file_size:
+            end = min(start + size, file_size)
+            if end < file_size:
+                f.seek(end)
+                f.readline() # 줄 중간이면 다음 줄의 시작까지 이동
+                end = f.tell()
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+def iter_line_blocks(f, start, end):
+    # [start, end) 구간을 read_block_size 단위로 읽되, 블록 경계에 걸친 줄은 다음 블록과 합쳐서 돌려준다
+    f.seek(start)
+    remaining = end - start
+    tail = b''
+    while remaining > 0:
+        block = f.read(min(read_block_size, remaining))
+        if not block:
+            break
+        remaining -= len(block)
+        block = tail + block
+        cut = block.rfind(b'\n') + 1 if remaining > 0 else len(block)
+        tail = block[cut:]
+        yield memoryview(block)[:cut] # 복사 없이 완성된 줄까지만 전달
+    if tail:
+        yield tail
+
+def count_ips_in_range(file_path, start, end, engine='counter'):
+    # [start, end) 구간만 읽어서 IP 등장 횟수를 센다 (프로세스 풀의 작업 단위)
+    # 블록 단위로만 매치 리스트가 생기므로 메모리 사용량이 일정
+    if engine == 'int':
+        ip_count = IPv4IntCounter()
+        with open(file_path, 'rb') as f:
+            for block in iter_line_blocks(f, start, end):
+                ip_count.update_from_bytes(block)
+        return ip_count
+
+    ip_count = Counter()
+    with open(file_path, 'rb') as f:
+        for block in iter_line_blocks(f, start, end):
+            ip_count.update(ipv4_bytes_pattern.findall(block))
+    # 고유 IP만 문자열로 변환해서 반환
+    return Counter({ip.decode('ascii'): count for ip, count in ip_count.items()})
+
+def analyze_log_file_parallel(file_path, workers=None, top_n=3, engine='counter'):
+    # 파일을 줄 단위로 정렬된 구간으로 나눠 프로세스 풀에서 분석하고, 구간별 결과를 합친다
+    ip_count = IPv4IntCounter() if engine == 'int' else Counter()
+    try:
+        ranges = split_file_ranges(file_path)
+        starts = [start for start, _ in ranges]
+        ends = [end for _, end in ranges]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for chunk_count in executor.map(count_ips_in_range, repeat(file_path), starts, ends, repeat(engine)):
+                ip_count.update(chunk_count) # 끝난 구간부터 바로 합산
+    except Exception as e:
+        print('Error reading file:', e)
+        return
+
+    # most_common(n)은 전체 목록을 정렬하지 않고 상위 n개만 뽑는다
+    # - Counter: heapq.nlargest (n개짜리 힙)
+    # - IPv4IntCounter(int 엔진): np.argpartition으로 상위 n개 후보를 고른 뒤 그 n개만 정렬 (numpy가 없으면 Counter와 같음)
+    top_ips = ip_count.most_common(top_n)
+    print(f"Unique IPs: {len(ip_count)} (chunks: {len(ranges)})")
+    print(f"Top {top_n} IPs:", top_ips)
+    return ip_count, top_ips
+
+def analyze_log_file_int(file_path, top_n=3):
+    # 정수 카운팅 엔진으로 단일 프로세스 분석 (IP 문자열 리스트를 만들지 않음)
+    try:
+        ip_count = count_ips_in_range(file_path, 0, os.path.getsize(file_path), engine='int')
+    except Exception as e:
+        print('Error reading file:', e)
+        return
+    top_ips = ip_count.most_common(top_n)
+    print(f"Unique IPs: {len(ip_count)}")
+    print(f"Top {top_n} IPs:", top_ips)
+    return ip_count, top_ips
+
+def benchmark_ip_counters(file_path, top_n=3):
+    # 기존 문자열 Counter 방식과 정수 카운팅 엔진의 시간/최대 메모리 비교
+    def counter_path():
+        ipv4_pattern = re.compile(r'\b(?:[0-9]{1,3}\.){3}[0-9]{1,3}\b')
+        ip_list = []
+        with open(file_path, 'r') as f:
+            for line in f:
+                ip_list.extend(ipv4_pattern.findall(line))
+        return Counter(ip_list)
+
+    def int_path():
+        return count_ips_in_range(file_path, 0, os.path.getsize(file_path), engine='int')
+
+    print(f"Benchmark file: {file_path} ({os.path.getsize(file_path) / 1024 / 1024:.1f} MB)")
+    print(f"numpy: {'yes' if np is not None else 'no (Counter fallback)'}")
+    for name, run in [('Counter(str)', counter_path), ('IPv4IntCounter', int_path)]:
+        # 시간은 tracemalloc 없이 따로 측정 (추적 오버헤드 제외)
+        start = time.perf_counter()
+        ip_count = run()
+        count_time = time.perf_counter() - start
+
+        tracemalloc.start()
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        start = time.perf_counter()
+        top_ips = ip_count.most_common(top_n)
+        top_time = time.perf_counter() - start
+        print(f"[{name}] count: {count_time:.3f}s, most_common({top_n}): {top_time * 1000:.2f}ms, "
+              f"peak memory: {peak / 1024 / 1024:.1f} MB, unique IPs: {len(ip_count)}, top: {top_ips}")
+
+def load_checkpoint(checkpoint_path, file_path):
+    # 이전 실행에서 저장한 inode, 오프셋, 누적 카운트를 불러온다 (없거나 다른 파일의 체크포인트면 처음부터)
+    try:
+        with open(checkpoint_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('file_path') != os.path.abspath(file_path):
+            print('[info] Checkpoint belongs to another file. Starting from the beginning.')
+            return None, 0, Counter()
+        return data['inode'], data['offset'], Counter(data['ip_count'])
+    except FileNotFoundError:
+        return None, 0, Counter()
+    except Exception as e:
+        print('Error reading checkpoint:', e)
+        return None, 0, Counter()
+
+def save_checkpoint(checkpoint_path, file_path, inode, offset, ip_count):
+    data = {
+        'file_path': os.path.abspath(file_path),
+        'inode': inode,
+        'offset': offset,
+        'ip_count': dict(ip_count),
+    }
+    try:
+        # 임시 파일에 쓴 뒤 교체해서 중간에 종료되어도 체크포인트가 깨지지 않게 한다
+        tmp_path = checkpoint_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, checkpoint_path)
+    except Exception as e:
+        print('Error writing checkpoint:', e)
+
+def count_new_ips(f, offset):
+    # offset 이후에 추가된 '완성된 줄'만 읽어서 IP를 센다
+    # 아직 쓰는 중인 마지막 줄(줄바꿈 없음)은 다음 번에 다시 읽도록 offset을 그 앞에서 멈춘다
+    ip_count = Counter()
+    f.seek(offset)
+    tail = b''
+    while True:
+        block = f.read(read_block_size)
+        if not block:
+            break
+        block = tail + block
+        cut = block.rfind(b'\n') + 1
+        tail = block[cut:]
+        if cut:
+            ip_count.update(ipv4_bytes_pattern.findall(block, 0, cut))
+            offset += cut
+    return Counter({ip.decode('ascii'): count for ip, count in ip_count.items()}), offset
+
+def is_rotated(file_path, inode):
+    # 같은 경로에 다른 파일(inode)이 생겼거나 파일이 사라졌으면 로그가 교체(rotate)된 것
+    try:
+        return os.stat(file_path).st_ino != inode
+    except FileNotFoundError:
+        return True
+
+def follow_log_file(file_path, checkpoint_path=checkpoint_filename, top_n=3, follow=False, interval=follow_interval):
+    # 체크포인트 이후에 추가된 바이트만 분석해서 누적 카운트와 리포트(CSV)를 갱신한다
+    # follow=False 이면 한 번만 갱신하고 종료, True 이면 Ctrl+C 전까지 interval 마다 반복
+    # 리포트 CSV(전체 IP + 상위 IP)와 체크포인트는 누적 카운트 전체를 다시 쓰므로(고유 IP 수에 비례) 의도적으로
+    # 새 줄이 들어올 때마다가 아니라 report_interval 마다, 그리고 종료할 때 쓴다 (카운트는 매번 갱신)
+    inode, offset, ip_count = load_checkpoint(checkpoint_path, file_path)
+    f = None
+    dirty = False # 아직 파일에 쓰지 않은 변경이 있는지
+    last_saved = time.monotonic()
+
+    def save_report():
+        nonlocal dirty, last_saved
+        save_ip_count_to_csv(ip_count, ip_count.most_common(top_n))
+        save_checkpoint(checkpoint_path, file_path, inode, offset, ip_count)
+        dirty = False
+        last_saved = time.monotonic()
+
+    try:
+        while True:
+            if f is None:
+                try:
+                    f = open(file_path, 'rb')
+                except FileNotFoundError:
+                    # rotate 직후 새 파일이 아직 생성되지 않은 경우
+                    time.sleep(interval)
+                    continue
+                st = os.fstat(f.fileno())
+                if st.st_ino != inode or st.st_size < offset:
+                    if inode is not None:
+                        print('[info] Log file was rotated. Reading the new file from the beginning.')
+                    inode, offset = st.st_ino, 0
+            elif os.fstat(f.fileno()).st_size < offset:
+                # copytruncate 방식으로 파일이 잘린 경우
+                print('[info] Log file was truncated. Reading from the beginning.')
+                offset = 0
+
+            rotated = is_rotated(file_path, inode)
+            start_offset = offset
+            new_count, end_offset = count_new_ips(f, offset) # rotate 된 경우에도 예전 파일의 남은 부분을 먼저 읽는다
+            ip_count.update(new_count)
+            offset = end_offset # 카운트를 반영한 뒤 오프셋 이동 (종료 시 저장하는 체크포인트가 어긋나지 않게)
+            if rotated:
+                f.close()
+                f = None
+
+            if new_count:
+                top_ips = ip_count.most_common(top_n)
+                print(f"[info] +{offset - start_offset} bytes, +{sum(new_count.values())} IPs, unique IPs: {len(ip_count)}")
+                print(f"Top {top_n} IPs:", top_ips)
+            if offset != start_offset or rotated:
+                dirty = True
+            if dirty and (not follow or time.monotonic() - last_saved >= report_interval):
+                save_report()
+
+            if not follow:
+                break
+            if not rotated:
+                time.sleep(interval)
+    except KeyboardInterrupt:
+        print('\n[info] Follow mode stopped by user.')
+    except Exception as e:
+        print('Error reading file:', e)
+    finally:
+        if f is not None:
+            f.close()
+        if dirty:
+            save_report()
+    return ip_count, ip_count.most_common(top_n)
+
 def save_ip_count_to_csv(ip_count, top3_ips, output_filename="ip_analysis.csv"):
     try:
         with open(output_filename, 'w', encoding='utf-8-sig', newline='') as csvfile:
@@ -52,9 +423,41 @@ def save_ip_count_to_csv(ip_count, top3_ips, output_filename="ip_analysis.csv"):
     except Exception as e:
         print('Error writing to CSV file:', e)
 
+def parse_args():
+    parser = argparse.ArgumentParser(description='로그 파일 IP 분석기')
+    parser.add_argument('file_path', nargs='?', help='분석할 로그 파일 경로 (생략하면 입력 받음)')
+    parser.add_argument('--parallel', action='store_true', help='대용량 로그를 구간별로 나눠 여러 프로세스로 분석')
+    parser.add_argument('--workers', type=int, default=None, help='병렬 모드에서 사용할 프로세스 수 (기본값: CPU 코어 수)')
+    parser.add_argument('--engine', choices=['counter', 'int'], default='counter', help='카운팅 방식 (counter: 문자열 Counter, int: 32비트 정수 엔진)')
+    parser.add_argument('--benchmark', action='store_true', help='문자열 Counter 방식과 정수 엔진의 속도/메모리 비교')
+    parser.add_argument('--incremental', action='store_true', help='체크포인트 이후 새로 추가된 로그만 한 번 분석')
+    parser.add_argument('--follow', action='store_true', help='로그를 계속 따라가며 새로 추가된 부분만 분석 (Ctrl+C로 종료)')
+    parser.add_argument('--checkpoint', default=checkpoint_filename, help='증분 분석 체크포인트 파일 경로')
+    parser.add_argument('--interval', type=float, default=follow_interval, help='follow 모드 확인 주기 (초)')
+    return parser.parse_args()
+
 if __name__ == "__main__":
-    file_path = get_file_path()
-    ip_count, top3_ips = analyze_log_file_and_top3(file_path)
-    if ip_count and top3_ips:
+    args = parse_args()
+    if args.file_path and os.path.exists(args.file_path):
+        file_path = args.file_path
+    else:
+        file_path = get_file_path()
+
+    if args.benchmark:
+        benchmark_ip_counters(file_path)
+        result = None
+    elif args.follow or args.incremental:
+        # 증분 모드는 갱신할 때마다 CSV를 직접 저장한다
+        follow_log_file(file_path, args.checkpoint, follow=args.follow, interval=args.interval)
+        result = None
+    elif args.parallel:
+        result = analyze_log_file_parallel(file_path, workers=args.workers, engine=args.engine)
+    elif args.engine == 'int':
+        result = analyze_log_file_int(file_path)
+    else:
+        result = analyze_log_file_and_top3(file_path)
+
+    if result:
+        ip_count, top3_ips = result
         save_ip_count_to_csv(ip_count, top3_ips)
-        print(f'IP analysis saved to ip_analysis.csv')
\ No newline at end of file
+        print(f'IP analysis saved to ip_analysis.csv')
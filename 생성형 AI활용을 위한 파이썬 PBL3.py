@@ -1,33 +1,313 @@
 import re
+import io
 import os
+import sys
+import json
 import time
+import queue
+import hashlib
+import struct
+import select
+import ctypes
+import ctypes.util
+import sqlite3
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 
 
 watch_dir = "./monitor_directory" # 모니터링 할 디렉토리 경로
 danger_extensions = ['.py', '.js', '.class'] # 주의 파일 분류 확장자
 wait_time = 2 # 디렉토리 검사 주기 (초)
+watch_backend = "auto" # 감시 방식 - auto: 가능하면 inotify, 안 되면 polling / inotify / polling
+snapshot_path = "./monitor_snapshot.json" # 파일 스냅샷 인덱스 저장 경로 (재시작 시 이어서 사용)
+snapshot_save_interval = 10 # 변경된 스냅샷을 디스크에 저장하는 최소 간격 (초)
+use_content_hash = False # True면 크기/수정시간이 바뀐 파일의 내용 해시까지 비교 (touch만 된 파일은 재검사 안 함)
 catch_pattern = {
     "주석(Comments)": r"(#.*)|(//.*)|(/\*[\s\S]*?\*/)", # Python(#) 및 C/Java 스타일(//, /**/) 주석 모두 탐지
     "이메일(Email)": r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}",
     "SQL 구문(SQL Injection 위험)": r"\b(SELECT|INSERT|UPDATE|DELETE|DROP|ALTER|CREATE|UNION|JOIN|WHERE|FROM)\s+"
 }
+scan_chunk_size = 1024 * 1024 # 파일 내용을 스트리밍으로 검사할 때 한 번에 읽는 크기 (문자 수)
+scan_overlap = 4096 # 청크 경계에 걸친 매치를 놓치지 않도록 다음 청크와 겹쳐서 검사하는 길이 (이보다 긴 매치는 잘릴 수 있음)
+preview_length = 50 # 탐지 결과 미리보기 최대 길이
+analysis_mode = "thread" # 파일 검사 방식 - serial: 감시 루프에서 바로 검사 / thread: 스레드 풀 / process: 프로세스 풀
+analysis_workers = os.cpu_count() or 4 # 동시에 검사할 파일 수 (워커 수)
+analysis_queue_size = 1000 # 검사 대기 큐 최대 크기 (가득 차면 감시 루프가 대기 - backpressure)
+findings_output = None # 탐지 결과 저장 경로 - 예: "./findings.jsonl" 또는 "./findings.db" (SQLite), None이면 콘솔 출력만
+findings_batch_size = 1000 # 탐지 결과를 몇 개씩 모아서 기록할지
+findings_flush_interval = 1.0 # 배치가 덜 찼어도 기록하는 최대 간격 (초)
+findings_close_timeout = 30 # 종료할 때 남은 탐지 결과가 기록되길 기다리는 최대 시간 (초)
+findings_match_length = 200 # 저장할 매치 문자열 최대 길이
+console_report = True # False면 파일별 콘솔 출력 없이 통계만 출력 (findings_output과 함께 사용)
 
-def get_all_files_recursive(directory):
+# inotify 이벤트 마스크 (linux/inotify.h)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+inotify_watch_mask = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+inotify_event_header = struct.Struct('iIII') # wd, mask, cookie, len (뒤에 len 바이트의 파일 이름)
+
+class InotifyWatcher:
+    """
+    inotify(리눅스 커널 파일 이벤트)로 디렉터리 트리의 파일 생성/수정/이동을 감지하는 감시기
+    - 하위 디렉터리마다 watch를 등록하고, 새로 생긴 디렉터리도 자동으로 등록
+    - 주기적으로 트리를 다시 훑지 않고 커널이 알려주는 이벤트만 처리
+    - read_events()는 ('created' | 'modified' | 'moved' | 'deleted' | 'deleted_dir' | 'overflow', 상대 경로) 리스트를 반환
+      ('deleted_dir': 디렉터리가 트리 밖으로 옮겨지거나 삭제됨 -> 그 아래 파일 전체가 삭제된 것으로 처리)
+    """
+    def __init__(self, directory):
+        if not sys.platform.startswith('linux'):
+            raise OSError('inotify is only supported on Linux')
+        self.directory = directory
+        self.__libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self.__fd = self.__libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.__fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        self.__watches = {} # watch descriptor -> 디렉터리 경로
+        self.__created = set() # 생성됐지만 아직 쓰기가 끝나지 않은 파일 (close_write 시 'created'로 보고)
+        self.__add_tree(directory)
+
+    def __add_watch(self, path):
+        wd = self.__libc.inotify_add_watch(self.__fd, os.fsencode(path), inotify_watch_mask)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            # 대부분 fs.inotify.max_user_watches 한도 초과(ENOSPC)
+            print(f'[error] Could not watch {path}: {os.strerror(errno)}')
+            return
+        self.__watches[wd] = path
+
+    def __add_tree(self, path):
+        # path와 모든 하위 디렉터리에 watch를 등록하고, 이미 들어 있던 파일 목록을 반환
+        found = []
+        for root, dirs, files in os.walk(path):
+            self.__add_watch(root)
+            found.extend(os.path.join(root, file) for file in files)
+        return found
+
+    def __drop_tree(self, path):
+        # path와 그 아래 디렉터리의 watch 해제 (트리 밖으로 옮겨진 디렉터리의 이벤트가 예전 경로로 들어오지 않게)
+        prefix = path + os.sep
+        for wd, watched in list(self.__watches.items()):
+            if watched == path or watched.startswith(prefix):
+                del self.__watches[wd]
+                self.__libc.inotify_rm_watch(self.__fd, wd) # 이미 사라진 watch면 실패해도 무시
+        rel_prefix = os.path.relpath(prefix, self.directory) + os.sep
+        self.__created = {rel_path for rel_path in self.__created if not rel_path.startswith(rel_prefix)}
+
+    def read_events(self, timeout=None):
+        # 이벤트가 들어올 때까지 최대 timeout초 대기
+        ready, _, _ = select.select([self.__fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            data = os.read(self.__fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+
+        events = []
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, name_len = inotify_event_header.unpack_from(data, offset)
+            offset += inotify_event_header.size
+            name = os.fsdecode(data[offset:offset + name_len].rstrip(b'\0'))
+            offset += name_len
+
+            if mask & IN_Q_OVERFLOW:
+                events.append(('overflow', None)) # 커널 큐가 넘쳐 이벤트가 누락됨
+                continue
+            if mask & (IN_DELETE_SELF | IN_IGNORED):
+                # 감시 중인 디렉터리 자체가 삭제됨 (직접 해제한 watch는 이미 __watches에 없음)
+                path = self.__watches.get(wd)
+                if path is not None:
+                    self.__drop_tree(path)
+                    events.append(('deleted_dir', os.path.relpath(path, self.directory)))
+                continue
+            parent = self.__watches.get(wd)
+            if parent is None or not name:
+                continue
+            path = os.path.join(parent, name)
+            rel_path = os.path.relpath(path, self.directory)
+
+            if mask & IN_ISDIR:
+                # 디렉터리가 새로 생기거나 옮겨져 들어오면 watch 등록 후, 이미 안에 있던 파일도 보고
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    for file_path in self.__add_tree(path):
+                        events.append(('created', os.path.relpath(file_path, self.directory)))
+                elif mask & (IN_MOVED_FROM | IN_DELETE):
+                    # 트리 밖으로 옮겨지거나 삭제되면 하위 파일별 이벤트가 오지 않으므로 디렉터리 단위로 보고
+                    self.__drop_tree(path)
+                    events.append(('deleted_dir', rel_path))
+                continue
+
+            if mask & IN_CREATE:
+                self.__created.add(rel_path)
+            elif mask & IN_CLOSE_WRITE:
+                if rel_path in self.__created:
+                    self.__created.discard(rel_path)
+                    events.append(('created', rel_path))
+                else:
+                    events.append(('modified', rel_path))
+            elif mask & IN_MOVED_TO:
+                events.append(('moved', rel_path))
+            elif mask & (IN_MOVED_FROM | IN_DELETE):
+                self.__created.discard(rel_path)
+                events.append(('deleted', rel_path))
+        return events
+
+    def close(self):
+        os.close(self.__fd)
+
+class SnapshotIndex:
     """
-    하위 디렉터리까지 포함하여 모든 파일의 상대 경로를 Set으로 반환하는 함수
-    예: {'file1.py', 'sub_folder/file2.js', ...}
+    감시 디렉터리의 파일 스냅샷 인덱스 (상대 경로 -> [inode, size, mtime_ns, 내용 해시])
+    - os.scandir로 트리를 훑어서 stat 정보만 비교하므로 파일 내용을 다시 읽지 않음
+    - refresh()는 추가/수정/삭제된 파일을 돌려주고 인덱스를 그 자리에서 갱신
+    - 이벤트 방식에서는 update_file()/remove()로 파일 하나씩만 갱신
+    - JSON으로 저장해서 모니터를 재시작해도 이전 상태부터 이어서 비교
     """
-    file_set = set()
-    # os.walk를 사용하여 디렉터리 트리를 순회 (root: 현재 탐색 중인 경로, dirs: 하위 폴더, files: 파일들)
-    for root, dirs, files in os.walk(directory):
-        for file in files:
-            # 파일의 절대 경로 생성
-            full_path = os.path.join(root, file)
-            # 감시 디렉터리를 기준으로 한 '상대 경로'로 변환하여 저장
-            # 이렇게 해야 나중에 analyze_file에서 경로를 합칠 때 문제가 없음
-            rel_path = os.path.relpath(full_path, directory)
-            file_set.add(rel_path)
-    return file_set
+    def __init__(self, directory, index_path=snapshot_path, use_hash=use_content_hash):
+        self.directory = directory
+        self.index_path = index_path
+        self.use_hash = use_hash
+        self.__entries = {}
+        self.__dirty = False
+        self.__last_save = 0
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def __contains__(self, rel_path):
+        return rel_path in self.__entries
+
+    def load(self):
+        # 저장된 인덱스 불러오기, 같은 디렉터리의 인덱스가 없으면 False
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            print(f'[error] Could not read snapshot index: {e}')
+            return False
+        if data.get('directory') != os.path.abspath(self.directory):
+            return False
+        self.__entries = data['entries']
+        return True
+
+    def save(self, force=False):
+        # 변경 사항이 있을 때만, 최소 snapshot_save_interval 간격으로 저장 (임시 파일 -> 교체)
+        if not self.__dirty or (not force and time.time() - self.__last_save < snapshot_save_interval):
+            return
+        data = {'directory': os.path.abspath(self.directory), 'entries': self.__entries}
+        try:
+            tmp_path = self.index_path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.index_path)
+            self.__dirty = False
+            self.__last_save = time.time()
+        except Exception as e:
+            print(f'[error] Could not write snapshot index: {e}')
+
+    def scan(self):
+        # os.scandir로 트리 전체를 훑어서 {상대 경로: (inode, size, mtime_ns)} 반환
+        # (os.walk + relpath 보다 stat 호출과 문자열 처리가 적음)
+        result = {}
+        stack = [('', self.directory)]
+        while stack:
+            prefix, path = stack.pop()
+            try:
+                with os.scandir(path) as it:
+                    for entry in it:
+                        rel_path = prefix + entry.name
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                stack.append((rel_path + os.sep, entry.path))
+                            elif entry.is_file():
+                                st = entry.stat()
+                                result[rel_path] = (st.st_ino, st.st_size, st.st_mtime_ns)
+                        except OSError:
+                            continue # 훑는 도중 삭제된 파일
+            except OSError:
+                continue
+        return result
+
+    def __file_hash(self, rel_path):
+        h = hashlib.blake2b(digest_size=16)
+        with open(os.path.join(self.directory, rel_path), 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                h.update(block)
+        return h.hexdigest()
+
+    def __apply(self, rel_path, stat_key):
+        # 파일 하나의 stat 정보를 인덱스에 반영하고 변경 종류('added', 'modified', None)를 반환
+        old = self.__entries.get(rel_path)
+        if old is not None and tuple(old[:3]) == stat_key:
+            return None
+        digest = None
+        if self.use_hash:
+            try:
+                digest = self.__file_hash(rel_path)
+            except OSError:
+                return None
+        self.__entries[rel_path] = [*stat_key, digest]
+        self.__dirty = True
+        if old is None:
+            return 'added'
+        if self.use_hash and old[3] == digest:
+            return None # 수정 시간만 바뀌고 내용은 같음
+        return 'modified'
+
+    def build(self):
+        # 현재 트리로 인덱스를 새로 만든다 (기존 파일은 모두 '이미 본 파일'로 취급)
+        self.__entries = {}
+        for rel_path, stat_key in self.scan().items():
+            self.__apply(rel_path, stat_key)
+        self.__dirty = True
+
+    def refresh(self):
+        # 현재 트리와 인덱스를 비교해서 (추가, 수정, 삭제) 파일 목록을 반환하고 인덱스 갱신
+        current = self.scan()
+        added, modified = [], []
+        for rel_path, stat_key in current.items():
+            change = self.__apply(rel_path, stat_key)
+            if change == 'added':
+                added.append(rel_path)
+            elif change == 'modified':
+                modified.append(rel_path)
+        deleted = [rel_path for rel_path in self.__entries if rel_path not in current]
+        for rel_path in deleted:
+            self.remove(rel_path)
+        return added, modified, deleted
+
+    def update_file(self, rel_path):
+        # 이벤트로 알려진 파일 하나만 stat 해서 갱신
+        try:
+            st = os.stat(os.path.join(self.directory, rel_path))
+        except FileNotFoundError:
+            self.remove(rel_path)
+            return None
+        return self.__apply(rel_path, (st.st_ino, st.st_size, st.st_mtime_ns))
+
+    def remove(self, rel_path):
+        if self.__entries.pop(rel_path, None) is not None:
+            self.__dirty = True
+
+    def remove_tree(self, rel_dir):
+        # 디렉터리 아래 파일을 모두 인덱스에서 제거하고 제거한 경로 목록 반환 ('.'이면 전체)
+        prefix = '' if rel_dir == '.' else rel_dir + os.sep
+        removed = [rel_path for rel_path in self.__entries if rel_path.startswith(prefix)]
+        for rel_path in removed:
+            self.remove(rel_path)
+        return removed
 
 def check_directory():
     # 감시하고자 하는 디렉토리의 존재여부 확인(없으면 생성)
@@ -35,71 +315,503 @@ def check_directory():
         os.makedirs(watch_dir)
         print(f'[info] Created directory: {watch_dir}')
     
-    # 디렉토리 내 기존 파일 목록 저장 및 반환
-    file_before = get_all_files_recursive(watch_dir)
+    # 스냅샷 인덱스 불러오기 - 있으면 꺼져 있던 동안 바뀐 파일만 검사 대상으로 반환, 없으면 현재 파일들을 기준으로 새로 생성
+    snapshot = SnapshotIndex(watch_dir)
+    startup_changes = []
+    if snapshot.load():
+        added, modified, deleted = snapshot.refresh()
+        print(f'[info] Loaded snapshot index ({len(snapshot)} files): '
+              f'{len(added)} added, {len(modified)} modified, {len(deleted)} deleted while stopped')
+        startup_changes = [(filename, 'New') for filename in added] + [(filename, 'Modified') for filename in modified]
+    else:
+        snapshot.build()
+        print(f'[info] Created snapshot index ({len(snapshot)} files)')
+    snapshot.save(force=True)
     print(f'[info] Monitoring started on directory: {watch_dir} exit with Ctrl+C')
-    return file_before
-    
-def start_monitoring(file_before):
-    # 디렉토리 내 파일 변경 감지 및 위험 패턴 검사
+    return snapshot, startup_changes
+
+def create_watcher():
+    # 설정에 따라 inotify 감시기를 만들고, 사용할 수 없으면 None (polling 방식으로 동작)
+    if watch_backend == 'polling':
+        return None
     try:
+        return InotifyWatcher(watch_dir)
+    except Exception as e:
+        if watch_backend == 'inotify':
+            raise
+        print(f'[info] inotify is not available ({e}). Falling back to polling every {wait_time}s.')
+        return None
+
+class FindingsSink:
+    """
+    탐지 결과를 JSONL 또는 SQLite 파일로 저장하는 싱크
+    - 경로 확장자가 .db / .sqlite 면 SQLite, 그 외에는 JSONL
+    - add_result()는 큐에 넣기만 하고, writer 스레드가 batch_size 개씩 (또는 flush_interval 마다) 모아서 기록
+    - 기록에 실패하면(경로 오류, SQLite 잠김, 디스크 부족 등) writer는 큐를 계속 비우면서 결과를 버리고,
+      add_result() / check() / close()가 그 오류를 RuntimeError로 전달 (큐가 차서 멈추지 않음)
+    - 레코드 종류
+      finding: file, label, offset(문자 위치), line, match
+      file: file, event, bytes, elapsed, error, findings(개수)
+    """
+    def __init__(self, path, batch_size=findings_batch_size, flush_interval=findings_flush_interval):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.use_sqlite = os.path.splitext(path)[1].lower() in ('.db', '.sqlite', '.sqlite3')
+        self.__queue = queue.Queue(maxsize=analysis_queue_size)
+        self.__thread = threading.Thread(target=self.__write_loop, daemon=True)
+        self.__written = 0
+        self.__error = None # writer 스레드에서 난 오류
+
+    def start(self):
+        self.__thread.start()
+
+    def check(self):
+        # writer 스레드가 실패했으면 호출한 쪽에서 예외 발생
+        if self.__error is not None:
+            raise RuntimeError(f'Could not write findings to {self.path}: {self.__error}') from self.__error
+
+    def add_result(self, result):
+        self.check()
+        self.__queue.put(result)
+
+    def close(self, timeout=findings_close_timeout):
+        # 남은 배치를 모두 기록한 뒤 종료 (timeout 안에 끝나지 않으면 기다리지 않음)
+        try:
+            self.__queue.put(None, timeout=timeout)
+        except queue.Full:
+            pass
+        self.__thread.join(timeout)
+        if self.__thread.is_alive():
+            print(f'[warning] Findings writer did not finish within {timeout}s. Unwritten findings are lost.')
+        print(f'[info] {self.__written} records written to {self.path}')
+        self.check()
+
+    def __records(self, result):
+        scanned_at = time.time()
+        findings = result.get('findings', [])
+        records = [('finding', {'file': result['filename'], 'label': label, 'offset': offset, 'line': line, 'match': text})
+                   for label, offset, line, text in findings]
+        records.append(('file', {'file': result['filename'], 'event': result['event'], 'bytes': result['bytes'],
+                                 'elapsed': round(result['elapsed'], 6), 'error': result['error'],
+                                 'findings': len(findings), 'scanned_at': scanned_at}))
+        return records
+
+    def __open(self):
+        if not self.use_sqlite:
+            return open(self.path, 'a', encoding='utf-8')
+        conn = sqlite3.connect(self.path) # writer 스레드 안에서만 사용
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('CREATE TABLE IF NOT EXISTS findings (file TEXT, label TEXT, offset INTEGER, line INTEGER, match TEXT)')
+        conn.execute('CREATE TABLE IF NOT EXISTS files (file TEXT, event TEXT, bytes INTEGER, elapsed REAL, '
+                     'error TEXT, findings INTEGER, scanned_at REAL)')
+        return conn
+
+    def __write(self, writer, batch):
+        if self.use_sqlite:
+            findings = [(r['file'], r['label'], r['offset'], r['line'], r['match']) for kind, r in batch if kind == 'finding']
+            files = [(r['file'], r['event'], r['bytes'], r['elapsed'], r['error'], r['findings'], r['scanned_at'])
+                     for kind, r in batch if kind == 'file']
+            writer.executemany('INSERT INTO findings VALUES (?, ?, ?, ?, ?)', findings)
+            writer.executemany('INSERT INTO files VALUES (?, ?, ?, ?, ?, ?, ?)', files)
+            writer.commit()
+        else:
+            writer.write(''.join(json.dumps({'type': kind, **r}, ensure_ascii=False) + '\n' for kind, r in batch))
+            writer.flush()
+        self.__written += len(batch)
+
+    def __write_loop(self):
+        writer = None
+        batch = []
+        last_flush = time.monotonic()
+        closing = False
+        try:
+            writer = self.__open()
+            while not closing:
+                try:
+                    item = self.__queue.get(timeout=max(self.flush_interval - (time.monotonic() - last_flush), 0.01))
+                    if item is None:
+                        closing = True
+                    else:
+                        batch.extend(self.__records(item))
+                except queue.Empty:
+                    pass
+                if closing or len(batch) >= self.batch_size or time.monotonic() - last_flush >= self.flush_interval:
+                    if batch:
+                        self.__write(writer, batch)
+                        batch = []
+                    last_flush = time.monotonic()
+        except Exception as e:
+            self.__error = e
+            print(f'[error] Could not write findings to {self.path}: {e}')
+            if writer is not None:
+                writer.close()
+                writer = None
+            # 큐를 계속 비워서 add_result() / close()가 멈추지 않게 함 (남은 결과는 버림)
+            while not closing:
+                closing = self.__queue.get() is None
+        finally:
+            if writer is not None:
+                writer.close()
+
+class AnalysisPipeline:
+    """
+    감시 루프(생산자)와 파일 검사(소비자)를 분리하는 파이프라인
+    - 감시 루프는 submit()으로 파일 경로만 큐에 넣고 바로 다음 변경을 감지
+    - 큐 크기가 제한되어 있어서 가득 차면 submit()이 대기 (검사가 밀리면 감지 속도를 늦춤 - backpressure)
+    - 워커 스레드들이 확장자 검사 + 내용 스캔 (process 모드면 각 워커가 프로세스 풀에 작업을 넘기고 결과를 기다림)
+    - 결과는 reporter 스레드 하나가 출력해서 여러 파일의 출력이 섞이지 않고, 파일별 처리 시간 통계를 모음
+    """
+    def __init__(self, mode=analysis_mode, workers=analysis_workers, queue_size=analysis_queue_size):
+        self.mode = mode
+        self.workers = workers
+        self.__tasks = queue.Queue(maxsize=queue_size)
+        self.__results = queue.Queue()
+        self.__threads = []
+        self.__reporter = None
+        self.__executor = None
+        self.__sink = FindingsSink(findings_output) if findings_output else None
+        # 처리 시간 통계
+        self.__count = 0
+        self.__errors = 0
+        self.__bytes = 0
+        self.__total_elapsed = 0.0
+        self.__total_wait = 0.0
+        self.__recent_elapsed = deque(maxlen=10000) # p95 계산용 최근 처리 시간
+
+    def start(self):
+        if self.__sink is not None:
+            self.__sink.start()
+        if self.mode == 'serial':
+            return
+        if self.mode == 'process':
+            self.__executor = ProcessPoolExecutor(max_workers=self.workers)
+        for _ in range(self.workers):
+            thread = threading.Thread(target=self.__work, daemon=True)
+            thread.start()
+            self.__threads.append(thread)
+        self.__reporter = threading.Thread(target=self.__report, daemon=True)
+        self.__reporter.start()
+        print(f'[info] Analysis pipeline started ({self.mode}, {self.workers} workers, queue size {self.__tasks.maxsize})')
+
+    def submit(self, filename, event='New'):
+        # 큐가 가득 차 있으면 자리가 날 때까지 대기
+        if self.__sink is not None:
+            self.__sink.check() # 탐지 결과를 저장할 수 없으면 감시를 멈춤
+        if self.mode == 'serial':
+            result = inspect_file(filename, event)
+            self.__handle(result)
+            return
+        self.__tasks.put((filename, event, time.perf_counter()))
+
+    def __work(self):
         while True:
-            now_files = get_all_files_recursive(watch_dir)
-            added_files = now_files - file_before # 새로 추가된 파일 탐지
+            item = self.__tasks.get()
+            if item is None:
+                break
+            filename, event, queued_at = item
+            queue_wait = time.perf_counter() - queued_at
+            try:
+                if self.__executor is not None:
+                    result = self.__executor.submit(inspect_file, filename, event).result()
+                else:
+                    result = inspect_file(filename, event)
+            except Exception as e:
+                result = {'filename': filename, 'event': event, 'ext': os.path.splitext(filename)[1],
+                          'found': {}, 'error': str(e), 'bytes': 0, 'elapsed': 0.0}
+            result['queue_wait'] = queue_wait
+            self.__results.put(result)
 
-            if added_files:
+    def __report(self):
+        while True:
+            result = self.__results.get()
+            if result is None:
+                break
+            try:
+                self.__handle(result)
+            except RuntimeError:
+                pass # 탐지 결과 저장 실패는 submit() / close()에서 감시 루프로 전달
+    def __handle(self, result):
+        # 결과 출력/저장 및 통계 기록 (serial 모드는 감시 루프, 그 외에는 reporter 스레드에서만 호출)
+        if console_report:
+            report_result(result)
+        self.__record(result)
+        if self.__sink is not None:
+            self.__sink.add_result(result)
+
+    def __record(self, result):
+        self.__count += 1
+        self.__errors += result['error'] is not None
+        self.__bytes += result['bytes']
+        self.__total_elapsed += result['elapsed']
+        self.__total_wait += result.get('queue_wait', 0.0)
+        self.__recent_elapsed.append(result['elapsed'])
+
+    def print_stats(self):
+        if not self.__count:
+            return
+        recent = sorted(self.__recent_elapsed)
+        p95 = recent[min(int(len(recent) * 0.95), len(recent) - 1)]
+        print(f'[info] Analyzed {self.__count} files ({self.__errors} errors, {self.__bytes / 1024 / 1024:.2f} MB) - '
+              f'avg {self.__total_elapsed / self.__count * 1000:.1f}ms, p95 {p95 * 1000:.1f}ms, max {recent[-1] * 1000:.1f}ms, '
+              f'avg queue wait {self.__total_wait / self.__count * 1000:.1f}ms')
+
+    def close(self):
+        # 큐에 남은 파일을 모두 검사한 뒤 워커와 reporter 종료
+        if self.mode != 'serial':
+            if self.__tasks.qsize():
+                print(f'[info] Waiting for {self.__tasks.qsize()} queued files to be analyzed...')
+            for _ in self.__threads:
+                self.__tasks.put(None)
+            for thread in self.__threads:
+                thread.join()
+            self.__results.put(None)
+            self.__reporter.join()
+            if self.__executor is not None:
+                self.__executor.shutdown()
+        try:
+            if self.__sink is not None:
+                self.__sink.close()
+        finally:
+            self.print_stats()
+
+def start_monitoring(snapshot, startup_changes=()):
+    pipeline = AnalysisPipeline()
+    pipeline.start()
+    try:
+        for filename, event in startup_changes:
+            pipeline.submit(filename, event)
+        watcher = create_watcher()
+        if watcher is None:
+            start_polling(snapshot, pipeline)
+        else:
+            start_event_monitoring(watcher, snapshot, pipeline)
+    except KeyboardInterrupt:
+        print('\n[info] Monitoring stopped by user.')
+    finally:
+        pipeline.close()
+
+def start_event_monitoring(watcher, snapshot, pipeline):
+    # inotify 이벤트가 들어오는 즉시 해당 파일만 검사 (트리 전체를 다시 훑지 않음)
+    event_labels = {'added': 'New', 'modified': 'Modified'}
+    print('[info] Using inotify backend.')
+    try:
+        while True:
+            for event, filename in watcher.read_events(timeout=wait_time):
+                if event == 'overflow':
+                    # 이벤트가 누락된 경우에만 전체 트리를 다시 훑어서 놓친 변경을 검사
+                    print('[warning] inotify event queue overflowed. Rescanning directory.')
+                    added, modified, _ = snapshot.refresh()
+                    for added_file in added:
+                        pipeline.submit(added_file)
+                    for modified_file in modified:
+                        pipeline.submit(modified_file, 'Modified')
+                elif event == 'deleted':
+                    snapshot.remove(filename)
+                elif event == 'deleted_dir':
+                    removed = snapshot.remove_tree(filename)
+                    if removed:
+                        print(f'[info] Directory removed: {filename} ({len(removed)} files)')
+                else:
+                    # 스냅샷과 비교해서 실제로 바뀐 파일만 검사 (예: 내용 해시가 같으면 건너뜀)
+                    change = snapshot.update_file(filename)
+                    if change is not None:
+                        pipeline.submit(filename, 'Moved' if event == 'moved' else event_labels[change])
+            snapshot.save()
+    except KeyboardInterrupt:
+        print('\n[info] Monitoring stopped by user.')
+    except Exception as e:
+        print(f'[error] An error occurred: {e}')
+    finally:
+        watcher.close()
+        snapshot.save(force=True)
+
+def start_polling(snapshot, pipeline):
+    # 디렉토리 내 파일 변경 감지 및 위험 패턴 검사 (wait_time 마다 스냅샷과 비교)
+    try:
+        while True:
+            added, modified, deleted = snapshot.refresh()
+
+            if added or modified or deleted:
                 print()
                 print("="*20)
                 print("file changed!")
-                print(f"before: {file_before}")
-                print(f"now: {now_files}")
-                for filename in added_files:
-                    analyze_file(filename)
-            
-            file_before = now_files # 현재 파일 목록으로 갱신
+                print(f"added: {len(added)}, modified: {len(modified)}, deleted: {len(deleted)}")
+                for filename in added:
+                    pipeline.submit(filename)
+                for filename in modified:
+                    pipeline.submit(filename, 'Modified')
+            snapshot.save()
 
             time.sleep(wait_time) # 지정된 시간만큼 대기
     except KeyboardInterrupt:
         print('\n[info] Monitoring stopped by user.')
     except Exception as e:
         print(f'[error] An error occurred: {e}')
+    finally:
+        snapshot.save(force=True)
 
-def analyze_file(filename):
-    filepath = os.path.join(watch_dir, filename)
-    print(f'\n[info] New file detected: {filename}')
+def analyze_file(filename, event='New'):
+    # 감시 루프에서 바로 검사하고 출력 (serial 모드)
+    result = inspect_file(filename, event)
+    report_result(result)
+    return result
 
+def inspect_file(filename, event='New'):
+    # 파일 하나를 검사해서 결과를 dict로 반환 (출력은 report_result에서 - 워커 스레드/프로세스에서 실행)
+    filepath = os.path.join(watch_dir, filename)
     # splitext 함수를 사용하여 파일 이름과 확장자를 분리
     _, ext = os.path.splitext(filename)
+    result = {'filename': filename, 'event': event, 'ext': ext, 'found': {}, 'error': None, 'bytes': 0, 'elapsed': 0.0}
+
+    # 파일 내용 검사 - 전체를 메모리에 올리지 않고 청크 단위로 한 번만 훑음
+    start = time.perf_counter()
+    try:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            if findings_output:
+                # 저장용으로 모든 매치를 (label, offset, line, match) 튜플로 수집
+                findings = []
+                result['found'] = scan_stream_all(
+                    f, lambda label, offset, line, text: findings.append((label, offset, line, text[:findings_match_length])))
+                result['findings'] = findings
+            else:
+                result['found'] = scan_stream(f)
+            result['bytes'] = f.buffer.tell() # 실제로 읽은 바이트 (모든 라벨을 찾으면 중간에 멈춤)
+    except UnicodeDecodeError:
+        result['error'] = 'Unsupported encoding.'
+    except Exception as e:
+        result['error'] = str(e)
+    result['elapsed'] = time.perf_counter() - start
+    return result
+
+def report_result(result):
+    filename, ext = result['filename'], result['ext']
+    print(f'\n[info] {result["event"]} file detected: {filename}')
 
     # 파일 확장자 검사
     if ext in danger_extensions:
         print(f'[warning] detect filter file extension: {ext}')
     else:
         print(f'[info] file extension {ext} is not filtered.')
-    
-    # 파일 내용 검사
-    try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
-            scan_sensitive_info(content)
-    except UnicodeDecodeError:
-        print(f'[error] Could not read file {filename}: Unsupported encoding.')
-    except Exception as e:
-        print(f'[error] Could not read file {filename}: {e}')
 
-def scan_sensitive_info(content):
-    detected = False
-
-    for label, pattern in catch_pattern.items():
-        matches = re.findall(pattern, content, re.IGNORECASE | re.MULTILINE) # 모든 패턴에 대해 대소문자 구분 없이 멀티라인 모드로 검색
-        if matches:
-            detected = True
-            preview = str(matches[0])[:50] # 첫 번째 매치 결과 미리보기 (최대 50자)
-            print(f'[warning] Detected {label}: {preview}...')
-            
-    if not detected:
+    if result['error'] is not None:
+        print(f'[error] Could not read file {filename}: {result["error"]}')
+        return
+    print_scan_result(result['found'])
+    if 'findings' in result:
+        print(f'[info] {len(result["findings"])} findings recorded.')
+    scanned_mb = result['bytes'] / 1024 / 1024
+    elapsed = result['elapsed']
+    timing = f'[info] Scanned {scanned_mb:.2f} MB in {elapsed:.3f}s ({scanned_mb / max(elapsed, 1e-9):.1f} MB/s)'
+    if 'queue_wait' in result:
+        timing += f', queued {result["queue_wait"]:.3f}s'
+    print(timing)
+
+def build_catch_regex(labels):
+    # 라벨들의 패턴을 이름 있는 그룹(g0, g1, ...)의 alternation 하나로 합쳐서 컴파일
+    # 매치된 그룹 이름(lastgroup)으로 어떤 라벨인지 알 수 있도록 그룹 이름 -> 라벨 매핑도 함께 반환
+    group_labels = {f'g{i}': label for i, label in enumerate(labels)}
+    combined = '|'.join(f'(?P<{name}>{catch_pattern[label]})' for name, label in group_labels.items())
+    return re.compile(combined, re.IGNORECASE | re.MULTILINE), group_labels # 대소문자 구분 없이 멀티라인 모드로 검색
+
+def scan_stream(f, chunk_size=scan_chunk_size, overlap=scan_overlap):
+    """
+    텍스트 파일 객체를 청크 단위로 읽으면서 catch_pattern 전체를 한 번에 검사하는 함수
+    - 모든 패턴을 합친 정규식 하나로 훑으므로 패턴 수와 상관없이 파일을 한 번만 읽음
+    - 버퍼 끝 overlap 구간에서 시작하는 매치는 다음 청크를 붙인 뒤 확인 (경계에 걸친 매치 보존)
+    - 라벨별 첫 매치(미리보기)를 찾으면 그 라벨은 정규식에서 빼고, 모든 라벨을 찾으면 더 읽지 않음
+    반환: {라벨: 미리보기}
+    """
+    remaining = list(catch_pattern)
+    regex, group_labels = build_catch_regex(remaining)
+    found = {}
+    buffer = ''
+    pos = 0 # 버퍼에서 검사를 시작할 위치
+    eof = False
+    while remaining and not eof:
+        chunk = f.read(chunk_size)
+        eof = not chunk
+        buffer += chunk
+        limit = len(buffer) if eof else max(len(buffer) - overlap, pos) # 이번에 확정할 매치 시작 위치의 상한
+
+        while remaining:
+            m = regex.search(buffer, pos)
+            if m is None or m.start() >= limit:
+                break
+            label = group_labels[m.lastgroup]
+            found[label] = m.group()[:preview_length]
+            remaining.remove(label)
+            if remaining:
+                # 찾은 라벨을 뺀 정규식으로 같은 위치부터 다시 검사 (다른 매치 안에 겹쳐 있는 매치도 찾음)
+                regex, group_labels = build_catch_regex(remaining)
+                pos = m.start()
+
+        # 다음 청크와 이어 붙일 부분만 남김 (\b 판단을 위해 앞 글자 하나를 같이 보관)
+        keep_from = max(limit - 1, 0)
+        buffer = buffer[keep_from:]
+        pos = limit - keep_from
+    return found
+
+def scan_stream_all(f, on_finding, chunk_size=scan_chunk_size, overlap=scan_overlap):
+    """
+    scan_stream과 같은 방식으로 읽되, 조기 종료 없이 모든 매치를 on_finding(label, offset, line, text)으로 넘기는 함수
+    - offset: 파일 시작 기준 문자 위치, line: 1부터 시작하는 줄 번호
+    - 다른 라벨의 매치 안에 들어 있는 매치(예: 주석 안의 이메일)도 한 단계까지 찾음
+    반환: {라벨: 미리보기}
+    """
+    labels = list(catch_pattern)
+    regex, group_labels = build_catch_regex(labels)
+    # 라벨마다 '나머지 라벨'만 합친 정규식을 미리 만들어 두고, 매치 구간 안을 한 번 더 검사
+    inner = {label: build_catch_regex([other for other in labels if other != label]) if len(labels) > 1 else None
+             for label in labels}
+    found = {}
+    buffer = ''
+    base = 0 # 버퍼 시작 위치의 파일 내 문자 위치
+    base_line = 1 # 버퍼 시작 위치의 줄 번호
+    pos = 0
+    eof = False
+    while not eof:
+        chunk = f.read(chunk_size)
+        eof = not chunk
+        buffer += chunk
+        limit = len(buffer) if eof else max(len(buffer) - overlap, pos)
+
+        line, line_pos = base_line, 0 # 줄 번호는 매치 위치까지 증가분만 센다
+        for m in regex.finditer(buffer, pos):
+            if m.start() >= limit:
+                break
+            label = group_labels[m.lastgroup]
+            matches = [(label, m)]
+            if inner[label] is not None:
+                inner_regex, inner_labels = inner[label]
+                matches += [(inner_labels[sub.lastgroup], sub) for sub in inner_regex.finditer(buffer, m.start(), m.end())]
+            for match_label, match in matches:
+                line += buffer.count('\n', line_pos, match.start())
+                line_pos = match.start()
+                found.setdefault(match_label, match.group()[:preview_length])
+                on_finding(match_label, base + match.start(), line, match.group())
+            pos = m.end() # 다음 매치는 이 매치가 끝난 뒤부터 (청크 경계를 넘어가도 유지)
+
+        keep_from = max(limit - 1, 0)
+        base_line += buffer.count('\n', 0, keep_from)
+        base += keep_from
+        buffer = buffer[keep_from:]
+        pos = max(pos, limit) - keep_from
+    return found
+
+def print_scan_result(found):
+    # catch_pattern 순서대로 탐지 결과 출력
+    for label in catch_pattern:
+        if label in found:
+            print(f'[warning] Detected {label}: {found[label]}...')
+    if not found:
         print('[info] No sensitive information detected in file.')
 
-file_before = check_directory()
-start_monitoring(file_before)
+def scan_sensitive_info(content):
+    # 이미 메모리에 있는 문자열 검사 (scan_stream과 같은 엔진 사용)
+    print_scan_result(scan_stream(io.StringIO(content)))
+
+if __name__ == "__main__":
+    snapshot, startup_changes = check_directory()
+    start_monitoring(snapshot, startup_changes)
 
@@ -1,9 +1,17 @@
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
+from sales_aggregates import SalesAggregator
 
 class SalesAnalysis:
-    def __init__(self, seed: int = 42):
+    def __init__(self, seed: int = 42, path: str | None = None):
+        # path: 실제 거래 파일(CSV, Date / Sales 컬럼) -- 주면 파일을 청크로 집계 (캐시 + 추가된 거래만 갱신)
+        if path:
+            self.df = None # 전체 거래를 메모리에 올리지 않음
+            self.aggregates = SalesAggregator.for_file(path, date_col='Date', amount_col='Sales')
+            print(f"Load Sales Aggregates: {self.aggregates.rows} rows")
+            print("-" * 50)
+            return
         np.random.seed(seed) # 재현성을 위한 시드 고정
         # data_range를 사용하여 날짜 생성
         self.dates = pd.date_range(start='2024-01-01', end='2024-12-31', freq='D')
@@ -17,10 +25,16 @@ class SalesAnalysis:
         print("Make DataFrame of 2024 Sales Data")
         print(self.df.head()) # 잘 생성되었는지 확인
         print("-" * 50)
+        self.aggregates = SalesAggregator(date_col='Date', amount_col='Sales').update(self.df) # 월별 매출 합계 미리 집계
+    
+    def add_sales(self, df):
+        # 새 거래 추가 -- 추가된 거래만 집계에 더함 (전체 groupby 다시 하지 않음)
+        self.aggregates.update(df)
+        if self.df is not None:
+            self.df = pd.concat([self.df, df], ignore_index=True)
     
     def calculte_monthly_sales(self):
-        self.df['Month'] = self.df['Date'].dt.to_period('M') # Date 열에서 월 정보 추출
-        self.monthly_sales = self.df.groupby('Month')['Sales'].sum().reset_index() # 월별 매출 합계 계산
+        self.monthly_sales = self.aggregates.monthly() # 월별 매출 합계 (Month: Period, self.df는 바꾸지 않음)
         print("Monthly Sales Data")
         print(self.monthly_sales)
         print("-" * 50)
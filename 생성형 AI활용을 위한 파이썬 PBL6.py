@@ -1,9 +1,23 @@
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
+from sales_aggregates import SalesAggregator
 
 class CustomerSalesAnalysis:
-    def __init__(self, seed : int = 42):
+    def __init__(self, seed : int = 42, path : str | None = None):
+        plt.rcParams["font.family"] = ["Malgun Gothic", "AppleGothic", "NanumGothic", "DejaVu Sans"] # OS 별 한글 폰트 설정
+        plt.rcParams["axes.unicode_minus"] = False  # 마이너스 기호 깨짐 방지
+        columns = dict(date_col='구매일자', amount_col='총매출', customer_col='고객', product_col='상품명',
+                       quantity_col='수량', price_col='단가') # 총매출 컬럼이 없는 파일은 수량 x 단가
+
+        # path: 실제 거래 파일(CSV) -- 주면 파일을 청크로 집계 (캐시 + 추가된 거래만 갱신)
+        if path:
+            self.df = None # 전체 거래를 메모리에 올리지 않음
+            self.aggregates = SalesAggregator.for_file(path, **columns)
+            print(f"Load Sales Aggregates: {self.aggregates.rows} purchase records")
+            print("="*50)
+            return
+
         np.random.seed(seed) # 재현을 위한 시드 고정
         total_buy_count = 100
 
@@ -11,9 +25,9 @@ class CustomerSalesAnalysis:
         products = [f'Product_{i}' for i in range(1, 6)] # 5개의 제품
 
         data ={
-            '고객' : [np.random.choice(customers) for _ in range(total_buy_count)], # 100개의 구매 기록 생성 - 고객 랜덤 선택
+            '고객' : np.random.choice(customers, size=total_buy_count), # 100개의 구매 기록 생성 - 고객 랜덤 선택 (한 번에 추출)
             '구매일자' : pd.date_range(start='2025-01-01', end='2025-12-31', periods=total_buy_count), # 100개의 구매 기록 생성 - 구매일자 랜덤 생성 / 시계열 날짜 생성
-            '상품명' : [np.random.choice(products) for _ in range(total_buy_count)], # 100개의 구매 기록 생성 - 제품 랜덤 선택
+            '상품명' : np.random.choice(products, size=total_buy_count), # 100개의 구매 기록 생성 - 제품 랜덤 선택 (한 번에 추출)
             '수량' : np.random.randint(1, 11, size=total_buy_count), # 100개의 구매 기록 생성 - 1~10 사이의 랜덤 수량
             '단가' : np.random.randint(1000, 10001, size=total_buy_count) # 100개의 구매 기록 생성 - 1000~10000 사이의 랜덤 단가
         }
@@ -26,12 +40,19 @@ class CustomerSalesAnalysis:
         print(self.df.head()) # 잘 생성되었는지 확인
         print("="*50)
 
-        plt.rcParams["font.family"] = ["Malgun Gothic", "AppleGothic", "NanumGothic", "DejaVu Sans"] # OS 별 한글 폰트 설정
-        plt.rcParams["axes.unicode_minus"] = False  # 마이너스 기호 깨짐 방지
+        self.aggregates = SalesAggregator(**columns).update(self.df) # 월 / 고객 / 상품별 합계 한 번에 집계
+    
+    def add_purchases(self, df):
+        # 새 구매 기록 추가 -- 추가된 기록만 집계에 더함 (전체 groupby 다시 하지 않음)
+        if '총매출' not in df:
+            df = df.assign(총매출=df['수량'] * df['단가'])
+        self.aggregates.update(df)
+        if self.df is not None:
+            self.df = pd.concat([self.df, df], ignore_index=True)
     
     def visualize_monthly_sales(self):
-        self.df['월'] = self.df['구매일자'].dt.month # 구매일자에서 월 정보 추출
-        monthly_sales = self.df.groupby('월')['총매출'].sum() # 월별 총매출 합계 계산
+        monthly = self.aggregates.monthly() # 연-월별 총매출 (self.df는 바꾸지 않음)
+        monthly_sales = monthly.groupby(monthly['Month'].dt.month)['총매출'].sum() # 월(1~12)별 총매출 합계
         x = monthly_sales.index # 월
         y = monthly_sales.values # 월별 총매출 값
 
@@ -51,7 +72,7 @@ class CustomerSalesAnalysis:
         plt.show() # 그래프 출력
     
     def visualize_customer_contribution(self):
-        customer_sales = self.df.groupby('고객')['총매출'].sum().sort_values(ascending=False) # 고객별 총매출 합계 계산 및 정렬
+        customer_sales = self.aggregates.by_customer() # 고객별 총매출 합계 (많은 순으로 정렬됨)
         x = customer_sales.index # 고객 이름
         y = customer_sales.values # 고객별 총매출 값
 